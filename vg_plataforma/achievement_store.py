@@ -0,0 +1,302 @@
+# ===========================================================
+# Archivo: achievement_store.py
+# Descripción:
+# Este módulo implementa la persistencia del sistema de logros
+# mediante eventos (event sourcing) e instantáneas periódicas.
+#
+# Cada evento (victoria, derrota o torneo ganado) se anexa a un
+# registro de texto de solo anexado antes de aplicarse. Cada
+# cierto tiempo se guarda una instantánea compacta del estado
+# (ver AchievementSystem.dump_snapshot) junto con la posición del
+# registro que refleja. Al arrancar se carga la instantánea más
+# reciente y solo se reprocesa el tramo posterior del registro,
+# en un único lote con `ingest`.
+#
+# Formato del registro: una línea "jugador<TAB>evento" por
+# evento ("jugador<TAB>rating<TAB>valor" para los cambios de
+# rating). Una última línea incompleta (caída a mitad de una
+# escritura) se ignora y se descarta al reabrir.
+#
+# Incluye:
+#   - Clase EventLog (registro de eventos de solo anexado)
+#   - Clase AchievementStore (logros con recuperación rápida)
+#
+# ===========================================================
+
+import os
+from itertools import islice
+from typing import Iterable, List, Optional, Tuple
+
+from achievements import (DEFAULT_RULES, INGEST_CHUNK, LOSS_EVENT, RATING_EVENT,
+                          TOURNAMENT_WIN_EVENT, WIN_EVENT, AchievementRule,
+                          AchievementSystem)
+
+
+# Nombres de archivo dentro de la carpeta del almacén
+LOG_FILE = "events.log"
+SNAPSHOT_PREFIX = "snapshot-"
+SNAPSHOT_SUFFIX = ".bin"
+
+# Eventos que admite el registro (RATING_EVENT, como par (RATING_EVENT, rating))
+_KNOWN_EVENTS = frozenset((WIN_EVENT, LOSS_EVENT, TOURNAMENT_WIN_EVENT, RATING_EVENT))
+
+# Bytes que se leen por paso al buscar hacia atrás el último salto de línea
+_TAIL_BLOCK = 4096
+
+
+class EventLog:
+    """
+    Registro de eventos (jugador, evento) de solo anexado.
+
+    Atributos:
+        path (str): Ruta del archivo.
+        offset (int): Bytes válidos del registro (posición del próximo evento).
+    """
+
+    def __init__(self, path: str):
+        """
+        Abre (o crea) el registro, descartando una última línea incompleta.
+
+        Args:
+            path (str): Ruta del archivo.
+        """
+        self.path = path
+        self._file = open(path, "a+b")
+        self._file.seek(0, os.SEEK_END)
+        size = self._file.tell()
+        if size:
+            # Retroceder por bloques hasta el último salto de línea completo
+            valid, end = 0, size
+            while end:
+                begin = max(0, end - _TAIL_BLOCK)
+                self._file.seek(begin)
+                cut = self._file.read(end - begin).rfind(b"\n")
+                if cut >= 0:
+                    valid = begin + cut + 1
+                    break
+                end = begin
+            if valid != size:
+                self._file.truncate(valid)
+            size = valid
+        self.offset = size
+
+    def extend(self, events: Iterable[Tuple[str, str]]):
+        """
+        Anexa eventos con una única escritura y la pasa al sistema operativo.
+
+        Raises:
+            ValueError: Si un ID contiene tabuladores o saltos de línea.
+        """
+        lines = []
+        for player_id, event in events:
+            if "\t" in player_id or "\n" in player_id:
+                raise ValueError(f"ID de jugador no válido: {player_id!r}.")
+            if type(event) is tuple:
+                event = f"{event[0]}\t{event[1]}"
+            lines.append(f"{player_id}\t{event}\n")
+        data = "".join(lines).encode("utf-8")
+        self._file.write(data)
+        self._file.flush()
+        self.offset += len(data)
+
+    def append(self, player_id: str, event: str):
+        """Anexa un evento."""
+        self.extend(((player_id, event),))
+
+    def read(self, start: int = 0) -> List[Tuple[str, str]]:
+        """
+        Lee los eventos desde la posición `start` hasta `offset`.
+
+        Returns:
+            List[Tuple[str, str]]: Eventos (jugador, evento) en orden; los de
+            rating, como (jugador, (RATING_EVENT, rating)).
+        """
+        with open(self.path, "rb") as fh:
+            fh.seek(start)
+            data = fh.read(self.offset - start).decode("utf-8")
+        events = [tuple(line.split("\t", 1)) for line in data.splitlines()]
+        if f"\t{RATING_EVENT}\t" in data:
+            prefix = RATING_EVENT + "\t"
+            events = [(player_id, (RATING_EVENT, int(event[len(prefix):])))
+                      if event.startswith(prefix) else (player_id, event)
+                      for player_id, event in events]
+        return events
+
+    def sync(self):
+        """Fuerza la escritura a disco (fsync) de lo anexado."""
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+    def close(self):
+        """Cierra el archivo."""
+        self._file.close()
+
+
+class AchievementStore:
+    """
+    Sistema de logros persistente: registro de eventos más instantáneas.
+
+    Expone los mismos registros que AchievementSystem; cada evento se
+    anexa al registro antes de aplicarse al sistema en memoria.
+
+    Atributos:
+        directory (str): Carpeta del registro y las instantáneas.
+        system (AchievementSystem): Estado en memoria (solo lectura).
+        snapshot_every (int | None): Eventos entre instantáneas automáticas.
+        keep_snapshots (int): Instantáneas que se conservan en disco.
+    """
+
+    def __init__(self, directory: str, rules: Iterable[AchievementRule] = DEFAULT_RULES,
+                 snapshot_every: Optional[int] = None, keep_snapshots: int = 2):
+        """
+        Abre el almacén y recupera su estado.
+
+        Args:
+            directory (str): Carpeta del registro y las instantáneas.
+            rules (Iterable[AchievementRule]): Reglas del sistema de logros.
+            snapshot_every (int, opcional): Eventos tras los cuales se guarda
+                una instantánea automáticamente.
+            keep_snapshots (int): Instantáneas más recientes que se conservan.
+        """
+        self.directory = directory
+        self.rules = tuple(rules)
+        self.snapshot_every = snapshot_every
+        self.keep_snapshots = max(1, keep_snapshots)
+        os.makedirs(directory, exist_ok=True)
+
+        self.log = EventLog(os.path.join(directory, LOG_FILE))
+        self.system, self._snapshot_offset = self._recover()
+        self._since_snapshot = 0
+
+    # -------------------------------------------------------
+    # Recuperación
+    # -------------------------------------------------------
+    def _snapshots(self) -> List[Tuple[int, str]]:
+        """Instantáneas en disco como (posición del registro, ruta), en orden."""
+        found = []
+        for name in os.listdir(self.directory):
+            if name.startswith(SNAPSHOT_PREFIX) and name.endswith(SNAPSHOT_SUFFIX):
+                offset = int(name[len(SNAPSHOT_PREFIX):-len(SNAPSHOT_SUFFIX)])
+                found.append((offset, os.path.join(self.directory, name)))
+        return sorted(found)
+
+    def _recover(self) -> Tuple[AchievementSystem, int]:
+        """Carga la instantánea más reciente y reprocesa el resto del registro."""
+        system, offset = AchievementSystem(self.rules), 0
+        snapshots = [entry for entry in self._snapshots() if entry[0] <= self.log.offset]
+        if snapshots:
+            offset, path = snapshots[-1]
+            with open(path, "rb") as fh:
+                system = AchievementSystem.load_snapshot(fh.read(), self.rules)
+        system.ingest(self.log.read(offset))
+        return system, offset
+
+    # -------------------------------------------------------
+    # Registro de eventos
+    # -------------------------------------------------------
+    def register_win(self, player_id: str) -> List[str]:
+        """Registra y aplica una victoria (ver AchievementSystem.register_win)."""
+        self.log.append(player_id, WIN_EVENT)
+        unlocked = self.system.register_win(player_id)
+        self._applied(1)
+        return unlocked
+
+    def register_loss(self, player_id: str):
+        """Registra y aplica una derrota (ver AchievementSystem.register_loss)."""
+        self.log.append(player_id, LOSS_EVENT)
+        self.system.register_loss(player_id)
+        self._applied(1)
+
+    def register_tournament_win(self, player_id: str) -> List[str]:
+        """Registra y aplica un torneo ganado."""
+        self.log.append(player_id, TOURNAMENT_WIN_EVENT)
+        unlocked = self.system.register_tournament_win(player_id)
+        self._applied(1)
+        return unlocked
+
+    def update_rating(self, player_id: str, rating: int) -> List[str]:
+        """Registra y aplica un cambio de rating (ver AchievementSystem.update_rating)."""
+        if not _is_known_event((RATING_EVENT, rating)):
+            raise ValueError(f"Rating no válido: {rating!r}.")
+        self.log.append(player_id, (RATING_EVENT, rating))
+        unlocked = self.system.update_rating(player_id, rating)
+        self._applied(1)
+        return unlocked
+
+    def ingest(self, events: Iterable[Tuple[str, str]]) -> List[Tuple[str, str]]:
+        """
+        Registra y aplica un flujo de eventos por bloques de `INGEST_CHUNK`
+        (ver AchievementSystem.ingest).
+
+        Raises:
+            ValueError: Si hay un evento desconocido. Ni su bloque ni los
+                siguientes se registran ni se aplican.
+        """
+        unlocked: List[Tuple[str, str]] = []
+        events = iter(events)
+        chunk = list(islice(events, INGEST_CHUNK))
+        while chunk:
+            # Validar antes de escribir: un bloque rechazado no debe quedar en el registro
+            for _, event in chunk:
+                if not _is_known_event(event):
+                    raise ValueError(f"Evento desconocido: '{event}'.")
+            self.log.extend(chunk)
+            unlocked += self.system.ingest(chunk)
+            self._applied(len(chunk))
+            chunk = list(islice(events, INGEST_CHUNK))
+        return unlocked
+
+    def get_achievements(self, player_id: str) -> List[str]:
+        """Logros actuales del jugador."""
+        return self.system.get_achievements(player_id)
+
+    def _applied(self, count: int):
+        """Cuenta eventos aplicados y guarda una instantánea si corresponde."""
+        self._since_snapshot += count
+        if self.snapshot_every and self._since_snapshot >= self.snapshot_every:
+            self.snapshot()
+
+    # -------------------------------------------------------
+    # Instantáneas
+    # -------------------------------------------------------
+    def snapshot(self) -> str:
+        """
+        Guarda una instantánea del estado actual y poda las antiguas.
+
+        La instantánea se escribe en un archivo temporal y se renombra, así
+        que una caída a mitad de escritura deja intacta la anterior.
+
+        Returns:
+            str: Ruta de la instantánea guardada.
+        """
+        self.log.sync()
+        offset = self.log.offset
+        path = os.path.join(self.directory, f"{SNAPSHOT_PREFIX}{offset:016d}{SNAPSHOT_SUFFIX}")
+        with open(path + ".tmp", "wb") as fh:
+            fh.write(self.system.dump_snapshot())
+            fh.flush()
+            os.fsync(fh.fileno())
+        os.replace(path + ".tmp", path)
+        self._snapshot_offset = offset
+        self._since_snapshot = 0
+
+        for _, old in self._snapshots()[:-self.keep_snapshots]:
+            os.remove(old)
+        return path
+
+    def close(self):
+        """Cierra el registro de eventos."""
+        self.log.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def _is_known_event(event) -> bool:
+    """Indica si el registro admite un evento (texto o (RATING_EVENT, entero))."""
+    if type(event) is tuple:
+        return len(event) == 2 and event[0] == RATING_EVENT and isinstance(event[1], int)
+    return event in _KNOWN_EVENTS and event != RATING_EVENT
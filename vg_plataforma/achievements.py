@@ -11,85 +11,622 @@
 #   - FIVE_WINS: cinco victorias acumuladas.
 #   - TOURNAMENT_WIN: victoria en un torneo.
 #
+# Los logros se definen como reglas de umbral sobre contadores
+# del jugador (victorias, racha, torneos ganados y rating). Las
+# reglas se compilan en índices de umbrales ordenados por tipo de
+# contador: cada evento solo consulta, con una búsqueda binaria,
+# los umbrales que cruza su contador, sin recorrer todas las reglas.
+#
+# Los logros de cada jugador se guardan como una máscara de bits
+# (un entero, un bit por código), así que otorgar y consultar un
+# logro es O(1). En los bits altos del mismo entero se apila el
+# orden de obtención, para devolver los logros en el orden en que
+# se otorgaron sin guardar una lista por jugador. Cada código
+# mantiene además la lista de jugadores que lo tienen, para
+# consultas masivas ("quién tiene X").
+#
+# Para reprocesar grandes volúmenes de resultados, `ingest` recibe
+# un flujo de eventos (jugador, evento) y lo consume por bloques,
+# con pasadas en C (map, compress, Counter) en lugar de una llamada
+# por evento: una pasada por tipo de evento da el valor del contador
+# de cada jugador en cada evento y su total final, y solo los eventos
+# que cruzan algún umbral se otorgan, en el orden del flujo.
+#
+# Las victorias alimentan además una clasificación incremental
+# (WinsLeaderboard) con top-K y puesto de cada jugador.
+#
 # El sistema está diseñado para integrarse con otros módulos
 # como "tournament" (para registrar victorias en torneos) y
 # "matchmaking" (para registrar partidas ganadas).
 #
+# Incluye:
+#   - Clase AchievementRule (definición de un logro por umbral)
+#   - Clase RuleIndex (reglas compiladas por tipo de contador)
+#   - Clase AchievementSystem (registro de eventos, logros e instantáneas)
+#
 # ===========================================================
 
-from typing import Dict, List
+import json
+import math
+import struct
+import sys
+from array import array
+from bisect import bisect_right
+from collections import Counter
+from dataclasses import dataclass
+from itertools import chain, compress, filterfalse, islice, repeat
+from operator import add, eq, gt, itemgetter, or_, sub
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from leaderboard import WinsLeaderboard
+from profiling import profiled
+
+
+# Tipos de contador sobre los que se definen las reglas
+WINS = "wins"
+STREAK = "streak"
+TOURNAMENTS = "tournaments"
+RATING = "rating"
+RULE_KINDS = (WINS, STREAK, TOURNAMENTS, RATING)
+
+# Eventos aceptados por `AchievementSystem.ingest`
+WIN_EVENT = "win"
+LOSS_EVENT = "loss"
+TOURNAMENT_WIN_EVENT = "tournament_win"
+_EVENT_SLOTS = {WIN_EVENT: 0, LOSS_EVENT: 1, TOURNAMENT_WIN_EVENT: 2}
+
+# Evento de rating: se pasa como (RATING_EVENT, rating) en lugar del texto
+RATING_EVENT = "rating"
+
+# Eventos que `ingest` toma del flujo por bloque
+INGEST_CHUNK = 1 << 20
+
+# Orden de los cruces de umbral de un mismo evento (victorias antes que racha)
+_CROSSING_RANK = {WINS: 0, STREAK: 1, TOURNAMENTS: 0, RATING: 0}
+
+# Formato de las instantáneas: firma, versión y contadores guardados
+_SNAPSHOT_MAGIC = b"VGAS"
+_SNAPSHOT_VERSION = 2
+_SNAPSHOT_COUNTERS = ("win_count", "win_streak", "tournament_wins", "best_rating")
+
+
+# -----------------------------------------------------------
+# Definición y compilación de reglas
+# -----------------------------------------------------------
+@dataclass(frozen=True)
+class AchievementRule:
+    """
+    Logro que se otorga cuando un contador del jugador alcanza un umbral.
+
+    Atributos:
+        code (str): Código del logro (por ejemplo, "FIVE_WINS").
+        kind (str): Contador evaluado: WINS, STREAK, TOURNAMENTS o RATING.
+        threshold (int): Valor del contador que desbloquea el logro.
+        description (str): Descripción legible del logro.
+    """
+    code: str
+    kind: str
+    threshold: int
+    description: str = ""
 
 
+# Reglas base del sistema de logros
+DEFAULT_RULES = (
+    AchievementRule("FIRST_WIN", WINS, 1, "Primera victoria obtenida"),
+    AchievementRule("FIVE_WINS", WINS, 5, "Cinco victorias acumuladas"),
+    AchievementRule("TOURNAMENT_WIN", TOURNAMENTS, 1, "Ganó un torneo"),
+)
+
+
+class RuleIndex:
+    """
+    Reglas compiladas en umbrales ordenados por tipo de contador.
+
+    Cuando un contador pasa de `old` a `new`, los logros desbloqueados son
+    los de umbral en (old, new]: dos búsquedas binarias delimitan ese tramo,
+    así que cada evento cuesta O(log reglas) más los logros que otorga.
+
+    Atributos:
+        rules (Dict[str, AchievementRule]): Reglas por código.
+        top (Dict[str, float]): Umbral más alto de cada tipo de contador
+            (-inf si no tiene reglas); por encima no queda nada que cruzar.
+        steps (Dict[str, Dict[int, List[str]]]): Por tipo de contador, los
+            códigos que se alcanzan al subir el contador de v - 1 a v.
+    """
+
+    def __init__(self, rules: Iterable[AchievementRule]):
+        """
+        Compila las reglas.
+
+        Raises:
+            ValueError: Si hay códigos repetidos o tipos de contador desconocidos.
+        """
+        self.rules: Dict[str, AchievementRule] = {}
+        by_kind: Dict[str, List[AchievementRule]] = {kind: [] for kind in RULE_KINDS}
+        for rule in rules:
+            if rule.kind not in by_kind:
+                raise ValueError(f"Tipo de contador desconocido: '{rule.kind}'.")
+            if rule.code in self.rules:
+                raise ValueError(f"El logro '{rule.code}' está definido dos veces.")
+            self.rules[rule.code] = rule
+            by_kind[rule.kind].append(rule)
+
+        self._thresholds: Dict[str, List[int]] = {}
+        self._codes: Dict[str, List[str]] = {}
+        for kind, kind_rules in by_kind.items():
+            kind_rules.sort(key=lambda rule: rule.threshold)
+            self._thresholds[kind] = [rule.threshold for rule in kind_rules]
+            self._codes[kind] = [rule.code for rule in kind_rules]
+        self.top: Dict[str, float] = {
+            kind: thresholds[-1] if thresholds else -math.inf
+            for kind, thresholds in self._thresholds.items()
+        }
+        self.steps: Dict[str, Dict[int, List[str]]] = {kind: {} for kind in RULE_KINDS}
+        for kind, kind_rules in by_kind.items():
+            for rule in kind_rules:
+                self.steps[kind].setdefault(math.ceil(rule.threshold), []).append(rule.code)
+
+    def crossed(self, kind: str, old: float, new: float) -> List[str]:
+        """
+        Códigos cuyo umbral se alcanza al pasar el contador de `old` a `new`.
+
+        Args:
+            kind (str): Tipo de contador.
+            old (float): Valor anterior del contador.
+            new (float): Valor nuevo del contador.
+
+        Returns:
+            List[str]: Códigos con umbral en (old, new], de menor a mayor.
+        """
+        if new <= old:
+            return []
+        thresholds = self._thresholds[kind]
+        lo = bisect_right(thresholds, old)
+        hi = bisect_right(thresholds, new, lo)
+        return self._codes[kind][lo:hi] if lo < hi else []
+
+
+# -----------------------------------------------------------
+# Clase principal: AchievementSystem
+# -----------------------------------------------------------
 class AchievementSystem:
     """
     Clase principal encargada de gestionar los logros de los jugadores.
 
     Responsabilidades:
-    - Registrar victorias individuales o de torneos.
-    - Contabilizar la cantidad total de victorias por jugador.
-    - Asignar logros según reglas predefinidas.
+    - Registrar victorias, derrotas, triunfos en torneos y cambios de rating.
+    - Mantener los contadores de cada jugador.
+    - Asignar logros evaluando solo las reglas que cada evento puede cruzar.
     - Permitir la consulta de los logros actuales de un jugador.
     """
 
-    def __init__(self):
+    def __init__(self, rules: Iterable[AchievementRule] = DEFAULT_RULES):
         """
         Inicializa las estructuras internas del sistema de logros.
+
+        Args:
+            rules (Iterable[AchievementRule]): Logros definidos por umbral.
+                Por defecto FIRST_WIN, FIVE_WINS y TOURNAMENT_WIN.
         """
-        # Diccionario que asocia cada jugador con una lista de logros obtenidos.
-        self.achievements: Dict[str, List[str]] = {}
+        # Reglas compiladas por tipo de contador.
+        self.rule_index = RuleIndex(rules)
 
-        # Reglas base del sistema de logros (clave = código del logro).
-        self.rules = {
-            "FIRST_WIN": "Primera victoria obtenida",
-            "FIVE_WINS": "Cinco victorias acumuladas",
-            "TOURNAMENT_WIN": "Ganó un torneo"
+        # Descripción de cada logro (clave = código del logro).
+        self.rules: Dict[str, str] = {
+            code: rule.description for code, rule in self.rule_index.rules.items()
         }
 
-        # Contador de victorias por jugador.
+        # Bit asignado a cada código (en el orden de definición de las reglas).
+        self._codes: List[str] = list(self.rule_index.rules)
+        self._bits: Dict[str, int] = {code: i for i, code in enumerate(self._codes)}
+
+        # Máscara de logros por jugador y jugadores que tienen cada logro.
+        # Los `len(_codes)` bits bajos son la máscara; encima, cada logro
+        # otorgado agrega (bit + 1) en un campo de `_order_width` bits.
+        self._order_shift = len(self._codes)
+        self._order_width = max(1, len(self._codes).bit_length())
+        self._masks: Dict[str, int] = {}
+        self._holders: Dict[str, List[str]] = {code: [] for code in self._codes}
+
+        # Contadores por jugador.
         self.win_count: Dict[str, int] = {}
+        self.win_streak: Dict[str, int] = {}
+        self.tournament_wins: Dict[str, int] = {}
+        self.best_rating: Dict[str, int] = {}
+
+        # Clasificación por victorias, actualizada con cada victoria.
+        self.leaderboard = WinsLeaderboard()
 
     # -----------------------------------------------------------
-    # Registro de victorias individuales
+    # Registro de victorias y derrotas individuales
     # -----------------------------------------------------------
-    def register_win(self, player_id: str):
+    @profiled("achievements.register_win")
+    def register_win(self, player_id: str) -> List[str]:
         """
         Registra una victoria individual y evalúa los logros alcanzados.
 
         Args:
             player_id (str): ID único del jugador.
 
+        Returns:
+            List[str]: Logros desbloqueados por esta victoria.
+
         Lógica:
-        - Incrementa el contador de victorias.
-        - Si es la primera victoria, otorga el logro "FIRST_WIN".
-        - Si alcanza cinco victorias, otorga el logro "FIVE_WINS".
+        - Incrementa el contador de victorias y la racha actual.
+        - Otorga los logros de victorias y de racha cuyo umbral se alcanza
+          (por ejemplo, "FIRST_WIN" con 1 victoria y "FIVE_WINS" con 5).
         """
-        # Incrementar contador de victorias del jugador
-        self.win_count[player_id] = self.win_count.get(player_id, 0) + 1
+        wins = self.win_count.get(player_id, 0) + 1
+        self.win_count[player_id] = wins
+        self.leaderboard.update(player_id, wins)
+        streak = self.win_streak.get(player_id, 0) + 1
+        self.win_streak[player_id] = streak
 
-        # Asegurar que el jugador tenga una lista de logros asignada
-        self.achievements.setdefault(player_id, [])
+        # Asegurar que el jugador tenga una máscara de logros asignada
+        self._masks.setdefault(player_id, 0)
 
-        # Logro por primera victoria
-        if self.win_count[player_id] == 1 and "FIRST_WIN" not in self.achievements[player_id]:
-            self.achievements[player_id].append("FIRST_WIN")
+        index = self.rule_index
+        return (self._award(player_id, index.crossed(WINS, wins - 1, wins))
+                + self._award(player_id, index.crossed(STREAK, streak - 1, streak)))
+
+    def register_loss(self, player_id: str):
+        """
+        Registra una derrota: reinicia la racha de victorias del jugador.
 
-        # Logro por cinco victorias
-        if self.win_count[player_id] == 5 and "FIVE_WINS" not in self.achievements[player_id]:
-            self.achievements[player_id].append("FIVE_WINS")
+        Args:
+            player_id (str): ID único del jugador.
+        """
+        self.win_streak[player_id] = 0
 
     # -----------------------------------------------------------
     # Registro de victoria en torneo
     # -----------------------------------------------------------
-    def register_tournament_win(self, player_id: str):
+    def register_tournament_win(self, player_id: str) -> List[str]:
+        """
+        Registra un torneo ganado y otorga los logros de torneos alcanzados
+        (por ejemplo, "TOURNAMENT_WIN" con el primero).
+
+        Args:
+            player_id (str): ID único del jugador.
+
+        Returns:
+            List[str]: Logros desbloqueados por este torneo.
+        """
+        count = self.tournament_wins.get(player_id, 0) + 1
+        self.tournament_wins[player_id] = count
+        self._masks.setdefault(player_id, 0)
+        return self._award(player_id, self.rule_index.crossed(TOURNAMENTS, count - 1, count))
+
+    # -----------------------------------------------------------
+    # Hitos de rating
+    # -----------------------------------------------------------
+    def update_rating(self, player_id: str, rating: int) -> List[str]:
         """
-        Registra un logro especial cuando el jugador gana un torneo.
+        Registra el rating actual del jugador y otorga los hitos alcanzados.
+
+        Solo cuenta el mejor rating alcanzado: bajar y volver a subir no
+        evalúa de nuevo los umbrales ya cruzados.
 
         Args:
             player_id (str): ID único del jugador.
+            rating (int): Rating actual.
+
+        Returns:
+            List[str]: Logros desbloqueados por este rating.
         """
-        self.achievements.setdefault(player_id, [])
-        if "TOURNAMENT_WIN" not in self.achievements[player_id]:
-            self.achievements[player_id].append("TOURNAMENT_WIN")
+        best: Optional[float] = self.best_rating.get(player_id)
+        if best is not None and rating <= best:
+            return []
+        self.best_rating[player_id] = rating
+        old = best if best is not None else -math.inf
+        return self._award(player_id, self.rule_index.crossed(RATING, old, rating))
+
+    # -----------------------------------------------------------
+    # Ingesta masiva de eventos
+    # -----------------------------------------------------------
+    def ingest(self, events: Iterable[Tuple[str, str]]) -> List[Tuple[str, str]]:
+        """
+        Aplica un flujo de eventos (jugador, evento) por bloques.
+
+        El flujo se consume en bloques de `INGEST_CHUNK` eventos, sin
+        materializarlo entero. En cada bloque, una pasada en C por tipo de
+        evento da el contador de cada jugador tras cada evento y su total;
+        los contadores, rachas y la clasificación se fijan una vez por
+        jugador, y solo los eventos que cruzan algún umbral se otorgan, en
+        orden. Los eventos de rating, y las victorias y derrotas si hay
+        reglas de racha, se recorren además en orden en Python. El estado
+        final (contadores, logros, su orden por jugador y el de los
+        poseedores de cada logro) es el mismo que con llamadas sucesivas a
+        `register_win`, `register_loss`, `register_tournament_win` y
+        `update_rating`.
+
+        Args:
+            events (Iterable[Tuple[str, str]]): Pares (ID de jugador, evento)
+                con evento WIN_EVENT, LOSS_EVENT, TOURNAMENT_WIN_EVENT o
+                (RATING_EVENT, rating), equivalente a `update_rating`.
+
+        Returns:
+            List[Tuple[str, str]]: Pares (jugador, código) desbloqueados, en
+            el orden en que se cruzó cada umbral.
+
+        Raises:
+            ValueError: Si hay un evento desconocido. Ni su bloque ni los
+                siguientes se aplican; los bloques anteriores ya quedaron
+                aplicados.
+        """
+        unlocked: List[Tuple[str, str]] = []
+        events = iter(events)
+        chunk = list(islice(events, INGEST_CHUNK))
+        while chunk:
+            self._ingest_chunk(chunk, unlocked)
+            chunk = list(islice(events, INGEST_CHUNK))
+        return unlocked
+
+    def _ingest_chunk(self, events: List[Tuple[str, str]],
+                      unlocked: List[Tuple[str, str]]):
+        """Aplica un bloque de `ingest` y anexa a `unlocked` lo desbloqueado."""
+        kinds = list(map(itemgetter(1), events))
+        present = set(kinds)
+        ratings = present.difference(_EVENT_SLOTS)
+        for kind in ratings:
+            if not _is_rating_event(kind):
+                raise ValueError(f"Evento desconocido: '{kind}'.")
+
+        # Posiciones pares: la impar siguiente ordena los cruces de racha
+        # tras los de victorias del mismo evento.
+        positions = range(0, 2 * len(events), 2)
+        is_win = list(map(eq, kinds, repeat(WIN_EVENT)))
+        is_loss = list(map(eq, kinds, repeat(LOSS_EVENT))) if LOSS_EVENT in present else None
+        winners = list(map(itemgetter(0), compress(events, is_win)))
+
+        # Eventos que cruzan algún umbral, en tres listas paralelas: clave de
+        # orden (posición más orden dentro del evento), jugador y códigos.
+        # Se otorgan al final, ordenados.
+        crossings: Tuple[List[int], List[str], List[List[str]]] = ([], [], [])
+        win_count = self.win_count
+        wins = self._tally(WINS, winners, compress(positions, is_win), win_count, crossings)
+        if TOURNAMENT_WIN_EVENT in present:
+            is_tournament = list(map(eq, kinds, repeat(TOURNAMENT_WIN_EVENT)))
+            tournaments = self._tally(TOURNAMENTS,
+                                      list(map(itemgetter(0), compress(events, is_tournament))),
+                                      compress(positions, is_tournament),
+                                      self.tournament_wins, crossings)
+            self.tournament_wins.update(tournaments)
+        else:
+            tournaments = {}
+        if ratings:
+            self._rating_crossings(compress(zip(positions, events),
+                                            map(isinstance, kinds, repeat(tuple))), crossings)
+
+        # Racha final: con alguna derrota en el bloque, las victorias tras la
+        # última; sin derrotas, la racha anterior más las victorias. Con
+        # reglas de racha se recorre además en orden para hallar sus cruces.
+        streaks = self.win_streak
+        if self.rule_index.steps[STREAK] and (wins or is_loss):
+            self._streak_crossings(zip(positions, events), is_win, is_loss, crossings)
+        elif is_loss is not None:
+            last_loss = dict(zip(map(itemgetter(0), compress(events, is_loss)),
+                                 compress(positions, is_loss)))
+            late = map(gt, compress(positions, is_win), map(last_loss.get, winners, repeat(-1)))
+            streaks.update(dict.fromkeys(last_loss, 0))
+            streaks.update(_added(streaks, Counter(compress(winners, late))))
+        else:
+            gained = dict(zip(wins, map(sub, wins.values(), map(win_count.get, wins, repeat(0)))))
+            streaks.update(_added(streaks, gained))
+
+        win_count.update(wins)
+        # Entre empatados decide quién llegó antes a su conteo: la tabla se
+        # actualiza en el orden de la última victoria de cada jugador.
+        last_win = list(reversed(dict.fromkeys(reversed(winners))))
+        self.leaderboard.update_many(dict(zip(last_win, map(wins.__getitem__, last_win))))
+        masks = self._masks
+        masks.update(dict.fromkeys(filterfalse(masks.__contains__, chain(wins, tournaments)), 0))
+
+        # Los cruces se otorgan en el orden de los eventos, como en las
+        # llamadas sucesivas: de eso dependen los poseedores de cada logro
+        # y el orden de los logros de cada jugador. Es `_award` en línea,
+        # sin una llamada por cruce.
+        keys, owners, grants = crossings
+        bits = self._bits
+        holders = self._holders
+        shift = self._order_shift
+        width = self._order_width
+        low = (1 << shift) - 1
+        for i in sorted(range(len(keys)), key=keys.__getitem__):
+            player_id = owners[i]
+            value = masks.get(player_id, 0)
+            for code in grants[i]:
+                bit = bits[code]
+                if not value >> bit & 1:
+                    held = (value & low).bit_count()
+                    value |= 1 << bit | (bit + 1) << (shift + held * width)
+                    holders[code].append(player_id)
+                    unlocked.append((player_id, code))
+            masks[player_id] = value
+
+    def _tally(self, kind: str, who: List[str], at: Iterable[int],
+               before: Dict[str, int], crossings: tuple) -> Dict[str, int]:
+        """
+        Cuenta los eventos de un contador acumulativo (victorias o torneos),
+        de los jugadores `who` en las posiciones `at`, y anexa a `crossings`
+        los que cruzan umbrales.
+
+        Cada jugador recibe en su primer evento un iterador sobre los valores
+        que tomará su contador, así que `map(next, ...)` da en C, en una sola
+        pasada, el valor en cada evento y el total final.
+
+        Returns:
+            Dict[str, int]: Valor final del contador de cada jugador con eventos.
+        """
+        tally = _Tally(before)
+        values = list(map(next, map(tally.__getitem__, who)))
+        steps = self.rule_index.steps[kind]
+        hit = list(map(steps.__contains__, values))
+        if any(hit):
+            keys, owners, grants = crossings
+            keys += map(add, compress(at, hit), repeat(_CROSSING_RANK[kind]))
+            owners += compress(who, hit)
+            grants += map(steps.__getitem__, compress(values, hit))
+        return dict(zip(tally, map(sub, map(next, tally.values()), repeat(1))))
+
+    def _rating_crossings(self, rated: Iterable[tuple], crossings: tuple):
+        """Aplica en orden los pares (posición, (jugador, (RATING_EVENT, rating)))."""
+        best_rating = self.best_rating
+        crossed = self.rule_index.crossed
+        rank = _CROSSING_RANK[RATING]
+        keys, owners, grants = crossings
+        for position, (player_id, (_, rating)) in rated:
+            best = best_rating.get(player_id)
+            if best is not None and rating <= best:
+                continue
+            best_rating[player_id] = rating
+            codes = crossed(RATING, best if best is not None else -math.inf, rating)
+            if codes:
+                keys.append(position + rank)
+                owners.append(player_id)
+                grants.append(codes)
+
+    def _streak_crossings(self, tagged: Iterable[tuple], is_win: List[bool],
+                          is_loss: Optional[List[bool]], crossings: tuple):
+        """
+        Recorre en orden las victorias y derrotas del bloque, fija la racha
+        final de cada jugador y anexa a `crossings` los eventos que cruzan
+        umbrales de racha.
+        """
+        steps = self.rule_index.steps[STREAK]
+        rank = _CROSSING_RANK[STREAK]
+        streaks = self.win_streak
+        current: Dict[str, int] = {}
+        keys, owners, grants = crossings
+        relevant = map(or_, is_win, is_loss) if is_loss is not None else is_win
+        for position, (player_id, kind) in compress(tagged, relevant):
+            if kind == LOSS_EVENT:
+                current[player_id] = 0
+                continue
+            streak = current.get(player_id)
+            streak = current[player_id] = (streaks.get(player_id, 0)
+                                           if streak is None else streak) + 1
+            codes = steps.get(streak)
+            if codes:
+                keys.append(position + rank)
+                owners.append(player_id)
+                grants.append(codes)
+        streaks.update(current)
+
+    # -----------------------------------------------------------
+    # Instantáneas compactas
+    # -----------------------------------------------------------
+    def dump_snapshot(self) -> bytes:
+        """
+        Serializa el estado completo en columnas binarias.
+
+        Formato: firma, longitud y cabecera JSON, y secciones contiguas:
+        los IDs de los jugadores como un único bloque de texto, y por cada
+        contador (y las máscaras, con su orden de obtención) un byte de
+        presencia y un arreglo de enteros de 64 bits por jugador. Los
+        poseedores de cada logro se guardan como índices de jugador, en
+        orden de obtención.
+
+        Returns:
+            bytes: Instantánea que `load_snapshot` reconstruye.
+        """
+        counters = [getattr(self, name) for name in _SNAPSHOT_COUNTERS]
+        ids = list(dict.fromkeys(chain(self._masks, *counters)))
+        position = dict(zip(ids, range(len(ids))))
+
+        blob = "\n".join(ids).encode("utf-8")
+        if ids and blob.count(b"\n") != len(ids) - 1:
+            raise ValueError("Los IDs de jugador no pueden contener saltos de línea.")
+        sections = [(blob, "ids")]
+        for name, values in zip(_SNAPSHOT_COUNTERS + ("masks",), counters + [self._masks]):
+            sections.append((bytes(map(values.__contains__, ids)), name + ".present"))
+            column = list(map(values.get, ids, repeat(0)))
+            sections.append((_pack_ints(column, self._mask_width() if name == "masks" else 8),
+                             name))
+        for code in self._codes:
+            holders = array("q", map(position.__getitem__, self._holders[code]))
+            sections.append((holders.tobytes(), "holders." + code))
+
+        header = json.dumps({
+            "version": _SNAPSHOT_VERSION, "codes": self._codes, "players": len(ids),
+            "sections": [[name, len(blob)] for blob, name in sections],
+        }).encode("utf-8")
+        return b"".join([_SNAPSHOT_MAGIC, struct.pack("<I", len(header)), header]
+                        + [blob for blob, _ in sections])
+
+    @classmethod
+    def load_snapshot(cls, data: bytes,
+                      rules: Iterable[AchievementRule] = DEFAULT_RULES) -> "AchievementSystem":
+        """
+        Reconstruye un sistema a partir de `dump_snapshot`.
+
+        Los diccionarios se arman con `zip`/`compress` sobre las columnas,
+        sin bucles de Python por jugador (salvo las máscaras que no caben
+        en 64 bits, que se decodifican una a una).
+
+        Args:
+            data (bytes): Instantánea.
+            rules (Iterable[AchievementRule]): Reglas del sistema; deben
+                definir los mismos códigos, en el mismo orden, que al guardarla.
+
+        Returns:
+            AchievementSystem: Sistema con el estado restaurado.
+
+        Raises:
+            ValueError: Si los datos no son una instantánea válida o las
+                reglas no coinciden.
+        """
+        view = memoryview(data)
+        if bytes(view[:4]) != _SNAPSHOT_MAGIC:
+            raise ValueError("Los datos no son una instantánea de logros.")
+        (header_len,) = struct.unpack_from("<I", view, 4)
+        header = json.loads(bytes(view[8:8 + header_len]))
+        system = cls(rules)
+        if header["version"] != _SNAPSHOT_VERSION or header["codes"] != system._codes:
+            raise ValueError("La instantánea no corresponde a estas reglas.")
+
+        sections = {}
+        offset = 8 + header_len
+        for name, size in header["sections"]:
+            sections[name] = view[offset:offset + size]
+            offset += size
+
+        ids = str(sections["ids"], "utf-8").split("\n") if header["players"] else []
+        for name in _SNAPSHOT_COUNTERS + ("masks",):
+            width = system._mask_width() if name == "masks" else 8
+            column = _unpack_ints(sections[name], width)
+            present = sections[name + ".present"]
+            values = dict(zip(compress(ids, present), compress(column, present)))
+            setattr(system, "_masks" if name == "masks" else name, values)
+        for code in system._codes:
+            holders = array("q")
+            holders.frombytes(sections["holders." + code])
+            system._holders[code] = list(map(ids.__getitem__, holders))
+        system.leaderboard = WinsLeaderboard.from_counts(system.win_count)
+        return system
+
+    def _mask_width(self) -> int:
+        """Bytes por máscara en las instantáneas (8 si caben en un entero de 64 bits)."""
+        bits = self._order_shift + self._order_shift * self._order_width
+        return 8 if bits <= 63 else (bits + 7) // 8
+
+    def _award(self, player_id: str, codes: List[str]) -> List[str]:
+        """Otorga los logros que el jugador aún no tiene y devuelve esos."""
+        if not codes:
+            return []
+        value = self._masks.get(player_id, 0)
+        held = (value & ((1 << self._order_shift) - 1)).bit_count()
+        new = []
+        for code in codes:
+            bit = self._bits[code]
+            if not value >> bit & 1:
+                position = self._order_shift + held * self._order_width
+                value |= 1 << bit | (bit + 1) << position
+                held += 1
+                new.append(code)
+                self._holders[code].append(player_id)
+        self._masks[player_id] = value
+        return new
 
     # -----------------------------------------------------------
     # Consulta de logros
@@ -102,6 +639,86 @@ class AchievementSystem:
             player_id (str): ID del jugador.
 
         Returns:
-            List[str]: Lista de códigos de logros obtenidos.
+            List[str]: Lista de códigos de logros obtenidos, en el orden en
+            que se otorgaron.
+        """
+        return self._decode(self._masks.get(player_id, 0))
+
+    def has_achievement(self, player_id: str, code: str) -> bool:
+        """Indica en O(1) si el jugador tiene un logro."""
+        bit = self._bits.get(code)
+        return bit is not None and bool(self._masks.get(player_id, 0) >> bit & 1)
+
+    def holders(self, code: str) -> List[str]:
+        """
+        Devuelve los jugadores que tienen un logro, en el orden en que lo
+        obtuvieron.
+
+        Args:
+            code (str): Código del logro.
+
+        Raises:
+            ValueError: Si el código no corresponde a ninguna regla.
         """
-        return self.achievements.get(player_id, [])
+        if code not in self._holders:
+            raise ValueError(f"El logro '{code}' no existe.")
+        return list(self._holders[code])
+
+    @property
+    def achievements(self) -> Dict[str, List[str]]:
+        """Logros de cada jugador como listas de códigos (copia, O(jugadores))."""
+        return {player_id: self._decode(mask) for player_id, mask in self._masks.items()}
+
+    def _decode(self, mask: int) -> List[str]:
+        """Códigos de una máscara, en el orden en que se otorgaron."""
+        codes = []
+        field = (1 << self._order_width) - 1
+        order = mask >> self._order_shift
+        while order:
+            codes.append(self._codes[(order & field) - 1])
+            order >>= self._order_width
+        return codes
+
+
+class _Tally(dict):
+    """
+    Iteradores por jugador sobre los valores sucesivos de un contador, que
+    se crean al pedir un jugador por primera vez, a partir de su valor en
+    `before`.
+    """
+    __slots__ = ("before",)
+
+    def __init__(self, before: Dict[str, int]):
+        super().__init__()
+        self.before = before
+
+    def __missing__(self, player_id: str):
+        values = self[player_id] = iter(range(self.before.get(player_id, 0) + 1, sys.maxsize))
+        return values
+
+
+def _is_rating_event(event) -> bool:
+    """Indica si `event` es un evento de rating: (RATING_EVENT, entero)."""
+    return (type(event) is tuple and len(event) == 2 and event[0] == RATING_EVENT
+            and isinstance(event[1], int))
+
+
+def _added(totals: Dict[str, int], counts: Dict[str, int]) -> Dict[str, int]:
+    """Para cada clave de `counts`, su valor en `totals` (0 si falta) más el de `counts`."""
+    return dict(zip(counts, map(add, map(totals.get, counts, repeat(0)), counts.values())))
+
+
+def _pack_ints(values: List[int], width: int) -> bytes:
+    """Empaqueta enteros no negativos con `width` bytes cada uno."""
+    if width == 8:
+        return array("q", values).tobytes()
+    return b"".join(value.to_bytes(width, "little") for value in values)
+
+
+def _unpack_ints(blob: memoryview, width: int):
+    """Inversa de `_pack_ints`."""
+    if width == 8:
+        column = array("q")
+        column.frombytes(blob)
+        return column
+    return [int.from_bytes(blob[i:i + width], "little") for i in range(0, len(blob), width)]
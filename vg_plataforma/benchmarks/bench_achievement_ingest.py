@@ -0,0 +1,73 @@
+# ===========================================================
+# Archivo: bench_achievement_ingest.py
+# Descripción:
+# Benchmark de la ingesta masiva del sistema de logros: compara
+# aplicar un flujo de eventos con llamadas sucesivas a
+# register_win / register_loss / register_tournament_win con
+# aplicarlo con `AchievementSystem.ingest`.
+#
+# Cada escenario se mide en frío (sistema vacío) y en caliente
+# (un segundo flujo sobre los mismos jugadores), con solo
+# victorias y torneos, y con un 10% de derrotas.
+#
+# Uso:
+#   python vg_plataforma/benchmarks/bench_achievement_ingest.py [N]
+#
+# N es el número de eventos por flujo (por defecto 1.000.000).
+#
+# ===========================================================
+
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from achievements import (LOSS_EVENT, TOURNAMENT_WIN_EVENT, WIN_EVENT,  # noqa: E402
+                          AchievementSystem)
+
+
+def make_events(rng: random.Random, n: int, players: int, losses: float):
+    events = []
+    for _ in range(n):
+        roll = rng.random()
+        if roll < 0.05:
+            event = TOURNAMENT_WIN_EVENT
+        elif roll < 0.05 + losses:
+            event = LOSS_EVENT
+        else:
+            event = WIN_EVENT
+        events.append((f"player-{rng.randrange(players)}", event))
+    return events
+
+
+def sequential(system: AchievementSystem, events):
+    calls = {WIN_EVENT: system.register_win, LOSS_EVENT: system.register_loss,
+             TOURNAMENT_WIN_EVENT: system.register_tournament_win}
+    for player_id, event in events:
+        calls[event](player_id)
+
+
+def main(n: int):
+    print(f"{'jugadores':>10} {'derrotas':>9} {'estado':>8} "
+          f"{'sucesivas':>10} {'ingest':>8} {'mejora':>7}")
+    for players in (200_000, 10_000):
+        for losses in (0.0, 0.10):
+            rng = random.Random(players)
+            batches = [make_events(rng, n, players, losses) for _ in range(2)]
+            one, bulk = AchievementSystem(), AchievementSystem()
+            for label, events in zip(("frío", "caliente"), batches):
+                start = time.perf_counter()
+                sequential(one, events)
+                slow = time.perf_counter() - start
+                start = time.perf_counter()
+                bulk.ingest(events)
+                fast = time.perf_counter() - start
+                assert bulk.achievements == one.achievements
+                print(f"{players:>10} {losses:>9.0%} {label:>8} "
+                      f"{slow:>9.2f}s {fast:>7.2f}s {slow / fast:>6.1f}x")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
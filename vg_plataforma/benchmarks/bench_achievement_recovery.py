@@ -0,0 +1,64 @@
+# ===========================================================
+# Archivo: bench_achievement_recovery.py
+# Descripción:
+# Benchmark de recuperación del sistema de logros persistente:
+# compara reconstruir el estado reprocesando todo el registro de
+# eventos con cargar la instantánea compacta y reprocesar solo el
+# tramo final.
+#
+# Uso:
+#   python vg_plataforma/benchmarks/bench_achievement_recovery.py [N]
+#
+# N es el número de jugadores (por defecto 5.000.000). Se genera
+# aproximadamente una victoria y media por jugador.
+#
+# ===========================================================
+
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from achievement_store import AchievementStore, EventLog, LOG_FILE  # noqa: E402
+from achievements import TOURNAMENT_WIN_EVENT, WIN_EVENT, AchievementSystem  # noqa: E402
+
+
+def main(n: int):
+    rng = random.Random(42)
+    directory = tempfile.mkdtemp(prefix="bench-achievements-")
+    events = [(f"player-{i}", WIN_EVENT) for i in range(n)]
+    events += [(f"player-{rng.randrange(n)}", WIN_EVENT) for _ in range(n // 2)]
+    events += [(f"player-{rng.randrange(n)}", TOURNAMENT_WIN_EVENT) for _ in range(n // 20)]
+    tail = [(f"player-{rng.randrange(n)}", WIN_EVENT) for _ in range(n // 100)]
+
+    try:
+        with AchievementStore(directory) as store:
+            store.ingest(events)
+            start = time.perf_counter()
+            path = store.snapshot()
+            print(f"instantánea: {time.perf_counter() - start:.2f} s, "
+                  f"{os.path.getsize(path) / 1e6:.0f} MB")
+            store.ingest(tail)
+        del store, events
+
+        log = EventLog(os.path.join(directory, LOG_FILE))
+        start = time.perf_counter()
+        AchievementSystem().ingest(log.read())
+        print(f"reprocesar todo el registro: {time.perf_counter() - start:.2f} s")
+        log.close()
+
+        start = time.perf_counter()
+        with AchievementStore(directory) as recovered:
+            players = len(recovered.system.win_count)
+        print(f"instantánea + tramo final: {time.perf_counter() - start:.2f} s "
+              f"({players} jugadores)")
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 5_000_000)
@@ -0,0 +1,47 @@
+# ===========================================================
+# Archivo: bench_player_store.py
+# Descripción:
+# Benchmark de memoria de la cola del Matchmaker: compara los
+# bytes por jugador en cola con la cola por defecto (objetos
+# Player) y con el almacén compacto PlayerStore.
+#
+# Uso:
+#   python vg_plataforma/benchmarks/bench_player_store.py [N]
+#
+# ===========================================================
+
+import os
+import sys
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from matchmaking import Matchmaker, Player  # noqa: E402
+from player_store import PlayerStore  # noqa: E402
+
+
+def measure(n: int, compact: bool) -> float:
+    """Bytes asignados por jugador en cola (incluye el ID de cada jugador)."""
+    tracemalloc.start()
+    base = tracemalloc.get_traced_memory()[0]
+    m = Matchmaker(store=PlayerStore() if compact else None)
+    for i in range(n):
+        m.enqueue(Player(id=f"player-{i}", rating=800 + (i * 7919) % 1600))
+    used = tracemalloc.get_traced_memory()[0] - base
+    tracemalloc.stop()
+    del m
+    return used / n
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    before = measure(n, compact=False)
+    after = measure(n, compact=True)
+    print(f"Jugadores en cola: {n}")
+    print(f"  Cola por defecto (Player):  {before:8.1f} bytes/jugador")
+    print(f"  PlayerStore compacto:       {after:8.1f} bytes/jugador")
+    print(f"  Reducción:                  {100 * (1 - after / before):8.1f} %")
+
+
+if __name__ == "__main__":
+    main()
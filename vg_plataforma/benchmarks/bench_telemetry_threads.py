@@ -0,0 +1,67 @@
+# ===========================================================
+# Archivo: bench_telemetry_threads.py
+# Descripción:
+# Benchmark de contención del registro de telemetría desde
+# varios hilos: compara TelemetrySystem (fragmentos por hilo)
+# con un registro equivalente protegido por un único candado
+# global, para 1, 8 y 32 hilos.
+#
+# Uso:
+#   python vg_plataforma/benchmarks/bench_telemetry_threads.py [muestras_por_hilo]
+#
+# ===========================================================
+
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from telemetry import MetricStats, QuantileSketch, TelemetrySystem  # noqa: E402
+
+
+class GlobalLockTelemetry:
+    """Referencia: el mismo trabajo por muestra bajo un candado global."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.stats = MetricStats()
+        self.sketch = QuantileSketch()
+
+    def record(self, metric, value):
+        with self.lock:
+            self.stats.add(value)
+            self.sketch.add(value)
+
+
+def run(telemetry, threads: int, per_thread: int) -> float:
+    """Devuelve registros por segundo con `threads` hilos."""
+    barrier = threading.Barrier(threads + 1)
+
+    def worker():
+        barrier.wait()
+        for i in range(per_thread):
+            telemetry.record("match_durations", i * 1e-3)
+
+    pool = [threading.Thread(target=worker) for _ in range(threads)]
+    for th in pool:
+        th.start()
+    barrier.wait()
+    start = time.perf_counter()
+    for th in pool:
+        th.join()
+    return threads * per_thread / (time.perf_counter() - start)
+
+
+def main():
+    per_thread = int(sys.argv[1]) if len(sys.argv) > 1 else 20_000
+    print(f"{'hilos':>6} {'candado global':>16} {'por hilo':>12}   (registros/s)")
+    for threads in (1, 8, 32):
+        baseline = run(GlobalLockTelemetry(), threads, per_thread)
+        sharded = run(TelemetrySystem(max_samples=0), threads, per_thread)
+        print(f"{threads:>6} {baseline:>16,.0f} {sharded:>12,.0f}")
+
+
+if __name__ == "__main__":
+    main()
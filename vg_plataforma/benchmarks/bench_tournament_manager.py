@@ -0,0 +1,87 @@
+# ===========================================================
+# Archivo: bench_tournament_manager.py
+# Descripción:
+# Benchmark de TournamentManager: juega todos los partidos de
+# 100, 1.000 y 10.000 torneos de 8 jugadores y mide dos
+# latencias desde que llega un resultado:
+#   - "processing_latency": hasta que el gestor deja el partido
+#     siguiente asignado o en espera de servidor (su costo).
+#   - "schedule_latency": hasta que ese partido recibe servidor
+#     (incluye la espera por uno libre).
+#
+# La carga por servidor es la misma en todas las escalas: hay
+# `servidores por torneo` × torneos servidores, y el cliente
+# mantiene a lo sumo VENTANA resultados sin responder, como un
+# número fijo de servidores de juego enviando resultados. Así
+# solo cambia cuántos torneos gestiona el gestor, y la latencia
+# de procesamiento debe mantenerse plana.
+#
+# Uso:
+#   python vg_plataforma/benchmarks/bench_tournament_manager.py [servidores por torneo]
+#
+# ===========================================================
+
+import os
+import queue
+import sys
+import time
+from collections import deque
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from telemetry import TelemetrySystem  # noqa: E402
+from tournament import Tournament  # noqa: E402
+from tournament_manager import (PROCESSING_LATENCY_METRIC,  # noqa: E402
+                                SCHEDULE_LATENCY_METRIC, TournamentManager)
+
+# Resultados enviados y aún sin responder, como máximo
+WINDOW = 64
+
+
+def run(tournaments: int, slots_per_tournament: int):
+    """
+    Devuelve (segundos, p50/p99 de procesamiento en ms, p50/p99 de
+    asignación en ms) de jugar todos los torneos.
+    """
+    telemetry = TelemetrySystem(sketch_metrics=(PROCESSING_LATENCY_METRIC,
+                                                SCHEDULE_LATENCY_METRIC))
+    scheduled = queue.Queue()
+    manager = TournamentManager(workers=4, slots=tournaments * slots_per_tournament,
+                                on_schedule=scheduled.put, telemetry=telemetry)
+    with manager:
+        for n in range(tournaments):
+            t = Tournament(f"t{n}")
+            for i in range(8):
+                t.register(f"t{n}-p{i}")
+            t.create_bracket()
+            manager.add_tournament(t)
+
+        pending = deque()
+        start = time.perf_counter()
+        for _ in range(tournaments * 7):
+            if len(pending) >= WINDOW:
+                pending.popleft().result()
+            match = scheduled.get()
+            pending.append(manager.submit_result(match.tournament_id, match.round_index,
+                                                 match.match_index, match.players[0]))
+        manager.join()
+        elapsed = time.perf_counter() - start
+
+    return (elapsed,
+            telemetry.get_percentile(PROCESSING_LATENCY_METRIC, 50) * 1e3,
+            telemetry.get_percentile(PROCESSING_LATENCY_METRIC, 99) * 1e3,
+            telemetry.get_percentile(SCHEDULE_LATENCY_METRIC, 50) * 1e3,
+            telemetry.get_percentile(SCHEDULE_LATENCY_METRIC, 99) * 1e3)
+
+
+def main():
+    slots_per_tournament = int(sys.argv[1]) if len(sys.argv) > 1 else 4
+    print(f"{'torneos':>8} {'segundos':>9} {'proc p50':>9} {'proc p99':>9} "
+          f"{'asig p50':>9} {'asig p99':>9}  (ms)")
+    for tournaments in (100, 1_000, 10_000):
+        elapsed, *latencies = run(tournaments, slots_per_tournament)
+        print(f"{tournaments:>8} {elapsed:>9.2f} " + " ".join(f"{v:>9.3f}" for v in latencies))
+
+
+if __name__ == "__main__":
+    main()
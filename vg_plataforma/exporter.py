@@ -0,0 +1,268 @@
+# ===========================================================
+# Archivo: exporter.py
+# Descripción:
+# Este módulo implementa el exportador de métricas de
+# TelemetrySystem en formato de texto de Prometheus.
+#
+# Funciona con dos hilos en segundo plano:
+#   - El hilo de captura toma cada `interval` segundos una
+#     instantánea de las métricas (solo toma brevemente el
+#     candado de cada fragmento de TelemetrySystem) y la deja,
+#     ya renderizada, en un buffer acotado.
+#   - El hilo de salida vacía el buffer en lotes: escribe el
+#     último texto en un archivo local y lo publica en un
+#     endpoint HTTP local (127.0.0.1).
+#
+# Si la salida es lenta y el buffer se llena, se aplica la
+# política de descarte configurada; el registro de métricas
+# nunca se bloquea por el exportador.
+#
+# Incluye:
+#   - Función render_prometheus (formato de texto de Prometheus)
+#   - Clase PrometheusExporter (exportación en segundo plano)
+#
+# ===========================================================
+
+import os
+import re
+import threading
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Deque, List, Optional
+
+from telemetry import TelemetrySystem
+
+
+# Políticas de descarte cuando el buffer de instantáneas está lleno
+DROP_OLDEST = "drop_oldest"
+DROP_NEWEST = "drop_newest"
+
+# Cuantiles publicados para las métricas con sketch
+EXPORTED_QUANTILES = (0.5, 0.95, 0.99)
+
+
+# -----------------------------------------------------------
+# Formato de texto de Prometheus
+# -----------------------------------------------------------
+def _metric_name(namespace: str, metric: str) -> str:
+    """Nombre válido para Prometheus: [a-zA-Z_][a-zA-Z0-9_]*."""
+    name = re.sub(r"[^a-zA-Z0-9_]", "_", f"{namespace}_{metric}" if namespace else metric)
+    return name if not name[0].isdigit() else "_" + name
+
+
+def render_prometheus(telemetry: TelemetrySystem, namespace: str = "vg_plataforma") -> str:
+    """
+    Renderiza las métricas de un TelemetrySystem en formato de texto de Prometheus.
+
+    Cada métrica se publica como `summary` (cuantiles si tiene sketch, más
+    `_sum` y `_count`) y las solicitudes del último minuto como `gauge`.
+
+    Args:
+        telemetry (TelemetrySystem): Sistema del que se leen las métricas.
+        namespace (str): Prefijo de los nombres de métrica.
+
+    Returns:
+        str: Texto de exposición terminado en salto de línea.
+    """
+    stats = telemetry.stats
+    sketches = telemetry.sketches
+    lines: List[str] = []
+
+    for metric in sorted(stats):
+        s = stats[metric]
+        name = _metric_name(namespace, metric)
+        lines.append(f"# HELP {name} Resumen de la métrica {metric}.")
+        lines.append(f"# TYPE {name} summary")
+        sketch = sketches.get(metric)
+        if sketch is not None and sketch.count:
+            for q in EXPORTED_QUANTILES:
+                lines.append(f'{name}{{quantile="{q}"}} {sketch.quantile(q)!r}')
+        lines.append(f"{name}_sum {s.mean * s.count!r}")
+        lines.append(f"{name}_count {s.count}")
+
+    name = _metric_name(namespace, "requests_per_minute")
+    lines.append(f"# HELP {name} Solicitudes registradas en el último minuto.")
+    lines.append(f"# TYPE {name} gauge")
+    lines.append(f"{name} {telemetry.get_requests_per_minute()}")
+    return "\n".join(lines) + "\n"
+
+
+# -----------------------------------------------------------
+# Exportador en segundo plano
+# -----------------------------------------------------------
+class PrometheusExporter:
+    """
+    Exportador en segundo plano de métricas a archivo y HTTP local.
+
+    Atributos:
+        telemetry (TelemetrySystem): Sistema exportado.
+        interval (float): Segundos entre instantáneas.
+        path (str | None): Archivo donde se escribe el último texto.
+        port (int | None): Puerto HTTP efectivo (0 elige uno libre).
+        dropped (int): Instantáneas descartadas por buffer lleno.
+    """
+
+    def __init__(self, telemetry: TelemetrySystem, interval: float = 5.0,
+                 path: Optional[str] = None, port: Optional[int] = None,
+                 max_pending: int = 4, drop_policy: str = DROP_OLDEST,
+                 namespace: str = "vg_plataforma"):
+        """
+        Inicializa el exportador (no arranca hasta `start()`).
+
+        Args:
+            telemetry (TelemetrySystem): Sistema a exportar.
+            interval (float): Segundos entre instantáneas.
+            path (str, opcional): Archivo de salida.
+            port (int, opcional): Puerto del endpoint HTTP en 127.0.0.1
+                (0 para uno libre; None lo desactiva).
+            max_pending (int): Instantáneas que puede acumular el buffer.
+            drop_policy (str): DROP_OLDEST o DROP_NEWEST.
+            namespace (str): Prefijo de los nombres de métrica.
+
+        Raises:
+            ValueError: Si la política de descarte o `max_pending` no son válidos.
+        """
+        if drop_policy not in (DROP_OLDEST, DROP_NEWEST):
+            raise ValueError(f"Política de descarte desconocida: '{drop_policy}'.")
+        if max_pending < 1:
+            raise ValueError("max_pending debe ser al menos 1.")
+        self.telemetry = telemetry
+        self.interval = interval
+        self.path = path
+        self.port = port
+        self.max_pending = max_pending
+        self.drop_policy = drop_policy
+        self.namespace = namespace
+        self.dropped = 0
+
+        self._pending: Deque[str] = deque()
+        self._cond = threading.Condition()
+        self._stop = threading.Event()
+        self._latest = ""
+        self._threads: List[threading.Thread] = []
+        self._server: Optional[ThreadingHTTPServer] = None
+
+    # -------------------------------------------------------
+    # Captura de instantáneas
+    # -------------------------------------------------------
+    def export_now(self) -> bool:
+        """
+        Toma una instantánea y la deja en el buffer de salida.
+
+        Returns:
+            bool: False si la instantánea nueva se descartó por buffer lleno.
+        """
+        text = render_prometheus(self.telemetry, self.namespace)
+        with self._cond:
+            if len(self._pending) >= self.max_pending:
+                self.dropped += 1
+                if self.drop_policy == DROP_NEWEST:
+                    return False
+                self._pending.popleft()
+            self._pending.append(text + self._own_metrics())
+            self._cond.notify()
+        return True
+
+    def _own_metrics(self) -> str:
+        name = _metric_name(self.namespace, "exporter_dropped_total")
+        return (f"# HELP {name} Instantáneas descartadas por salida lenta.\n"
+                f"# TYPE {name} counter\n{name} {self.dropped}\n")
+
+    def _capture_loop(self):
+        while not self._stop.wait(self.interval):
+            self.export_now()
+
+    # -------------------------------------------------------
+    # Salida a archivo y HTTP
+    # -------------------------------------------------------
+    def _drain(self) -> Optional[str]:
+        """Vacía el buffer completo y devuelve la instantánea más reciente."""
+        with self._cond:
+            while not self._pending and not self._stop.is_set():
+                self._cond.wait()
+            if not self._pending:
+                return None
+            batch = list(self._pending)
+            self._pending.clear()
+        return batch[-1]
+
+    def _write_loop(self):
+        while True:
+            text = self._drain()
+            if text is None:
+                return
+            self._publish(text)
+
+    def _publish(self, text: str):
+        """Publica una instantánea en el endpoint HTTP y en el archivo."""
+        self._latest = text
+        if self.path is not None:
+            tmp = f"{self.path}.tmp"
+            with open(tmp, "w", encoding="utf-8") as fh:
+                fh.write(text)
+            os.replace(tmp, self.path)
+
+    def _start_http(self):
+        exporter = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path not in ("/", "/metrics"):
+                    self.send_error(404)
+                    return
+                body = exporter._latest.encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", self.port), Handler)
+        self._server.daemon_threads = True
+        self.port = self._server.server_address[1]
+        thread = threading.Thread(target=self._server.serve_forever, daemon=True,
+                                  name="prometheus-http")
+        thread.start()
+        self._threads.append(thread)
+
+    # -------------------------------------------------------
+    # Ciclo de vida
+    # -------------------------------------------------------
+    def start(self):
+        """Arranca los hilos de captura y salida (y el endpoint HTTP si hay puerto)."""
+        if self._threads:
+            return
+        self._stop.clear()
+        if self.port is not None:
+            self._start_http()
+        for target, name in ((self._capture_loop, "prometheus-capture"),
+                             (self._write_loop, "prometheus-writer")):
+            thread = threading.Thread(target=target, daemon=True, name=name)
+            thread.start()
+            self._threads.append(thread)
+
+    def stop(self):
+        """Exporta una última instantánea, vacía el buffer y detiene los hilos."""
+        if not self._threads:
+            return
+        self.export_now()
+        self._stop.set()
+        with self._cond:
+            self._cond.notify_all()
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+        for thread in self._threads:
+            thread.join()
+        self._threads = []
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.stop()
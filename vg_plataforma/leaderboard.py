@@ -0,0 +1,207 @@
+# ===========================================================
+# Archivo: leaderboard.py
+# Descripción:
+# Este módulo implementa la tabla de clasificación por victorias
+# que mantiene AchievementSystem de forma incremental.
+#
+# Estructura:
+#   - Un árbol de Fenwick indexado por número de victorias con
+#     cuántos jugadores tienen cada conteo: actualizar y calcular
+#     el puesto de un jugador cuestan O(log V), con V el máximo de
+#     victorias.
+#   - Una cubeta por conteo con sus jugadores (diccionario usado
+#     como conjunto ordenado) y la lista ordenada de conteos no
+#     vacíos: el top-K se lee en O(K) recorriendo las cubetas de
+#     mayor a menor.
+#
+# A igual número de victorias, va primero quien llegó antes a
+# ese número.
+#
+# Incluye:
+#   - Clase WinsLeaderboard (clasificación incremental por victorias)
+#
+# ===========================================================
+
+from bisect import bisect_left, insort
+from typing import Dict, List, Mapping, Optional, Tuple
+
+
+class WinsLeaderboard:
+    """
+    Clasificación de jugadores por victorias con actualización incremental.
+
+    Atributos:
+        scores (Dict[str, int]): Victorias de cada jugador clasificado.
+    """
+
+    def __init__(self):
+        """Inicializa la clasificación vacía."""
+        self.scores: Dict[str, int] = {}
+        self._buckets: Dict[int, Dict[str, None]] = {}
+        self._counts: List[int] = []   # conteos con jugadores, ascendente
+        self._tree: List[int] = [0] * 17  # Fenwick 1-indexado sobre conteos
+
+    @classmethod
+    def from_counts(cls, counts: Mapping[str, int]) -> "WinsLeaderboard":
+        """
+        Construye la clasificación de una vez a partir de conteos existentes,
+        en O(n + V) (los empates quedan en el orden de `counts`).
+        """
+        board = cls()
+        for player_id, count in counts.items():
+            if count > 0:
+                board.scores[player_id] = count
+                bucket = board._buckets.get(count)
+                if bucket is None:
+                    bucket = board._buckets[count] = {}
+                bucket[player_id] = None
+        board._counts = sorted(board._buckets)
+        if board._counts:
+            board._grow(board._counts[-1])
+        return board
+
+    def __len__(self) -> int:
+        return len(self.scores)
+
+    # -------------------------------------------------------
+    # Actualización
+    # -------------------------------------------------------
+    def update(self, player_id: str, count: int):
+        """
+        Fija el número de victorias de un jugador, en O(log V).
+
+        Args:
+            player_id (str): ID del jugador.
+            count (int): Victorias totales (0 lo retira de la clasificación).
+
+        Raises:
+            ValueError: Si `count` es negativo.
+        """
+        if count < 0:
+            raise ValueError("El número de victorias no puede ser negativo.")
+        old = self.scores.get(player_id, 0)
+        if old == count:
+            return
+        if count >= len(self._tree):
+            self._grow(count)
+        if old:
+            bucket = self._buckets[old]
+            del bucket[player_id]
+            if not bucket:
+                del self._buckets[old]
+                del self._counts[bisect_left(self._counts, old)]
+            self._add(old, -1)
+        if count:
+            self.scores[player_id] = count
+            bucket = self._buckets.get(count)
+            if bucket is None:
+                bucket = self._buckets[count] = {}
+                insort(self._counts, count)
+            bucket[player_id] = None
+            self._add(count, 1)
+        else:
+            del self.scores[player_id]
+
+    def update_many(self, counts: Mapping[str, int]):
+        """
+        Fija las victorias de varios jugadores con el mismo resultado que
+        llamar a `update` con cada uno en el orden de `counts`, pero por
+        jugador solo se mueven las cubetas: el árbol de Fenwick y la lista de
+        conteos se reconstruyen una vez al final, en O(V + conteos distintos).
+
+        Args:
+            counts (Mapping[str, int]): Victorias totales por jugador.
+
+        Raises:
+            ValueError: Si algún conteo es negativo (no se aplica ninguno).
+        """
+        if counts and min(counts.values()) < 0:
+            raise ValueError("El número de victorias no puede ser negativo.")
+        scores = self.scores
+        buckets = self._buckets
+        for player_id, count in counts.items():
+            old = scores.get(player_id, 0)
+            if old == count:
+                continue
+            if old:
+                bucket = buckets[old]
+                del bucket[player_id]
+                if not bucket:
+                    del buckets[old]
+            if count:
+                scores[player_id] = count
+                bucket = buckets.get(count)
+                if bucket is None:
+                    bucket = buckets[count] = {}
+                bucket[player_id] = None
+            else:
+                del scores[player_id]
+        self._counts = sorted(buckets)
+        self._grow(self._counts[-1] if self._counts else 0)
+
+    def _add(self, index: int, delta: int):
+        tree = self._tree
+        size = len(tree)
+        while index < size:
+            tree[index] += delta
+            index += index & -index
+
+    def _grow(self, index: int):
+        """
+        Reconstruye el Fenwick en O(V) desde las cubetas, duplicando antes su
+        tamaño hasta cubrir `index`; al crecer, el costo amortizado es O(1).
+        """
+        size = len(self._tree) - 1
+        while size < index:
+            size *= 2
+        tree = [0] * (size + 1)
+        for count, bucket in self._buckets.items():
+            tree[count] = len(bucket)
+        for i in range(1, size + 1):
+            parent = i + (i & -i)
+            if parent <= size:
+                tree[parent] += tree[i]
+        self._tree = tree
+
+    def _prefix(self, index: int) -> int:
+        """Jugadores con como mucho `index` victorias."""
+        tree = self._tree
+        total = 0
+        while index > 0:
+            total += tree[index]
+            index -= index & -index
+        return total
+
+    # -------------------------------------------------------
+    # Consultas
+    # -------------------------------------------------------
+    def rank(self, player_id: str) -> Optional[int]:
+        """
+        Puesto del jugador (1 = más victorias), en O(log V).
+
+        Los empatados comparten puesto: es 1 más el número de jugadores con
+        estrictamente más victorias.
+
+        Returns:
+            Optional[int]: Puesto, o None si el jugador no tiene victorias.
+        """
+        count = self.scores.get(player_id)
+        if count is None:
+            return None
+        return len(self.scores) - self._prefix(count) + 1
+
+    def top(self, k: int) -> List[Tuple[str, int]]:
+        """
+        Los `k` mejores jugadores, en O(k).
+
+        Returns:
+            List[Tuple[str, int]]: Pares (jugador, victorias) de mayor a menor.
+        """
+        result: List[Tuple[str, int]] = []
+        for i in range(len(self._counts) - 1, -1, -1):
+            count = self._counts[i]
+            for player_id in self._buckets[count]:
+                if len(result) == k:
+                    return result
+                result.append((player_id, count))
+        return result
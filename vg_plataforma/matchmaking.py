@@ -6,14 +6,42 @@
 # con niveles de habilidad similares utilizando un sistema de calificación
 # tipo ELO y mantener una cola de espera dinámica.
 #
+# La cola se respalda con un índice ordenado por rating: cada entrada es
+# una clave entera que empaqueta (rating, orden de llegada), de modo que
+# el emparejamiento por cercanía de rating se resuelve recorriendo el
+# índice una sola vez en lugar de comparar todos contra todos.
+#
 # Incluye:
 #   - Clase Player (modelo de jugador)
+#   - Clase RatingWindow (ventana de rating que se amplía con la espera)
 #   - Clase Matchmaker (gestión de emparejamientos y actualización de rating)
+#   - Función elo_update (ratings tras una partida, sin instanciar un Matchmaker)
 #
 # ===========================================================
 
+import heapq
+import time
+from array import array
+from bisect import bisect_left, insort
 from dataclasses import dataclass
-from typing import List, Tuple
+from typing import Callable, Dict, List, MutableMapping, Optional, Sequence, Tuple
+
+try:  # NumPy es opcional: acelera la actualización de ratings por lotes
+    import numpy as np
+except ImportError:  # pragma: no cover - depende del entorno
+    np = None
+
+from profiling import profiled
+
+
+# Bits reservados para el orden de llegada dentro de una clave del índice.
+# La clave es (rating << _SEQ_BITS) | seq, así que ordenar las claves
+# equivale a ordenar por (rating, seq) sin crear tuplas por jugador.
+_SEQ_BITS = 40
+_SEQ_MASK = (1 << _SEQ_BITS) - 1
+
+# Factor de ajuste ELO compartido por la versión escalar y la de lotes.
+_ELO_K = 30
 
 
 # -----------------------------------------------------------
@@ -32,6 +60,48 @@ class Player:
     rating: int
 
 
+# -----------------------------------------------------------
+# Ventana de rating dependiente del tiempo de espera
+# -----------------------------------------------------------
+@dataclass
+class RatingWindow:
+    """
+    Diferencia de rating aceptada por un jugador según cuánto lleva esperando.
+
+    La ventana crece por escalones: empieza en `base`, suma `step` cada
+    `interval` segundos y nunca supera `maximum`. Al cambiar solo en
+    instantes discretos, el Matchmaker sabe exactamente cuándo debe volver
+    a evaluar a cada jugador.
+
+    Atributos:
+        base (int): Diferencia aceptada al entrar en cola.
+        step (int): Incremento por cada intervalo de espera.
+        interval (float): Segundos entre ampliaciones.
+        maximum (int): Diferencia máxima aceptada.
+    """
+    base: int = 50
+    step: int = 25
+    interval: float = 5.0
+    maximum: int = 400
+
+    def width(self, waited: float) -> int:
+        """
+        Devuelve la diferencia de rating aceptada tras `waited` segundos.
+        """
+        steps = int(waited // self.interval) if waited > 0 else 0
+        return min(self.maximum, self.base + self.step * steps)
+
+    def next_change(self, waited: float) -> Optional[float]:
+        """
+        Devuelve los segundos de espera en los que la ventana volverá a
+        ampliarse, o None si ya alcanzó el máximo.
+        """
+        if self.step <= 0 or self.width(waited) >= self.maximum:
+            return None
+        steps = int(waited // self.interval) if waited > 0 else 0
+        return (steps + 1) * self.interval
+
+
 # -----------------------------------------------------------
 # Clase principal: Matchmaker
 # -----------------------------------------------------------
@@ -43,72 +113,386 @@ class Matchmaker:
     - Mantiene una cola de jugadores buscando partida.
     - Encuentra emparejamientos según diferencias mínimas de rating.
     - Actualiza calificaciones tras cada partida.
+    - Permite abandonar la cola (`dequeue`) y consultar si un jugador
+      está en ella (`is_queued`) en O(1).
+
+    Modo incremental:
+        Si se indica una `RatingWindow`, `enqueue` busca de inmediato el
+        rival compatible más cercano y `tick` solo reevalúa a los jugadores
+        cuya ventana se amplió desde la última evaluación.
+
+    Almacén compacto:
+        Si se indica un `store` (por ejemplo `player_store.PlayerStore`),
+        los jugadores en cola se guardan en él en lugar de como objetos
+        Player, y el índice pasa a ser un array('q') contiguo.
     """
 
-    def __init__(self):
+    def __init__(self, window: Optional[RatingWindow] = None,
+                 clock: Callable[[], float] = time.monotonic,
+                 store: Optional[MutableMapping[int, Player]] = None):
         """
-        Inicializa la cola de jugadores.
+        Inicializa la cola de jugadores y su índice ordenado por rating.
+
+        Args:
+            window (RatingWindow, opcional): Activa el modo incremental.
+            clock (Callable[[], float]): Fuente de tiempo en segundos.
+            store (MutableMapping[int, Player], opcional): Almacén compacto
+                de jugadores en cola.
         """
-        self.queue: List[Player] = []
+        # Claves (rating, seq) empaquetadas y ordenadas de menor a mayor.
+        self._index = array("q") if store is not None else []
+
+        # Jugadores en cola por número de llegada (seq). El diccionario
+        # conserva el orden de inserción, es decir, el orden de llegada.
+        self._players: MutableMapping[int, Player] = store if store is not None else {}
+
+        # Contador monotónico de llegadas (desempate entre ratings iguales).
+        self._seq = 0
+
+        # Índice ID → número de llegada de los jugadores en cola. Si el
+        # almacén ofrece `slot_of` se usa su propia búsqueda y no se guarda
+        # un diccionario por jugador. Las bajas dejan su clave en `_index`
+        # como lápida hasta la próxima purga.
+        self._slots: Optional[Dict[str, int]] = None if hasattr(store, "slot_of") else {}
+        self._tombstones = 0
+
+        # Estado del modo incremental: instante de entrada de cada jugador y
+        # agenda (instante, seq) de la próxima ampliación de su ventana.
+        self.window = window
+        self.clock = clock
+        self._joined: Dict[int, float] = {}
+        self._agenda: List[Tuple[float, int]] = []
+        self._ticking = False
+
+    @property
+    def queue(self) -> List[Player]:
+        """
+        Jugadores actualmente en cola, en orden de llegada.
+
+        Returns:
+            List[Player]: Copia de la cola; modificarla no afecta al Matchmaker.
+        """
+        return list(self._players.values())
 
     # -------------------------------------------------------
     # Agregar jugador a la cola
     # -------------------------------------------------------
-    def enqueue(self, player: Player):
+    def enqueue(self, player: Player,
+                now: Optional[float] = None) -> Optional[Tuple[Player, Player]]:
         """
         Agrega un jugador a la cola de emparejamiento.
 
+        En modo incremental intenta emparejarlo en el acto con el rival
+        compatible más cercano; si lo encuentra, ninguno de los dos queda
+        en cola.
+
         Args:
             player (Player): Jugador que desea buscar partida.
+            now (float, opcional): Instante actual; por defecto `clock()`.
+
+        Returns:
+            Optional[Tuple[Player, Player]]: Emparejamiento inmediato (solo en
+            modo incremental), o None si el jugador quedó en cola.
+
+        Raises:
+            ValueError: Si el jugador ya está en cola.
         """
-        self.queue.append(player)
+        if self._slot_of(player.id) is not None:
+            raise ValueError(f"El jugador '{player.id}' ya está en cola.")
+        return self._insert(player, now, None)
+
+    # -------------------------------------------------------
+    # Abandonar la cola y volver a ella
+    # -------------------------------------------------------
+    def dequeue(self, player_id: str) -> Optional[Player]:
+        """
+        Retira a un jugador de la cola (desconexión, abandono, cancelación).
+
+        La baja es O(1): la clave del jugador queda en el índice como lápida
+        y se descarta en la próxima purga, que se realiza cuando las lápidas
+        superan a los jugadores en cola.
+
+        Args:
+            player_id (str): ID del jugador a retirar.
+
+        Returns:
+            Optional[Player]: El jugador retirado, o None si no estaba en cola.
+        """
+        seq = self._slot_of(player_id)
+        if seq is None:
+            return None
+        player = self._pop(seq)
+        self._tombstones += 1
+        self._maybe_compact()
+        return player
+
+    def is_queued(self, player_id: str) -> bool:
+        """
+        Indica si un jugador está actualmente en cola.
+
+        Args:
+            player_id (str): ID del jugador.
+
+        Returns:
+            bool: True si el jugador está en cola.
+        """
+        return self._slot_of(player_id) is not None
+
+    def requeue(self, player: Player, joined_at: Optional[float] = None,
+                now: Optional[float] = None) -> Optional[Tuple[Player, Player]]:
+        """
+        Vuelve a encolar a un jugador conservando su tiempo de espera.
+
+        Si el jugador ya estaba en cola se reemplaza su entrada (por ejemplo,
+        tras actualizar su rating) y mantiene su instante de entrada. Si no
+        lo estaba (por ejemplo, su rival abandonó la partida), `joined_at`
+        permite restaurar el instante en que entró originalmente.
+
+        Args:
+            player (Player): Jugador a encolar.
+            joined_at (float, opcional): Instante original de entrada en cola.
+            now (float, opcional): Instante actual; por defecto `clock()`.
+
+        Returns:
+            Optional[Tuple[Player, Player]]: Emparejamiento inmediato (solo en
+            modo incremental), o None si el jugador quedó en cola.
+        """
+        seq = self._slot_of(player.id)
+        if seq is not None:
+            joined_at = self._joined.get(seq, joined_at)
+            self.dequeue(player.id)
+        return self._insert(player, now, joined_at)
+
+    def _insert(self, player: Player, now: Optional[float],
+                joined_at: Optional[float]) -> Optional[Tuple[Player, Player]]:
+        """Alta común de `enqueue` y `requeue`."""
+        seq = self._seq
+        self._seq += 1
+        key = (player.rating << _SEQ_BITS) | seq
+        self._players[seq] = player
+        if self._slots is not None:
+            self._slots[player.id] = seq
+        insort(self._index, key)
+
+        if self.window is None:
+            return None
+
+        if now is None:
+            now = self.clock()
+        self._joined[seq] = now if joined_at is None else joined_at
+        return self._try_match(key, now)
 
     # -------------------------------------------------------
     # Encontrar emparejamientos por similitud de rating
     # -------------------------------------------------------
+    @profiled("matchmaking.find_matches")
     def find_matches(self) -> List[Tuple[Player, Player]]:
         """
         Empareja jugadores en base a la menor diferencia de rating posible.
 
+        Recorre el índice ordenado y empareja jugadores adyacentes, lo que
+        minimiza la suma total de diferencias de rating. El costo es O(n)
+        por llamada (el orden ya lo mantiene `enqueue`).
+
+        Regla de desempate:
+        - A igual rating, el jugador que llegó antes ocupa la posición
+          anterior en el índice.
+        - Si la cola tiene un número impar de jugadores, queda en cola el
+          jugador cuya exclusión minimiza la diferencia total; si hay varios
+          candidatos equivalentes, queda el que llegó más tarde.
+
         Returns:
-            List[Tuple[Player, Player]]: Lista de tuplas con pares de jugadores emparejados.
+            List[Tuple[Player, Player]]: Lista de tuplas con pares de jugadores
+            emparejados; en cada par el primero es el de menor rating.
         """
-        matches = []
-        used = set()
+        keys = self._live_index()
+        n = len(keys)
+        skip = _leftover_position(keys) if n % 2 else -1
 
-        # Recorre la cola para buscar el mejor emparejamiento posible
-        for i, p in enumerate(self.queue):
-            if p.id in used:
+        matches = []
+        remaining = self._empty_index()
+        i = 0
+        while i < n:
+            if i == skip:
+                remaining.append(keys[i])
+                i += 1
                 continue
+            matches.append((self._pop(keys[i] & _SEQ_MASK), self._pop(keys[i + 1] & _SEQ_MASK)))
+            i += 2
 
-            best_j = None
-            best_diff = None
+        # Mantener en el índice solo a los jugadores no emparejados
+        self._index = remaining
+        self._maybe_compact()
+
+        return matches
+
+    # -------------------------------------------------------
+    # Modo incremental: reevaluación por ampliación de ventana
+    # -------------------------------------------------------
+    def tick(self, now: Optional[float] = None) -> List[Tuple[Player, Player]]:
+        """
+        Reevalúa únicamente a los jugadores cuya ventana se amplió.
 
-            # Buscar el jugador con menor diferencia de rating
-            for j in range(i + 1, len(self.queue)):
-                q = self.queue[j]
-                if q.id in used:
-                    continue
+        El costo es proporcional al número de ventanas que cambiaron desde
+        el último tick, no al tamaño de la cola.
 
-                diff = abs(p.rating - q.rating)
-                if best_diff is None or diff < best_diff:
-                    best_diff = diff
-                    best_j = j
+        Args:
+            now (float, opcional): Instante actual; por defecto `clock()`.
 
-            # Si se encontró pareja, agregar a la lista de matches
-            if best_j is not None:
-                matches.append((p, self.queue[best_j]))
-                used.add(p.id)
-                used.add(self.queue[best_j].id)
+        Returns:
+            List[Tuple[Player, Player]]: Emparejamientos formados en este tick.
 
-        # Mantener en cola los jugadores no emparejados
-        self.queue = [p for p in self.queue if p.id not in used]
+        Raises:
+            ValueError: Si el Matchmaker no está en modo incremental.
+        """
+        if self.window is None:
+            raise ValueError("tick() requiere un Matchmaker en modo incremental.")
+        if now is None:
+            now = self.clock()
 
+        matches = []
+        agenda = self._agenda
+        # Compactar renumera los seq y reemplaza la agenda: se pospone hasta
+        # terminar de recorrerla
+        self._ticking = True
+        try:
+            while agenda and agenda[0][0] <= now:
+                _, seq = heapq.heappop(agenda)
+                player = self._players.get(seq)
+                if player is None:
+                    continue  # ya emparejado: entrada obsoleta de la agenda
+                match = self._try_match((player.rating << _SEQ_BITS) | seq, now)
+                if match is not None:
+                    matches.append(match)
+        finally:
+            self._ticking = False
+        self._maybe_compact()
         return matches
 
+    def _try_match(self, key: int, now: float) -> Optional[Tuple[Player, Player]]:
+        """
+        Busca el rival compatible más cercano para la clave `key`.
+
+        Dos jugadores son compatibles si su diferencia de rating cabe en la
+        ventana de ambos. A igual diferencia gana el rival que llegó antes.
+        Si no hay rival, agenda la próxima ampliación de la ventana.
+        """
+        index = self._index
+        players = self._players
+        seq = key & _SEQ_MASK
+        rating = key >> _SEQ_BITS
+        width = self._width(seq, now)
+        pos = bisect_left(index, key)
+
+        best = None
+        best_rank = None
+        # Explorar hacia abajo y hacia arriba sin salir de la propia ventana
+        for step, stop in ((-1, -1), (1, len(index))):
+            j = pos + step
+            while j != stop:
+                other = index[j]
+                diff = abs((other >> _SEQ_BITS) - rating)
+                if diff > width or (best_rank is not None and diff > best_rank[0]):
+                    break
+                other_seq = other & _SEQ_MASK
+                if other_seq in players and diff <= self._width(other_seq, now):
+                    rank = (diff, other_seq)
+                    if best_rank is None or rank < best_rank:
+                        best, best_rank = other, rank
+                j += step
+
+        if best is None:
+            waited = now - self._joined[seq]
+            change = self.window.next_change(waited)
+            if change is not None:
+                heapq.heappush(self._agenda, (self._joined[seq] + change, seq))
+            return None
+
+        del index[pos]
+        del index[bisect_left(index, best)]
+        low, high = sorted((key, best))
+        match = self._pop(low & _SEQ_MASK), self._pop(high & _SEQ_MASK)
+        self._maybe_compact()
+        return match
+
+    def _width(self, seq: int, now: float) -> int:
+        """Ventana actual del jugador con número de llegada `seq`."""
+        return self.window.width(now - self._joined[seq])
+
+    def _pop(self, seq: int) -> Player:
+        """Retira de los registros al jugador `seq` (no toca el índice)."""
+        self._joined.pop(seq, None)
+        player = self._players.pop(seq)
+        if self._slots is not None:
+            del self._slots[player.id]
+        return player
+
+    def _slot_of(self, player_id: str) -> Optional[int]:
+        """Número de llegada del jugador en cola, o None."""
+        if self._slots is None:
+            return self._players.slot_of(player_id)
+        return self._slots.get(player_id)
+
+    def _live_index(self):
+        """
+        Devuelve el índice sin lápidas. Si hay lápidas lo reconstruye en
+        O(n), lo que se amortiza sobre las bajas que las generaron.
+        """
+        if self._tombstones:
+            players = self._players
+            index = self._empty_index()
+            index.extend(k for k in self._index if (k & _SEQ_MASK) in players)
+            self._index = index
+            self._tombstones = 0
+        return self._index
+
+    def _empty_index(self):
+        """Índice vacío del mismo tipo que el actual (lista o array)."""
+        if isinstance(self._index, array):
+            return array(self._index.typecode)
+        return []
+
+    def _maybe_compact(self):
+        """
+        Compacta el almacén cuando las ranuras muertas superan a las vivas,
+        o purga las lápidas del índice cuando superan a los jugadores en cola.
+
+        La compactación solo aplica a almacenes con `compact()`. La
+        renumeración conserva el orden relativo de llegada, así que el
+        índice sigue ordenado y basta con reescribir el número de llegada
+        de cada clave. En ambos casos el costo es O(n) y se amortiza sobre
+        al menos n bajas. Durante `tick()` no se hace nada: la agenda que
+        se está recorriendo usa los números de llegada actuales.
+        """
+        if self._ticking:
+            return
+        store = self._players
+        if not hasattr(store, "compact"):
+            if self._tombstones > len(store):
+                self._live_index()
+            return
+        if store.dead <= len(store):
+            return
+        remap = store.compact()
+
+        index = self._empty_index()
+        for key in self._index:
+            new_seq = remap[key & _SEQ_MASK]
+            if new_seq >= 0:
+                index.append((key & ~_SEQ_MASK) | new_seq)
+        self._index = index
+        self._tombstones = 0
+        if self._slots is not None:
+            self._slots = {player_id: remap[seq] for player_id, seq in self._slots.items()}
+        self._joined = {remap[seq]: t for seq, t in self._joined.items()}
+        self._agenda = [(t, remap[seq]) for t, seq in self._agenda if remap[seq] >= 0]
+        heapq.heapify(self._agenda)
+        self._seq = len(store)
+
     # -------------------------------------------------------
     # Actualizar ratings según resultado de la partida
     # -------------------------------------------------------
+    @profiled("matchmaking.update_ratings")
     def update_ratings(self, p1: Player, p2: Player, winner_id: str) -> Tuple[int, int]:
         """
         Actualiza los ratings de los jugadores tras una partida
@@ -122,20 +506,197 @@ class Matchmaker:
         Returns:
             Tuple[int, int]: Nuevos ratings (p1, p2).
         """
-        k = 30  # factor de ajuste ELO
-        r1 = p1.rating
-        r2 = p2.rating
-
-        # Expectativas de victoria (según fórmula ELO)
-        expected1 = 1 / (1 + 10 ** ((r2 - r1) / 400))
-        expected2 = 1 - expected1
-
         # Resultado real (1 si gana, 0 si pierde)
         s1 = 1.0 if winner_id == p1.id else 0.0
         s2 = 1.0 if winner_id == p2.id else 0.0
 
         # Nuevos ratings
-        new_r1 = round(r1 + k * (s1 - expected1))
-        new_r2 = round(r2 + k * (s2 - expected2))
+        term1, term2 = _elo_terms(p2.rating - p1.rating, s1, s2)
+        new_r1 = round(p1.rating + term1)
+        new_r2 = round(p2.rating + term2)
 
         return new_r1, new_r2
+
+    # -------------------------------------------------------
+    # Actualizar ratings por lotes
+    # -------------------------------------------------------
+    def update_ratings_batch(self, ratings: Sequence[int], opponent_ratings: Sequence[int],
+                             outcomes: Sequence[float],
+                             player_ids: Optional[Sequence[str]] = None,
+                             opponent_ids: Optional[Sequence[str]] = None
+                             ) -> Tuple[List[int], List[int]]:
+        """
+        Actualiza los ratings de muchas partidas a la vez.
+
+        El resultado es idéntico al de llamar a `update_ratings` partida a
+        partida (mismo K=30 y mismo redondeo). La expectativa ELO depende
+        solo de la diferencia de rating, así que se calcula una vez por
+        diferencia distinta con la fórmula escalar y se reutiliza; con NumPy
+        instalado, la suma y el redondeo se aplican de forma vectorizada.
+
+        Modo secuencial:
+            Si se indican `player_ids` y `opponent_ids`, las partidas se
+            aplican en orden y cada jugador usa el rating resultante de su
+            partida anterior dentro del lote; el rating de entrada solo se
+            toma en su primera aparición.
+
+        Args:
+            ratings (Sequence[int]): Rating de cada jugador.
+            opponent_ratings (Sequence[int]): Rating de cada rival.
+            outcomes (Sequence[float]): 1.0 si ganó el jugador, 0.0 si ganó el rival.
+            player_ids (Sequence[str], opcional): IDs de los jugadores.
+            opponent_ids (Sequence[str], opcional): IDs de los rivales.
+
+        Returns:
+            Tuple[List[int], List[int]]: Nuevos ratings (jugadores, rivales),
+            como listas de enteros también cuando se usa NumPy.
+
+        Raises:
+            ValueError: Si las longitudes no coinciden o algún resultado no es 0 ni 1.
+        """
+        n = len(ratings)
+        if len(opponent_ratings) != n or len(outcomes) != n:
+            raise ValueError("ratings, opponent_ratings y outcomes deben tener la misma longitud.")
+        if (player_ids is None) != (opponent_ids is None):
+            raise ValueError("El modo secuencial requiere player_ids y opponent_ids.")
+
+        if player_ids is not None:
+            if len(player_ids) != n or len(opponent_ids) != n:
+                raise ValueError("player_ids y opponent_ids deben tener la misma longitud que ratings.")
+            return _elo_sequential(ratings, opponent_ratings, outcomes, player_ids, opponent_ids)
+        if np is not None:
+            return _elo_vectorized(ratings, opponent_ratings, outcomes)
+
+        table: Dict[Tuple[int, float], Tuple[float, float]] = {}
+        new1, new2 = [], []
+        for r1, r2, s1 in zip(ratings, opponent_ratings, outcomes):
+            term1, term2 = _cached_terms(table, r2 - r1, s1)
+            new1.append(round(r1 + term1))
+            new2.append(round(r2 + term2))
+        return new1, new2
+
+
+# -----------------------------------------------------------
+# Cálculo ELO de una partida
+# -----------------------------------------------------------
+def elo_update(rating: int, opponent_rating: int, outcome: float) -> Tuple[int, int]:
+    """
+    Nuevos ratings tras una partida, con el mismo ELO simplificado (K=30 y
+    redondeo) que `Matchmaker.update_ratings`.
+
+    Args:
+        rating (int): Rating del jugador.
+        opponent_rating (int): Rating del rival.
+        outcome (float): 1.0 si ganó el jugador, 0.0 si ganó el rival.
+
+    Returns:
+        Tuple[int, int]: Nuevos ratings (jugador, rival).
+    """
+    term1, term2 = _elo_terms(opponent_rating - rating, outcome, 1.0 - outcome)
+    return round(rating + term1), round(opponent_rating + term2)
+
+
+# -----------------------------------------------------------
+# Utilidades internas del cálculo ELO
+# -----------------------------------------------------------
+def _elo_terms(diff: int, s1: float, s2: float) -> Tuple[float, float]:
+    """
+    Ajustes ELO (sin redondear) de una partida con diferencia `diff`
+    (rating del rival menos rating del jugador). Es la única implementación
+    de la fórmula, compartida por la versión escalar y la de lotes.
+    """
+    # Expectativas de victoria (según fórmula ELO)
+    expected1 = 1 / (1 + 10 ** (diff / 400))
+    expected2 = 1 - expected1
+    return _ELO_K * (s1 - expected1), _ELO_K * (s2 - expected2)
+
+
+def _cached_terms(table: Dict[Tuple[int, float], Tuple[float, float]],
+                  diff: int, s1: float) -> Tuple[float, float]:
+    """Ajustes de `_elo_terms` memorizados por (diferencia, resultado)."""
+    terms = table.get((diff, s1))
+    if terms is None:
+        if s1 != 1.0 and s1 != 0.0:
+            raise ValueError(f"Resultado inválido {s1!r}: debe ser 1.0 o 0.0.")
+        terms = table[(diff, s1)] = _elo_terms(diff, s1, 1.0 - s1)
+    return terms
+
+
+def _elo_vectorized(ratings, opponent_ratings, outcomes):
+    """Versión NumPy de `update_ratings_batch` sin dependencias entre partidas."""
+    r1 = np.asarray(ratings, dtype=np.int64)
+    r2 = np.asarray(opponent_ratings, dtype=np.int64)
+    s1 = np.asarray(outcomes, dtype=np.float64)
+    won = s1 == 1.0
+    if not np.all(won | (s1 == 0.0)):
+        raise ValueError("Los resultados deben ser 1.0 o 0.0.")
+
+    # Una evaluación escalar por diferencia distinta: garantiza resultados
+    # idénticos bit a bit a `update_ratings` y evita potencias por partida.
+    diffs, inverse = np.unique(r2 - r1, return_inverse=True)
+    win = np.array([_elo_terms(int(d), 1.0, 0.0) for d in diffs], dtype=np.float64).reshape(-1, 2)
+    loss = np.array([_elo_terms(int(d), 0.0, 1.0) for d in diffs], dtype=np.float64).reshape(-1, 2)
+    terms = np.where(won[:, None], win[inverse], loss[inverse])
+
+    # np.rint redondea al par más cercano, igual que round() de Python
+    new1 = np.rint(r1 + terms[:, 0]).astype(np.int64)
+    new2 = np.rint(r2 + terms[:, 1]).astype(np.int64)
+    return new1.tolist(), new2.tolist()
+
+
+def _elo_sequential(ratings, opponent_ratings, outcomes, player_ids, opponent_ids):
+    """Modo secuencial de `update_ratings_batch`: encadena ratings por jugador."""
+    current: Dict[str, int] = {}
+    table: Dict[Tuple[int, float], Tuple[float, float]] = {}
+    new1, new2 = [], []
+    for r1, r2, s1, a, b in zip(ratings, opponent_ratings, outcomes, player_ids, opponent_ids):
+        r1 = current.get(a, int(r1))
+        r2 = current.get(b, int(r2))
+        term1, term2 = _cached_terms(table, r2 - r1, s1)
+        current[a] = round(r1 + term1)
+        current[b] = round(r2 + term2)
+        new1.append(current[a])
+        new2.append(current[b])
+    return new1, new2
+
+
+# -----------------------------------------------------------
+# Utilidades internas del índice
+# -----------------------------------------------------------
+def _leftover_position(keys: List[int]) -> int:
+    """
+    Elige qué posición del índice queda sin pareja cuando hay un número
+    impar de jugadores.
+
+    Solo las posiciones pares dejan a ambos lados un tramo de longitud par
+    que puede emparejarse por adyacencia. Se calcula en O(n) el costo de
+    excluir cada una usando sumas acumuladas desde ambos extremos.
+
+    Args:
+        keys (List[int]): Claves empaquetadas y ordenadas (longitud impar).
+
+    Returns:
+        int: Posición a excluir.
+    """
+    n = len(keys)
+    ratings = [k >> _SEQ_BITS for k in keys]
+
+    # prefix[j]: costo de emparejar ratings[0:j] por adyacencia (j par)
+    prefix = [0] * (n + 1)
+    for j in range(2, n + 1, 2):
+        prefix[j] = prefix[j - 2] + ratings[j - 1] - ratings[j - 2]
+
+    # suffix[j]: costo de emparejar ratings[j:n] por adyacencia (n - j par)
+    suffix = [0] * (n + 2)
+    for j in range(n - 2, -1, -2):
+        suffix[j] = suffix[j + 2] + ratings[j + 1] - ratings[j]
+
+    best = 0
+    best_cost = None
+    best_seq = -1
+    for j in range(0, n, 2):
+        cost = prefix[j] + suffix[j + 1]
+        seq = keys[j] & _SEQ_MASK
+        if best_cost is None or cost < best_cost or (cost == best_cost and seq > best_seq):
+            best, best_cost, best_seq = j, cost, seq
+    return best
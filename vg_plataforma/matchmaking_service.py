@@ -0,0 +1,233 @@
+# ===========================================================
+# Archivo: matchmaking_service.py
+# Descripción:
+# Este módulo implementa el servicio asíncrono (asyncio) que
+# envuelve al Matchmaker: recibe solicitudes de entrada en cola
+# y de cancelación, las agrupa en ticks de intervalo fijo y
+# entrega los emparejamientos a quienes los esperan.
+#
+# La entrada de solicitudes es una cola acotada: cuando se llena,
+# los productores esperan (backpressure) en lugar de acumular
+# trabajo sin límite. El tiempo en cola de cada jugador se
+# registra automáticamente en TelemetrySystem.
+#
+# Incluye:
+#   - Clase MatchmakingService (bucle de ticks con backpressure)
+#
+# ===========================================================
+
+import asyncio
+import logging
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+from matchmaking import Matchmaker, Player
+from telemetry import TelemetrySystem
+
+
+logger = logging.getLogger(__name__)
+
+
+class MatchmakingService:
+    """
+    Servicio asíncrono de emparejamiento basado en ticks.
+
+    Funcionalidades:
+    - `enqueue` encola a un jugador y espera su emparejamiento.
+    - `submit` encola a un jugador y devuelve un Future con el emparejamiento.
+    - `cancel` retira a un jugador de la cola; su Future queda cancelado.
+    - Cada tick aplica en orden las solicitudes recibidas y empareja.
+    - Registra en TelemetrySystem el tiempo en cola de cada jugador.
+
+    Atributos:
+        matchmaker (Matchmaker): Emparejador subyacente. Si está en modo
+            incremental se usa `tick()`; si no, `find_matches()`.
+        telemetry (TelemetrySystem): Destino de la métrica "queue_times".
+        tick_interval (float): Segundos entre ticks.
+    """
+
+    def __init__(self, matchmaker: Optional[Matchmaker] = None,
+                 telemetry: Optional[TelemetrySystem] = None,
+                 tick_interval: float = 0.1, max_pending: int = 10_000,
+                 clock: Callable[[], float] = time.monotonic):
+        """
+        Inicializa el servicio (el bucle no arranca hasta `start()`).
+
+        Args:
+            matchmaker (Matchmaker, opcional): Emparejador a usar.
+            telemetry (TelemetrySystem, opcional): Sistema de telemetría.
+            tick_interval (float): Segundos entre ticks.
+            max_pending (int): Capacidad de la cola de solicitudes; al
+                llenarse, `enqueue`/`submit`/`cancel` esperan.
+            clock (Callable[[], float]): Fuente de tiempo en segundos.
+        """
+        self.matchmaker = matchmaker if matchmaker is not None else Matchmaker()
+        self.telemetry = telemetry if telemetry is not None else TelemetrySystem()
+        self.tick_interval = tick_interval
+        self.clock = clock
+
+        self._intake: asyncio.Queue = asyncio.Queue(maxsize=max_pending)
+        self._waiters: Dict[str, asyncio.Future] = {}
+        self._joined: Dict[str, float] = {}
+        self._task: Optional[asyncio.Task] = None
+
+    # -------------------------------------------------------
+    # API asíncrona para los clientes
+    # -------------------------------------------------------
+    async def submit(self, player: Player) -> asyncio.Future:
+        """
+        Envía la solicitud de entrada en cola de un jugador.
+
+        Espera solo si la cola de solicitudes está llena (backpressure).
+
+        Args:
+            player (Player): Jugador que desea buscar partida.
+
+        Returns:
+            asyncio.Future: Se resuelve con la tupla (Player, Player) del
+            emparejamiento, se cancela si el jugador cancela, o falla con
+            ValueError si el jugador ya estaba en cola.
+        """
+        future = asyncio.get_running_loop().create_future()
+        # El tiempo en cola cuenta desde el envío, no desde el tick que lo aplica
+        await self._intake.put(("enqueue", (player, self.clock()), future))
+        return future
+
+    async def enqueue(self, player: Player) -> Tuple[Player, Player]:
+        """
+        Encola a un jugador y espera hasta que sea emparejado.
+
+        Returns:
+            Tuple[Player, Player]: Emparejamiento del jugador.
+
+        Si quien espera se cancela (por ejemplo con `asyncio.wait_for`), el
+        jugador sale de la cola para que nadie quede emparejado con él.
+
+        Raises:
+            asyncio.CancelledError: Si el jugador canceló antes de emparejarse.
+        """
+        future = await self.submit(player)
+        try:
+            return await future
+        except asyncio.CancelledError:
+            # Si la solicitud aún no se aplicó, el tick la descarta al ver
+            # su Future cancelado; si ya se aplicó, se retira de la cola aquí.
+            if self._waiters.get(player.id) is future:
+                self._apply_cancel(player.id)
+            raise
+
+    async def cancel(self, player_id: str):
+        """
+        Envía la solicitud de cancelación de un jugador.
+
+        Se aplica en el mismo orden que las demás solicitudes, así que una
+        cancelación posterior a un `submit` siempre lo alcanza.
+
+        Args:
+            player_id (str): ID del jugador.
+        """
+        await self._intake.put(("cancel", player_id, None))
+
+    # -------------------------------------------------------
+    # Ciclo de vida del bucle de ticks
+    # -------------------------------------------------------
+    def start(self):
+        """Arranca el bucle de ticks en el event loop actual."""
+        if self._task is None:
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self):
+        """Detiene el bucle de ticks y procesa las solicitudes pendientes."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        self.process_tick()
+
+    async def __aenter__(self):
+        self.start()
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.stop()
+
+    async def _run(self):
+        """
+        Bucle principal: un tick cada `tick_interval` segundos.
+
+        Un error en un tick se registra en el log y el bucle continúa.
+        """
+        while True:
+            await asyncio.sleep(self.tick_interval)
+            try:
+                self.process_tick()
+            except Exception:
+                logger.exception("Error procesando un tick de emparejamiento.")
+
+    # -------------------------------------------------------
+    # Procesamiento de un tick
+    # -------------------------------------------------------
+    def process_tick(self) -> List[Tuple[Player, Player]]:
+        """
+        Aplica las solicitudes recibidas desde el tick anterior y empareja.
+
+        Returns:
+            List[Tuple[Player, Player]]: Emparejamientos formados en este tick.
+        """
+        now = self.clock()
+        matches: List[Tuple[Player, Player]] = []
+        intake = self._intake
+
+        # Solo se procesa lo que había al empezar el tick
+        for _ in range(intake.qsize()):
+            action, payload, future = intake.get_nowait()
+            if action == "enqueue":
+                match = self._apply_enqueue(*payload, future, now)
+                if match is not None:
+                    matches.append(match)
+            else:
+                self._apply_cancel(payload)
+
+        if self.matchmaker.window is not None:
+            matches.extend(self.matchmaker.tick(now))
+        else:
+            matches.extend(self.matchmaker.find_matches())
+
+        for match in matches:
+            self._deliver(match, now)
+        return matches
+
+    def _apply_enqueue(self, player: Player, submitted: float, future: asyncio.Future,
+                       now: float) -> Optional[Tuple[Player, Player]]:
+        """Encola al jugador en el Matchmaker y registra su Future y su hora de envío."""
+        if future.done():
+            return None  # el cliente dejó de esperar
+        try:
+            match = self.matchmaker.enqueue(player, now=now)
+        except ValueError as exc:
+            future.set_exception(exc)
+            return None
+        self._waiters[player.id] = future
+        self._joined[player.id] = submitted
+        return match
+
+    def _apply_cancel(self, player_id: str):
+        """Retira al jugador del Matchmaker y cancela su Future."""
+        self.matchmaker.dequeue(player_id)
+        self._joined.pop(player_id, None)
+        future = self._waiters.pop(player_id, None)
+        if future is not None and not future.done():
+            future.cancel()
+
+    def _deliver(self, match: Tuple[Player, Player], now: float):
+        """Registra el tiempo en cola de ambos jugadores y resuelve sus Futures."""
+        for player in match:
+            joined = self._joined.pop(player.id, None)
+            if joined is not None:
+                self.telemetry.record("queue_times", now - joined)
+            future = self._waiters.pop(player.id, None)
+            if future is not None and not future.done():
+                future.set_result(match)
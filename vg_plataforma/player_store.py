@@ -0,0 +1,199 @@
+# ===========================================================
+# Archivo: player_store.py
+# Descripción:
+# Este módulo implementa un almacén compacto de jugadores en cola
+# para el sistema de emparejamiento (Matchmaker).
+#
+# En lugar de conservar un objeto Player por jugador, guarda los
+# datos en arreglos contiguos con tipo:
+#   - ids: lista de cadenas internadas (sys.intern).
+#   - ratings: array('i') de enteros de 32 bits.
+#   - vivos: bytearray con un byte por ranura.
+#   - tabla de búsqueda ID → ranura: array('i') con direccionamiento
+#     abierto que guarda solo números de ranura (las claves se
+#     comparan contra `ids`), para que `is_queued`/`dequeue` sean
+#     O(1) sin un diccionario aparte por jugador.
+#
+# Las ranuras se asignan en orden de llegada y nunca se reutilizan;
+# `compact()` descarta las ranuras muertas conservando el orden
+# relativo, de modo que el desempate por llegada del Matchmaker
+# sigue siendo válido tras renumerar.
+#
+# Incluye:
+#   - Clase PlayerStore (almacén compacto compatible con Matchmaker)
+#
+# ===========================================================
+
+import sys
+from array import array
+from collections.abc import MutableMapping
+from typing import Iterator, List, Optional
+
+from matchmaking import Player
+
+
+# Marcas de la tabla de búsqueda: posición vacía y posición borrada
+_EMPTY = -1
+_DELETED = -2
+
+
+class PlayerStore(MutableMapping):
+    """
+    Almacén compacto de jugadores indexado por ranura (número de llegada).
+
+    Se comporta como un diccionario ranura → Player para que el Matchmaker
+    pueda usarlo en lugar de su diccionario interno. Los jugadores se
+    entregan como objetos Player nuevos construidos a partir de los
+    arreglos, no como los objetos originalmente encolados.
+
+    Atributos:
+        live (int): Número de jugadores vivos en el almacén.
+    """
+
+    def __init__(self):
+        """Inicializa los arreglos vacíos del almacén."""
+        self._ids: List[str] = []
+        self._ratings = array("i")
+        self._alive = bytearray()
+        self.live = 0
+
+        # Tabla ID → ranura (potencia de 2) y posiciones ocupadas o borradas
+        self._table = array("i", [_EMPTY]) * 8
+        self._filled = 0
+
+    # -------------------------------------------------------
+    # Interfaz de diccionario (ranura → Player)
+    # -------------------------------------------------------
+    def __setitem__(self, slot: int, player: Player):
+        """
+        Agrega un jugador en la siguiente ranura libre.
+
+        Raises:
+            ValueError: Si `slot` no es la siguiente ranura del almacén.
+        """
+        if slot != len(self._ids):
+            raise ValueError(f"Ranura {slot} fuera de orden; se esperaba {len(self._ids)}.")
+        self._ids.append(sys.intern(player.id))
+        self._ratings.append(player.rating)
+        self._alive.append(1)
+        self.live += 1
+        if 3 * (self._filled + 1) > 2 * len(self._table):
+            self._rebuild_table()
+        else:
+            self._table_insert(player.id, slot)
+            self._filled += 1
+
+    def __getitem__(self, slot: int) -> Player:
+        if not (0 <= slot < len(self._alive)) or not self._alive[slot]:
+            raise KeyError(slot)
+        return Player(id=self._ids[slot], rating=self._ratings[slot])
+
+    def __delitem__(self, slot: int):
+        if not (0 <= slot < len(self._alive)) or not self._alive[slot]:
+            raise KeyError(slot)
+        self._table[self._table_position(self._ids[slot], slot)] = _DELETED
+        self._alive[slot] = 0
+        self._ids[slot] = ""
+        self.live -= 1
+
+    def __contains__(self, slot) -> bool:
+        return 0 <= slot < len(self._alive) and self._alive[slot] == 1
+
+    def __iter__(self) -> Iterator[int]:
+        alive = self._alive
+        return (slot for slot in range(len(alive)) if alive[slot])
+
+    def __len__(self) -> int:
+        return self.live
+
+    # -------------------------------------------------------
+    # Búsqueda por ID
+    # -------------------------------------------------------
+    def slot_of(self, player_id: str) -> Optional[int]:
+        """
+        Ranura del jugador vivo con ese ID, en O(1) esperado.
+
+        Returns:
+            Optional[int]: Ranura, o None si el jugador no está en el almacén.
+        """
+        table, ids = self._table, self._ids
+        mask = len(table) - 1
+        i = hash(player_id) & mask
+        while True:
+            slot = table[i]
+            if slot == _EMPTY:
+                return None
+            if slot >= 0 and ids[slot] == player_id:
+                return slot
+            i = (i + 1) & mask
+
+    def _table_position(self, player_id: str, slot: int) -> int:
+        """Posición de la tabla que guarda `slot` (que debe estar vivo)."""
+        table = self._table
+        mask = len(table) - 1
+        i = hash(player_id) & mask
+        while table[i] != slot:
+            i = (i + 1) & mask
+        return i
+
+    def _table_insert(self, player_id: str, slot: int):
+        table = self._table
+        mask = len(table) - 1
+        i = hash(player_id) & mask
+        while table[i] >= 0:
+            i = (i + 1) & mask
+        table[i] = slot
+
+    def _rebuild_table(self):
+        """
+        Reconstruye la tabla con las ranuras vivas (descarta las borradas),
+        dejando la ocupación en a lo sumo 1/2 (se reconstruye al pasar de
+        2/3); el costo O(n) se amortiza.
+        """
+        size = 8
+        while size < 2 * self.live:
+            size *= 2
+        self._table = array("i", [_EMPTY]) * size
+        self._filled = 0
+        ids, alive = self._ids, self._alive
+        for slot in range(len(alive)):
+            if alive[slot]:
+                self._table_insert(ids[slot], slot)
+                self._filled += 1
+
+    # -------------------------------------------------------
+    # Compactación
+    # -------------------------------------------------------
+    @property
+    def dead(self) -> int:
+        """Número de ranuras muertas pendientes de compactar."""
+        return len(self._alive) - self.live
+
+    def compact(self) -> array:
+        """
+        Elimina las ranuras muertas renumerando las vivas en orden.
+
+        Returns:
+            array: Tabla ranura antigua → ranura nueva (-1 si estaba muerta).
+        """
+        remap = array("q", [-1]) * len(self._alive)
+        ids: List[str] = []
+        ratings = array("i")
+        for slot, alive in enumerate(self._alive):
+            if alive:
+                remap[slot] = len(ids)
+                ids.append(self._ids[slot])
+                ratings.append(self._ratings[slot])
+        self._ids = ids
+        self._ratings = ratings
+        self._alive = bytearray(b"\x01") * len(ids)
+        self._rebuild_table()
+        return remap
+
+    def nbytes(self) -> int:
+        """
+        Bytes ocupados por los arreglos del almacén (sin contar las
+        cadenas de ID, que se comparten con el resto del proceso).
+        """
+        return (sys.getsizeof(self._ids) + sys.getsizeof(self._ratings)
+                + sys.getsizeof(self._alive) + sys.getsizeof(self._table))
@@ -0,0 +1,193 @@
+# ===========================================================
+# Archivo: profiling.py
+# Descripción:
+# Este módulo implementa la instrumentación de bajo costo de los
+# puntos calientes de la plataforma (emparejamiento, torneos y
+# logros). Registra el número de llamadas y un histograma de
+# latencias de cada función instrumentada en TelemetrySystem.
+#
+# La instrumentación se activa y desactiva globalmente. Estando
+# desactivada, cada llamada instrumentada solo paga la consulta
+# de un booleano del módulo.
+#
+# Uso:
+#   import profiling
+#   telemetry = profiling.enable()
+#   ...
+#   print(profiling.format_report())
+#
+# Incluye:
+#   - Decorador profiled (instrumenta una función)
+#   - Gestor de contexto profile_block (instrumenta un bloque)
+#   - Funciones enable/disable/reset/report/format_report
+#
+# ===========================================================
+
+import functools
+import time
+from typing import Callable, Dict, List, Optional
+
+from telemetry import TelemetrySystem
+
+
+# Prefijo de las métricas de perfilado dentro de TelemetrySystem.
+METRIC_PREFIX = "profile."
+
+# Estado global de la instrumentación
+_enabled = False
+_telemetry: Optional[TelemetrySystem] = None
+_names: List[str] = []
+
+
+def enable(telemetry: Optional[TelemetrySystem] = None) -> TelemetrySystem:
+    """
+    Activa la instrumentación global.
+
+    Args:
+        telemetry (TelemetrySystem, opcional): Destino de las métricas. Si no
+            se indica, se reutiliza el anterior o se crea uno sin muestras crudas.
+
+    Returns:
+        TelemetrySystem: Sistema donde se registran las latencias.
+    """
+    global _enabled, _telemetry
+    if telemetry is not None:
+        _telemetry = telemetry
+    elif _telemetry is None:
+        _telemetry = TelemetrySystem(max_samples=0)
+    for name in _names:
+        _telemetry.track_percentiles(METRIC_PREFIX + name)
+    _enabled = True
+    return _telemetry
+
+
+def disable():
+    """Desactiva la instrumentación global (las métricas ya registradas se conservan)."""
+    global _enabled
+    _enabled = False
+
+
+def reset():
+    """
+    Desactiva la instrumentación y olvida el sistema de telemetría: el
+    próximo `enable()` sin argumentos empieza con métricas vacías.
+    """
+    global _enabled, _telemetry
+    _enabled = False
+    _telemetry = None
+
+
+def is_enabled() -> bool:
+    """Indica si la instrumentación está activa."""
+    return _enabled
+
+
+def _register(name: str):
+    """Da de alta un punto instrumentado para el reporte y los percentiles."""
+    if name not in _names:
+        _names.append(name)
+        if _telemetry is not None:
+            _telemetry.track_percentiles(METRIC_PREFIX + name)
+
+
+# -----------------------------------------------------------
+# Instrumentación de funciones y bloques
+# -----------------------------------------------------------
+def profiled(name: str) -> Callable[[Callable], Callable]:
+    """
+    Decorador que mide la latencia de cada llamada a la función.
+
+    Args:
+        name (str): Nombre del punto instrumentado (por ejemplo,
+            "matchmaking.find_matches").
+    """
+    _register(name)
+    metric = METRIC_PREFIX + name
+
+    def decorator(fn: Callable) -> Callable:
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            # Se toma al entrar: un `reset()` concurrente no afecta esta llamada
+            telemetry = _telemetry if _enabled else None
+            if telemetry is None:
+                return fn(*args, **kwargs)
+            start = time.perf_counter_ns()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                telemetry.record(metric, (time.perf_counter_ns() - start) / 1e9)
+        return wrapper
+    return decorator
+
+
+class profile_block:
+    """
+    Gestor de contexto que mide la latencia de un bloque de código.
+
+    Ejemplo:
+        with profile_block("tournament.create_bracket"):
+            t.create_bracket()
+    """
+
+    __slots__ = ("metric", "_start", "_telemetry")
+
+    def __init__(self, name: str):
+        _register(name)
+        self.metric = METRIC_PREFIX + name
+        self._start = 0
+        self._telemetry = None
+
+    def __enter__(self):
+        # El destino se fija al entrar, como en `profiled`
+        self._telemetry = _telemetry if _enabled else None
+        if self._telemetry is not None:
+            self._start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc):
+        telemetry, self._telemetry = self._telemetry, None
+        if telemetry is not None:
+            telemetry.record(self.metric, (time.perf_counter_ns() - self._start) / 1e9)
+        self._start = 0
+        return False
+
+
+# -----------------------------------------------------------
+# Reporte por función
+# -----------------------------------------------------------
+def report() -> Dict[str, Dict[str, float]]:
+    """
+    Resume las latencias de cada punto instrumentado con llamadas.
+
+    Returns:
+        Dict[str, Dict[str, float]]: Por nombre: "calls" y las latencias
+        "mean", "p50", "p95", "p99" y "max" en milisegundos.
+    """
+    if _telemetry is None:
+        return {}
+    stats = _telemetry.stats
+    sketches = _telemetry.sketches
+    summary = {}
+    for name in _names:
+        metric = METRIC_PREFIX + name
+        if metric not in stats:
+            continue
+        sketch = sketches.get(metric)
+        entry = {"calls": stats[metric].count, "mean": stats[metric].mean * 1e3,
+                 "max": stats[metric].max * 1e3}
+        for q in (50, 95, 99):
+            entry[f"p{q}"] = sketch.quantile(q / 100) * 1e3 if sketch is not None else 0.0
+        summary[name] = entry
+    return summary
+
+
+def format_report() -> str:
+    """Reporte de `report()` como tabla de texto, ordenado por tiempo total."""
+    rows = sorted(report().items(), key=lambda item: item[1]["calls"] * item[1]["mean"],
+                  reverse=True)
+    lines = [f"{'función':<32} {'llamadas':>10} {'media ms':>10} {'p50':>9} "
+             f"{'p95':>9} {'p99':>9} {'máx':>9}"]
+    for name, e in rows:
+        lines.append(f"{name:<32} {e['calls']:>10} {e['mean']:>10.3f} {e['p50']:>9.3f} "
+                     f"{e['p95']:>9.3f} {e['p99']:>9.3f} {e['max']:>9.3f}")
+    return "\n".join(lines)
@@ -0,0 +1,220 @@
+# ===========================================================
+# Archivo: sharded_matchmaking.py
+# Descripción:
+# Este módulo implementa un emparejador particionado (sharded)
+# que reparte la cola de jugadores en franjas de rating
+# solapadas, y opcionalmente por región, para ejecutar el
+# emparejamiento de cada franja en paralelo en un pool de
+# procesos.
+#
+# Cada franja se empareja con un Matchmaker independiente. Los
+# jugadores cercanos al borde de una franja aparecen también en
+# la franja vecina; una fase de conciliación garantiza que nadie
+# quede emparejado dos veces y vuelve a emparejar a quienes
+# perdieron su pareja en esa conciliación.
+#
+# Incluye:
+#   - Clase ShardedMatchmaker (emparejamiento paralelo por franjas)
+#
+# ===========================================================
+
+from concurrent.futures import Executor, ProcessPoolExecutor
+from typing import Dict, List, Optional, Set, Tuple
+
+from matchmaking import Matchmaker, Player
+
+
+# Región usada cuando el jugador no indica ninguna.
+DEFAULT_REGION = "global"
+
+
+class ShardedMatchmaker:
+    """
+    Emparejador que paraleliza `Matchmaker.find_matches` por franjas de rating.
+
+    Funcionalidades:
+    - Mantiene la cola de jugadores con su región.
+    - Divide la cola en franjas de `band_width` puntos de rating; los
+      jugadores a menos de `overlap` puntos del borde se copian también
+      en la franja vecina para no perder buenas parejas entre franjas.
+    - Ejecuta cada franja en un ejecutor (por defecto un pool de procesos).
+    - Concilia los resultados para que nadie se empareje dos veces.
+
+    Los jugadores de regiones distintas nunca se emparejan entre sí.
+    """
+
+    def __init__(self, band_width: int = 200, overlap: int = 50,
+                 executor: Optional[Executor] = None, max_workers: Optional[int] = None):
+        """
+        Inicializa el emparejador particionado.
+
+        Args:
+            band_width (int): Ancho de cada franja de rating.
+            overlap (int): Distancia al borde bajo la cual un jugador se
+                copia en la franja vecina. Debe ser menor que `band_width`.
+            executor (Executor, opcional): Ejecutor a usar. Si no se indica,
+                se crea un ProcessPoolExecutor propio al primer uso.
+            max_workers (int, opcional): Procesos del pool propio.
+
+        Raises:
+            ValueError: Si los parámetros de las franjas no son válidos.
+        """
+        if band_width <= 0 or not (0 <= overlap < band_width):
+            raise ValueError("Se requiere band_width > 0 y 0 <= overlap < band_width.")
+        self.band_width = band_width
+        self.overlap = overlap
+        self._executor = executor
+        self._owns_executor = executor is None
+        self._max_workers = max_workers
+
+        # Jugadores en cola por ID, con su región
+        self._queued: Dict[str, Tuple[Player, str]] = {}
+
+    # -------------------------------------------------------
+    # Gestión de la cola
+    # -------------------------------------------------------
+    def enqueue(self, player: Player, region: str = DEFAULT_REGION):
+        """
+        Agrega un jugador a la cola.
+
+        Args:
+            player (Player): Jugador que desea buscar partida.
+            region (str): Región del jugador.
+
+        Raises:
+            ValueError: Si el jugador ya está en cola.
+        """
+        if player.id in self._queued:
+            raise ValueError(f"El jugador '{player.id}' ya está en cola.")
+        self._queued[player.id] = (player, region)
+
+    def dequeue(self, player_id: str) -> Optional[Player]:
+        """
+        Retira a un jugador de la cola.
+
+        Returns:
+            Optional[Player]: El jugador retirado, o None si no estaba en cola.
+        """
+        entry = self._queued.pop(player_id, None)
+        return entry[0] if entry is not None else None
+
+    def is_queued(self, player_id: str) -> bool:
+        """Indica si un jugador está actualmente en cola."""
+        return player_id in self._queued
+
+    @property
+    def queue(self) -> List[Player]:
+        """Jugadores actualmente en cola, en orden de llegada."""
+        return [player for player, _ in self._queued.values()]
+
+    # -------------------------------------------------------
+    # Emparejamiento paralelo
+    # -------------------------------------------------------
+    def find_matches(self) -> List[Tuple[Player, Player]]:
+        """
+        Empareja la cola ejecutando cada franja en paralelo.
+
+        Conciliación:
+        - Los resultados se aceptan por región y franja, en orden de rating.
+        - Se descarta todo par con un jugador ya emparejado por otra franja.
+        - Los jugadores que quedaron sin pareja se emparejan en una pasada
+          final por región, que solo contiene restos de las franjas.
+
+        Returns:
+            List[Tuple[Player, Player]]: Pares emparejados, como en `Matchmaker`.
+        """
+        shards = self._build_shards()
+        executor = self._get_executor()
+        results = list(executor.map(_match_shard, [entries for _, entries in shards]))
+
+        matched: Set[str] = set()
+        matches: List[Tuple[Player, Player]] = []
+        for pairs in results:
+            for a, b in pairs:
+                if a in matched or b in matched:
+                    continue
+                matched.add(a)
+                matched.add(b)
+                matches.append((self._queued[a][0], self._queued[b][0]))
+
+        # Pasada final con los restos de cada región
+        leftovers: Dict[str, List[Tuple[str, int]]] = {}
+        for player_id, (player, region) in self._queued.items():
+            if player_id not in matched:
+                leftovers.setdefault(region, []).append((player_id, player.rating))
+        for region in sorted(leftovers):
+            for a, b in _match_shard(leftovers[region]):
+                matched.add(a)
+                matched.add(b)
+                matches.append((self._queued[a][0], self._queued[b][0]))
+
+        for player_id in matched:
+            del self._queued[player_id]
+        return matches
+
+    def _build_shards(self) -> List[Tuple[Tuple[str, int], List[Tuple[str, int]]]]:
+        """
+        Reparte la cola en franjas (región, banda) ordenadas.
+
+        Returns:
+            List: Pares ((región, banda), [(id, rating), ...]).
+        """
+        width = self.band_width
+        overlap = self.overlap
+        shards: Dict[Tuple[str, int], List[Tuple[str, int]]] = {}
+        for player_id, (player, region) in self._queued.items():
+            rating = player.rating
+            band = rating // width
+            entry = (player_id, rating)
+            shards.setdefault((region, band), []).append(entry)
+            offset = rating - band * width
+            if overlap and offset < overlap:
+                shards.setdefault((region, band - 1), []).append(entry)
+            elif overlap and width - offset <= overlap:
+                shards.setdefault((region, band + 1), []).append(entry)
+        return sorted(shards.items())
+
+    # -------------------------------------------------------
+    # Ciclo de vida del ejecutor
+    # -------------------------------------------------------
+    def _get_executor(self) -> Executor:
+        """Devuelve el ejecutor, creando el pool de procesos propio si hace falta."""
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self._max_workers)
+        return self._executor
+
+    def close(self):
+        """Cierra el pool de procesos propio, si se creó."""
+        if self._owns_executor and self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+# -----------------------------------------------------------
+# Trabajo por franja (se ejecuta en los procesos del pool)
+# -----------------------------------------------------------
+def _match_shard(entries: List[Tuple[str, int]]) -> List[Tuple[str, str]]:
+    """
+    Empareja una franja con un Matchmaker local.
+
+    Recibe y devuelve solo IDs y ratings para minimizar el costo de
+    serialización entre procesos.
+
+    Args:
+        entries (List[Tuple[str, int]]): Pares (id, rating) de la franja.
+
+    Returns:
+        List[Tuple[str, str]]: Pares de IDs emparejados.
+    """
+    m = Matchmaker()
+    # Encolar por rating (orden estable: respeta la llegada a igual rating)
+    # hace que cada inserción en el índice caiga al final.
+    for player_id, rating in sorted(entries, key=lambda entry: entry[1]):
+        m.enqueue(Player(id=player_id, rating=rating))
+    return [(a.id, b.id) for a, b in m.find_matches()]
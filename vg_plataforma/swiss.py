@@ -0,0 +1,285 @@
+# ===========================================================
+# Archivo: swiss.py
+# Descripción:
+# Este módulo implementa el formato de torneo suizo (Swiss) para
+# las noches de liga de la plataforma de videojuegos.
+#
+# En cada ronda los jugadores se ordenan por puntuación y se
+# agrupan por puntuación igual. Cada grupo se empareja con un
+# Matchmaker, que une a los jugadores de rating más cercano (el
+# mismo criterio de cercanía del emparejamiento normal). Los
+# pares que repetirían un enfrentamiento se corrigen
+# intercambiando rivales con el par vecino y, si no es posible,
+# ambos jugadores bajan (flotan) al grupo siguiente, igual que el
+# jugador sobrante de un grupo impar.
+#
+# El costo por ronda es O(n log n): un ordenamiento y una pasada
+# por grupo, sin búsquedas entre todos los pares.
+#
+# Incluye:
+#   - Clase SwissTournament (rondas suizas sin revanchas)
+#
+# ===========================================================
+
+from typing import Dict, List, Optional, Set, Tuple, Union
+
+from matchmaking import Matchmaker, Player
+
+
+# Puntos por victoria, empate y pase libre
+WIN_POINTS = 1.0
+DRAW_POINTS = 0.5
+BYE_POINTS = 1.0
+
+# Retrocesos máximos al buscar emparejamientos para los que flotan al final
+SEARCH_LIMIT = 10_000
+
+
+class SwissTournament:
+    """
+    Torneo en formato suizo.
+
+    Funcionalidades:
+    - Registro de jugadores (IDs o Player con rating).
+    - Emparejamiento por grupos de puntuación, sin revanchas y con a lo
+      sumo un pase libre por jugador mientras sea posible.
+    - Registro de resultados y clasificación.
+
+    Atributos:
+        id (str): Identificador del torneo.
+        players (List[str]): Jugadores registrados, en orden de registro.
+        ratings (Dict[str, int]): Rating de cada jugador (0 si no se indicó).
+        scores (Dict[str, float]): Puntuación acumulada de cada jugador.
+        rounds (List[List[Tuple[str, Optional[str]]]]): Emparejamientos de
+            cada ronda; un pase libre es (jugador, None).
+    """
+
+    def __init__(self, id_: str):
+        """Inicializa un torneo suizo vacío."""
+        self.id = id_
+        self.players: List[str] = []
+        self.ratings: Dict[str, int] = {}
+        self.scores: Dict[str, float] = {}
+        self.rounds: List[List[Tuple[str, Optional[str]]]] = []
+
+        # Enfrentamientos ya jugados (par ordenado) y pases libres recibidos
+        self._played: Set[Tuple[str, str]] = set()
+        self._byes: Set[str] = set()
+
+        # Partidos de la ronda actual aún sin resultado
+        self._pending: Set[Tuple[str, str]] = set()
+
+    def register(self, player: Union[str, Player]):
+        """
+        Registra un jugador (los duplicados se ignoran).
+
+        Args:
+            player (str | Player): ID del jugador o Player con su rating.
+        """
+        player_id = player.id if isinstance(player, Player) else player
+        if player_id in self.scores:
+            return
+        self.players.append(player_id)
+        self.ratings[player_id] = player.rating if isinstance(player, Player) else 0
+        self.scores[player_id] = 0.0
+
+    # -------------------------------------------------------
+    # Emparejamiento de una ronda
+    # -------------------------------------------------------
+    def pair_round(self) -> List[Tuple[str, Optional[str]]]:
+        """
+        Empareja la siguiente ronda.
+
+        Returns:
+            List[Tuple[str, Optional[str]]]: Pares de la ronda, de los grupos
+            de mayor a menor puntuación; el pase libre (si hay) va al final.
+
+        Raises:
+            ValueError: Si la ronda anterior tiene resultados pendientes, hay
+                menos de 2 jugadores o no existe emparejamiento sin revanchas.
+        """
+        if self._pending:
+            raise ValueError("La ronda anterior tiene resultados pendientes.")
+        if len(self.players) < 2:
+            raise ValueError("Se necesitan al menos 2 jugadores.")
+
+        scores, ratings = self.scores, self.ratings
+        order = sorted(self.players, key=lambda p: (-scores[p], -ratings[p]))
+        bye = self._choose_bye(order) if len(order) % 2 else None
+
+        pairs: List[Tuple[str, str]] = []
+        floaters: List[str] = []
+        start = 0
+        while start < len(order):
+            end = start
+            score = scores[order[start]]
+            while end < len(order) and scores[order[end]] == score:
+                end += 1
+            group = [p for p in order[start:end] if p != bye]
+            floaters = self._pair_group(floaters + group, pairs)
+            start = end
+
+        if floaters:
+            self._place_last(floaters, pairs)
+
+        round_pairs: List[Tuple[str, Optional[str]]] = list(pairs)
+        for a, b in pairs:
+            key = _pair_key(a, b)
+            self._played.add(key)
+            self._pending.add(key)
+        if bye is not None:
+            self._byes.add(bye)
+            scores[bye] += BYE_POINTS
+            round_pairs.append((bye, None))
+        self.rounds.append(round_pairs)
+        return round_pairs
+
+    def _choose_bye(self, order: List[str]) -> str:
+        """Pase libre para el peor clasificado que aún no tuvo uno."""
+        for player_id in reversed(order):
+            if player_id not in self._byes:
+                return player_id
+        return order[-1]
+
+    def _pair_group(self, pool: List[str], pairs: List[Tuple[str, str]]) -> List[str]:
+        """
+        Empareja un grupo de puntuación (más los que flotan del anterior).
+
+        Usa un Matchmaker para unir a los jugadores de rating más cercano y
+        corrige las revanchas intercambiando rivales con el par anterior.
+
+        Returns:
+            List[str]: Jugadores sin pareja, que flotan al grupo siguiente.
+        """
+        ratings = self.ratings
+        matchmaker = Matchmaker()
+        # Encolar por rating hace que cada inserción caiga al final del índice
+        for player_id in sorted(pool, key=ratings.__getitem__):
+            matchmaker.enqueue(Player(id=player_id, rating=ratings[player_id]))
+
+        matches = matchmaker.find_matches()
+        floaters = [player.id for player in matchmaker.queue]
+        group_start = len(pairs)
+        for a, b in matches:
+            a, b = a.id, b.id
+            if _pair_key(a, b) not in self._played:
+                pairs.append((a, b))
+            elif len(pairs) > group_start and self._swap_last(a, b, pairs):
+                continue
+            else:
+                floaters.extend((a, b))
+        return floaters
+
+    def _swap_last(self, a: str, b: str, pairs: List[Tuple[str, str]]) -> bool:
+        """Intenta rehacer el último par (c, d) como (a, c)+(b, d) o (a, d)+(b, c)."""
+        c, d = pairs[-1]
+        played = self._played
+        for x, y in ((c, d), (d, c)):
+            if _pair_key(a, x) not in played and _pair_key(b, y) not in played:
+                pairs[-1] = (a, x)
+                pairs.append((b, y))
+                return True
+        return False
+
+    def _place_last(self, floaters: List[str], pairs: List[Tuple[str, str]]):
+        """
+        Ubica a los que flotaron del último grupo.
+
+        Se buscan emparejamientos sin revanchas (con retroceso) entre los
+        que flotan y los últimos pares ya formados, duplicando cuántos pares
+        se rehacen hasta encontrar una solución: normalmente basta con los
+        que flotan y el resto de la ronda no se toca.
+
+        Raises:
+            ValueError: Si no existe emparejamiento sin revanchas.
+        """
+        scores, ratings = self.scores, self.ratings
+        reopen = 0
+        while True:
+            kept = len(pairs) - reopen
+            pool = floaters + [p for pair in pairs[kept:] for p in pair]
+            pool.sort(key=lambda p: (-scores[p], -ratings[p]))
+            found = self._match_pool(pool)
+            if found is not None:
+                pairs[kept:] = found
+                return
+            if reopen == len(pairs):
+                raise ValueError("No existe un emparejamiento sin revanchas para esta ronda.")
+            reopen = min(len(pairs), 2 * reopen or 1)
+
+    def _match_pool(self, pool: List[str]) -> Optional[List[Tuple[str, str]]]:
+        """
+        Empareja a todo `pool` sin revanchas, prefiriendo rivales cercanos en
+        la clasificación (búsqueda con retroceso iterativa y acotada).
+
+        Returns:
+            Optional[List[Tuple[str, str]]]: Pares, o None si no hay solución
+            (o se agotó el límite de retrocesos).
+        """
+        n = len(pool)
+        if n % 2:
+            return None
+        played = self._played
+        used = [False] * n
+        chosen: List[Tuple[int, int]] = []
+        i, j, backtracks = 0, 1, 0
+        while len(chosen) * 2 < n:
+            # `i` es el primer jugador libre y `j` su próximo candidato
+            while j < n and (used[j] or _pair_key(pool[i], pool[j]) in played):
+                j += 1
+            if j < n:
+                used[i] = used[j] = True
+                chosen.append((i, j))
+                while i < n and used[i]:
+                    i += 1
+                j = i + 1
+                continue
+            if not chosen or backtracks == SEARCH_LIMIT:
+                return None
+            backtracks += 1
+            i, j = chosen.pop()
+            used[i] = used[j] = False
+            j += 1
+        return [(pool[a], pool[b]) for a, b in chosen]
+
+    # -------------------------------------------------------
+    # Resultados y clasificación
+    # -------------------------------------------------------
+    def set_result(self, a: str, b: str, winner: Optional[str]):
+        """
+        Registra el resultado de un partido de la ronda actual.
+
+        Args:
+            a (str): Un jugador del partido.
+            b (str): El otro jugador.
+            winner (str | None): ID del ganador, o None si fue empate.
+
+        Raises:
+            ValueError: Si el partido no está pendiente o el ganador no lo juega.
+        """
+        key = _pair_key(a, b)
+        if key not in self._pending:
+            raise ValueError(f"No hay un partido pendiente entre '{a}' y '{b}'.")
+        if winner is None:
+            self.scores[a] += DRAW_POINTS
+            self.scores[b] += DRAW_POINTS
+        elif winner in key:
+            self.scores[winner] += WIN_POINTS
+        else:
+            raise ValueError(f"'{winner}' no juega el partido entre '{a}' y '{b}'.")
+        self._pending.discard(key)
+
+    def has_played(self, a: str, b: str) -> bool:
+        """Indica si dos jugadores ya se enfrentaron."""
+        return _pair_key(a, b) in self._played
+
+    def standings(self) -> List[Tuple[str, float]]:
+        """Clasificación por puntuación (y rating como desempate), de mayor a menor."""
+        scores, ratings = self.scores, self.ratings
+        order = sorted(self.players, key=lambda p: (-scores[p], -ratings[p]))
+        return [(player_id, scores[player_id]) for player_id in order]
+
+
+def _pair_key(a: str, b: str) -> Tuple[str, str]:
+    """Clave de un enfrentamiento, independiente del orden de los jugadores."""
+    return (a, b) if a < b else (b, a)
@@ -0,0 +1,251 @@
+# ===========================================================
+# Archivo: team_matchmaking.py
+# Descripción:
+# Este módulo implementa el emparejamiento por equipos (3v3,
+# 5v5, ...) con grupos prearmados (parties) para la plataforma
+# de videojuegos.
+#
+# Forma partidas de dos equipos de N jugadores manteniendo
+# juntos a los miembros de cada grupo e intentando igualar el
+# rating medio de ambos equipos. Usa una heurística de costo
+# acotado: los grupos se ordenan por rating y cada partida se
+# arma dentro de una ventana pequeña de grupos consecutivos,
+# seguida de un número limitado de intercambios para equilibrar.
+#
+# Incluye:
+#   - Clase Party (grupo prearmado de jugadores)
+#   - Clase TeamMatchmaker (formación y evaluación de partidas por equipos)
+#
+# ===========================================================
+
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+from matchmaking import Player, elo_update
+
+
+# -----------------------------------------------------------
+# Modelo de datos: Grupo prearmado
+# -----------------------------------------------------------
+@dataclass
+class Party:
+    """
+    Grupo de jugadores que debe jugar en el mismo equipo.
+
+    Atributos:
+        id (str): Identificador del grupo.
+        members (List[Player]): Jugadores del grupo.
+    """
+    id: str
+    members: List[Player]
+
+    @property
+    def size(self) -> int:
+        """Número de jugadores del grupo."""
+        return len(self.members)
+
+    @property
+    def rating_sum(self) -> int:
+        """Suma de los ratings del grupo."""
+        return sum(p.rating for p in self.members)
+
+
+# -----------------------------------------------------------
+# Clase principal: TeamMatchmaker
+# -----------------------------------------------------------
+class TeamMatchmaker:
+    """
+    Sistema de emparejamiento por equipos con grupos prearmados.
+
+    Funcionalidades:
+    - Mantiene una cola de grupos (un jugador solo es un grupo de uno).
+    - Forma partidas de dos equipos de `team_size` jugadores.
+    - Actualiza ratings por equipo reutilizando la fórmula ELO del Matchmaker.
+    """
+
+    def __init__(self, team_size: int = 5, search_window: Optional[int] = None,
+                 balance_rounds: Optional[int] = None):
+        """
+        Inicializa la cola de grupos.
+
+        Args:
+            team_size (int): Jugadores por equipo.
+            search_window (int, opcional): Grupos consecutivos (por rating)
+                considerados al armar cada partida. Por defecto 4 * team_size.
+            balance_rounds (int, opcional): Máximo de intercambios de grupos
+                para equilibrar los equipos. Por defecto 2 * team_size.
+        """
+        if team_size < 1:
+            raise ValueError("team_size debe ser al menos 1.")
+        self.team_size = team_size
+        self.search_window = search_window or 4 * team_size
+        self.balance_rounds = balance_rounds if balance_rounds is not None else 2 * team_size
+
+        # Grupos en cola por ID, en orden de llegada
+        self.parties: Dict[str, Party] = {}
+
+    # -------------------------------------------------------
+    # Gestión de la cola
+    # -------------------------------------------------------
+    def enqueue_party(self, members: List[Player], party_id: Optional[str] = None) -> str:
+        """
+        Agrega un grupo a la cola.
+
+        Args:
+            members (List[Player]): Jugadores del grupo.
+            party_id (str, opcional): ID del grupo; por defecto, el del
+                primer miembro.
+
+        Returns:
+            str: ID del grupo encolado.
+
+        Raises:
+            ValueError: Si el grupo está vacío, supera `team_size` o ya está en cola.
+        """
+        if not members or len(members) > self.team_size:
+            raise ValueError(f"Un grupo debe tener entre 1 y {self.team_size} jugadores.")
+        party_id = party_id if party_id is not None else members[0].id
+        if party_id in self.parties:
+            raise ValueError(f"El grupo '{party_id}' ya está en cola.")
+        self.parties[party_id] = Party(id=party_id, members=list(members))
+        return party_id
+
+    def enqueue(self, player: Player) -> str:
+        """Agrega a un jugador solo (grupo de uno) a la cola."""
+        return self.enqueue_party([player])
+
+    def dequeue_party(self, party_id: str) -> Optional[Party]:
+        """Retira un grupo de la cola; devuelve None si no estaba."""
+        return self.parties.pop(party_id, None)
+
+    # -------------------------------------------------------
+    # Formación de partidas
+    # -------------------------------------------------------
+    def find_team_matches(self) -> List[Tuple[List[Player], List[Player]]]:
+        """
+        Forma todas las partidas posibles con los grupos en cola.
+
+        Los grupos se ordenan por rating medio y se recorren en ese orden.
+        Cada partida se arma con el primer grupo libre y los siguientes
+        dentro de `search_window`, de modo que el costo por partida está
+        acotado y el total es O(n log n) por el ordenamiento.
+
+        Returns:
+            List[Tuple[List[Player], List[Player]]]: Pares de equipos.
+        """
+        order = sorted(self.parties.values(), key=lambda party: party.rating_sum / party.size)
+        used = set()
+        matches = []
+
+        i = 0
+        while i < len(order):
+            if order[i].id in used:
+                i += 1
+                continue
+
+            window = []
+            j = i
+            while j < len(order) and len(window) < self.search_window:
+                if order[j].id not in used:
+                    window.append(order[j])
+                j += 1
+
+            teams = self._form_lobby(window)
+            if teams is None:
+                i += 1  # este grupo no cabe con sus vecinos: sigue en cola
+                continue
+
+            team_a, team_b = self._balance(*teams)
+            for party in team_a + team_b:
+                used.add(party.id)
+                del self.parties[party.id]
+            matches.append((_members(team_a), _members(team_b)))
+
+        return matches
+
+    def _form_lobby(self, window: List[Party]) -> Optional[Tuple[List[Party], List[Party]]]:
+        """
+        Llena dos equipos de `team_size` con los grupos de la ventana.
+
+        Recorre la ventana en orden de rating asignando cada grupo al
+        primer equipo donde cabe. El primer grupo siempre se incluye.
+
+        Returns:
+            Optional[Tuple]: Grupos de cada equipo, o None si no se completan.
+        """
+        size = self.team_size
+        team_a: List[Party] = []
+        team_b: List[Party] = []
+        fill_a = fill_b = 0
+        for party in window:
+            if fill_a + party.size <= size:
+                team_a.append(party)
+                fill_a += party.size
+            elif fill_b + party.size <= size:
+                team_b.append(party)
+                fill_b += party.size
+            if fill_a == size and fill_b == size:
+                return team_a, team_b
+        return None
+
+    def _balance(self, team_a: List[Party],
+                 team_b: List[Party]) -> Tuple[List[Party], List[Party]]:
+        """
+        Reduce la diferencia de rating entre equipos intercambiando grupos.
+
+        En cada ronda aplica el intercambio de dos grupos del mismo tamaño
+        que más reduce la diferencia; se detiene si ninguno mejora o tras
+        `balance_rounds` rondas. Como los equipos tienen igual número de
+        jugadores, igualar la suma equivale a igualar el rating medio.
+        """
+        team_a, team_b = list(team_a), list(team_b)
+        diff = sum(p.rating_sum for p in team_a) - sum(p.rating_sum for p in team_b)
+
+        for _ in range(self.balance_rounds):
+            best = None
+            best_diff = abs(diff)
+            for x, pa in enumerate(team_a):
+                for y, pb in enumerate(team_b):
+                    if pa.size != pb.size:
+                        continue
+                    new_diff = diff - 2 * (pa.rating_sum - pb.rating_sum)
+                    if abs(new_diff) < best_diff:
+                        best, best_diff = (x, y, new_diff), abs(new_diff)
+            if best is None:
+                break
+            x, y, diff = best
+            team_a[x], team_b[y] = team_b[y], team_a[x]
+
+        return team_a, team_b
+
+    # -------------------------------------------------------
+    # Actualización de ratings por equipo
+    # -------------------------------------------------------
+    def update_team_ratings(self, team_a: List[Player], team_b: List[Player],
+                            a_won: bool) -> Tuple[List[int], List[int]]:
+        """
+        Actualiza los ratings tras una partida por equipos.
+
+        Cada equipo se trata como un jugador con su rating medio y se aplica
+        la fórmula ELO del Matchmaker (`elo_update`); la variación
+        resultante se suma a cada miembro del equipo.
+
+        Args:
+            team_a (List[Player]): Jugadores del equipo A.
+            team_b (List[Player]): Jugadores del equipo B.
+            a_won (bool): True si ganó el equipo A.
+
+        Returns:
+            Tuple[List[int], List[int]]: Nuevos ratings de cada equipo, en el
+            mismo orden que los jugadores recibidos.
+        """
+        avg_a = round(sum(p.rating for p in team_a) / len(team_a))
+        avg_b = round(sum(p.rating for p in team_b) / len(team_b))
+        new_a, new_b = elo_update(avg_a, avg_b, 1.0 if a_won else 0.0)
+        delta_a, delta_b = new_a - avg_a, new_b - avg_b
+        return [p.rating + delta_a for p in team_a], [p.rating + delta_b for p in team_b]
+
+
+def _members(parties: List[Party]) -> List[Player]:
+    """Aplana los miembros de una lista de grupos."""
+    return [player for party in parties for player in party.members]
@@ -5,13 +5,550 @@
 # encargado de recopilar y analizar métricas de rendimiento dentro
 # de la plataforma de videojuegos.
 #
+# Las métricas se resumen en agregados incrementales (conteo,
+# media, varianza, mínimo y máximo) de memoria y lectura O(1).
+# Las muestras crudas son opcionales y se guardan en un buffer
+# circular de tamaño acotado.
+#
+# Los percentiles (p50/p95/p99) de "queue_times" y "match_durations"
+# se calculan con un sketch de cubetas logarítmicas (estilo DDSketch):
+# memoria acotada, error relativo documentado y combinable entre
+# procesos o shards.
+#
+# Las solicitudes entrantes se cuentan en un buffer circular de
+# cubetas por segundo (RateCounter): registrar es O(1), leer la
+# tasa de una ventana es O(ventana) y los datos viejos caducan
+# solos al reutilizar cada cubeta.
+#
+# Concurrencia: cada hilo registra en su propio fragmento (shard),
+# protegido por un candado que solo comparte con los lectores, y
+# las lecturas combinan todos los fragmentos. Cuando un hilo
+# termina, su fragmento se combina en uno de "retirados", así que
+# la memoria y el costo de lectura dependen de los hilos vivos y
+# no de todos los que existieron. Los cronómetros se
+# identifican por (evento, entidad) y devuelven un token, así que
+# varios jugadores o partidas pueden medirse a la vez.
+#
+# "queue_times" y "match_durations" guardan además su evolución en
+# el tiempo: muestras crudas del último minuto, cubetas de 10 s
+# durante una hora y de 1 min durante un día, en buffers circulares
+# de tamaño fijo. Las consultas por rango usan el nivel más grueso
+# que cubre el rango.
+#
+# Opcionalmente, cada muestra se anexa también a un registro
+# persistente en disco (TelemetryLog, módulo telemetry_log).
+#
 # Incluye:
+#   - Clase MetricStats (agregados incrementales de una métrica)
+#   - Clase QuantileSketch (percentiles aproximados combinables)
+#   - Clase RollupSeries (agregados por intervalo con niveles de retención)
+#   - Clase RateCounter (tasa de solicitudes por ventana deslizante)
+#   - Clase TimerToken (cronómetro en curso de un evento y entidad)
 #   - Clase TelemetrySystem (gestión de métricas y cálculos promedio)
 #
 # ===========================================================
 
+import math
+import threading
 import time
-from typing import Dict, List
+import weakref
+from collections import deque
+from itertools import chain
+from typing import (Callable, Deque, Dict, Hashable, Iterable, Iterator, List, NamedTuple,
+                    Optional, Tuple, Union)
+
+
+# Muestras crudas que se conservan por métrica si no se indica otra cosa.
+DEFAULT_MAX_SAMPLES = 1024
+
+# Métricas con sketch de percentiles si no se indica otra cosa.
+DEFAULT_SKETCH_METRICS = ("queue_times", "match_durations")
+
+# Métricas con agregados por intervalo de tiempo si no se indica otra cosa.
+DEFAULT_ROLLUP_METRICS = DEFAULT_SKETCH_METRICS
+
+# Niveles de agregación (ancho de cubeta, retención) en segundos:
+# cubetas de 10 s durante una hora y de 1 min durante un día.
+DEFAULT_ROLLUP_TIERS = ((10, 3600), (60, 86400))
+
+# Segundos durante los que se conservan las muestras crudas con su marca de tiempo.
+DEFAULT_RAW_WINDOW = 60
+
+# Métrica en la que se guarda la duración de cada evento cronometrado.
+EVENT_METRICS = {"queue": "queue_times", "match": "match_durations"}
+
+
+class MetricStats:
+    """
+    Agregados incrementales de una métrica en memoria constante.
+
+    Usa el algoritmo de Welford para mantener media y varianza sin guardar
+    las muestras, y la fórmula de Chan para combinar dos agregados.
+
+    Atributos:
+        count (int): Número de muestras.
+        mean (float): Media de las muestras.
+        min (float): Valor mínimo (inf si no hay muestras).
+        max (float): Valor máximo (-inf si no hay muestras).
+    """
+
+    __slots__ = ("count", "mean", "_m2", "min", "max")
+
+    def __init__(self):
+        """Inicializa un agregado vacío."""
+        self.count = 0
+        self.mean = 0.0
+        self._m2 = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def add(self, value: float):
+        """Incorpora una muestra en O(1)."""
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self._m2 += delta * (value - self.mean)
+        if value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+
+    def merge(self, other: "MetricStats"):
+        """Combina en este agregado las muestras de `other`."""
+        if other.count == 0:
+            return
+        if self.count == 0:
+            self.count, self.mean, self._m2 = other.count, other.mean, other._m2
+            self.min, self.max = other.min, other.max
+            return
+        total = self.count + other.count
+        delta = other.mean - self.mean
+        self.mean += delta * other.count / total
+        self._m2 += other._m2 + delta * delta * self.count * other.count / total
+        self.count = total
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+
+    @property
+    def variance(self) -> float:
+        """Varianza poblacional de las muestras (0.0 con menos de dos)."""
+        return self._m2 / self.count if self.count > 1 else 0.0
+
+    def copy(self) -> "MetricStats":
+        """Copia independiente del agregado."""
+        other = MetricStats()
+        other.merge(self)
+        return other
+
+    def as_dict(self) -> Dict[str, float]:
+        """Resumen del agregado como diccionario."""
+        return {
+            "count": self.count,
+            "mean": self.mean,
+            "variance": self.variance,
+            "min": self.min if self.count else 0.0,
+            "max": self.max if self.count else 0.0,
+        }
+
+
+class QuantileSketch:
+    """
+    Sketch de percentiles con error relativo acotado (estilo DDSketch).
+
+    Cada valor positivo v se cuenta en la cubeta ceil(log_gamma(v)), con
+    gamma = (1 + alpha) / (1 - alpha). Todo valor de una cubeta se
+    representa por un mismo punto que está a un error relativo de como
+    mucho `alpha` de cualquier valor de la cubeta, así que cualquier
+    percentil devuelto está a un error relativo <= alpha del valor exacto
+    de ese rango. Los valores <= 0 (duraciones nulas) se cuentan aparte
+    como cero.
+
+    Si se superan `max_buckets` cubetas, se fusionan las más bajas: la
+    memoria queda acotada y solo los percentiles más bajos pierden
+    precisión. Dos sketches con el mismo `alpha` se combinan sumando
+    cubetas, lo que permite agregar resultados de varios procesos.
+
+    Atributos:
+        alpha (float): Error relativo garantizado.
+        count (int): Número de valores registrados.
+    """
+
+    __slots__ = ("alpha", "max_buckets", "count", "zeros", "_buckets", "_log_gamma")
+
+    def __init__(self, alpha: float = 0.01, max_buckets: int = 2048):
+        """
+        Inicializa un sketch vacío.
+
+        Args:
+            alpha (float): Error relativo, entre 0 y 1 (por defecto 1 %).
+            max_buckets (int): Máximo de cubetas almacenadas.
+
+        Raises:
+            ValueError: Si `alpha` no está en (0, 1) o `max_buckets` < 1.
+        """
+        if not 0 < alpha < 1 or max_buckets < 1:
+            raise ValueError("Se requiere 0 < alpha < 1 y max_buckets >= 1.")
+        self.alpha = alpha
+        self.max_buckets = max_buckets
+        self.count = 0
+        self.zeros = 0
+        self._buckets: Dict[int, int] = {}
+        self._log_gamma = math.log((1 + alpha) / (1 - alpha))
+
+    def add(self, value: float, count: int = 1):
+        """Registra `value` (`count` veces) en O(1) amortizado."""
+        self.count += count
+        if value <= 0:
+            self.zeros += count
+            return
+        key = math.ceil(math.log(value) / self._log_gamma)
+        buckets = self._buckets
+        buckets[key] = buckets.get(key, 0) + count
+        if len(buckets) > self.max_buckets:
+            self._collapse()
+
+    def merge(self, other: "QuantileSketch"):
+        """
+        Suma en este sketch los valores de `other`.
+
+        Raises:
+            ValueError: Si los sketches tienen distinto `alpha`.
+        """
+        if other.alpha != self.alpha:
+            raise ValueError("Solo se pueden combinar sketches con el mismo alpha.")
+        self.count += other.count
+        self.zeros += other.zeros
+        buckets = self._buckets
+        for key, count in other._buckets.items():
+            buckets[key] = buckets.get(key, 0) + count
+        if len(buckets) > self.max_buckets:
+            self._collapse()
+
+    def copy(self) -> "QuantileSketch":
+        """Copia independiente del sketch."""
+        other = QuantileSketch(alpha=self.alpha, max_buckets=self.max_buckets)
+        other.merge(self)
+        return other
+
+    def quantile(self, q: float) -> float:
+        """
+        Devuelve el valor aproximado del cuantil `q` (entre 0 y 1).
+
+        Returns:
+            float: Valor del cuantil, o 0.0 si el sketch está vacío.
+
+        Raises:
+            ValueError: Si `q` está fuera de [0, 1].
+        """
+        if not 0 <= q <= 1:
+            raise ValueError("El cuantil debe estar entre 0 y 1.")
+        if self.count == 0:
+            return 0.0
+        rank = q * (self.count - 1)
+        seen = self.zeros
+        if rank < seen:
+            return 0.0
+        gamma = math.exp(self._log_gamma)
+        for key in sorted(self._buckets):
+            seen += self._buckets[key]
+            if rank < seen:
+                # Punto medio (relativo) de la cubeta (gamma^(k-1), gamma^k]
+                return 2 * gamma ** key / (gamma + 1)
+        return 2 * gamma ** max(self._buckets) / (gamma + 1)
+
+    def _collapse(self):
+        """Fusiona las cubetas más bajas hasta respetar `max_buckets`."""
+        keys = sorted(self._buckets)
+        excess = len(keys) - self.max_buckets
+        target = keys[excess]
+        moved = sum(self._buckets.pop(key) for key in keys[:excess])
+        self._buckets[target] += moved
+
+    def to_dict(self) -> Dict[str, object]:
+        """Representación serializable (por ejemplo, para enviar entre procesos)."""
+        return {"alpha": self.alpha, "max_buckets": self.max_buckets, "count": self.count,
+                "zeros": self.zeros, "buckets": dict(self._buckets)}
+
+    @classmethod
+    def from_dict(cls, state: Dict[str, object]) -> "QuantileSketch":
+        """Reconstruye un sketch a partir de `to_dict()`."""
+        sketch = cls(alpha=state["alpha"], max_buckets=state["max_buckets"])
+        sketch.count = state["count"]
+        sketch.zeros = state["zeros"]
+        sketch._buckets = {int(k): v for k, v in state["buckets"].items()}
+        return sketch
+
+
+class RollupSeries:
+    """
+    Serie temporal de una métrica con niveles de retención.
+
+    Conserva las muestras crudas de los últimos `raw_window` segundos y,
+    para cada nivel (ancho, retención), un buffer circular de cubetas
+    MetricStats alineadas a múltiplos del ancho. Como en RateCounter, cada
+    cubeta recuerda su intervalo y se reinicia al reutilizarse, así que la
+    memoria es fija sin importar cuánto tiempo corra el proceso.
+
+    Las consultas por rango usan el nivel más grueso cuya retención cubre
+    el rango y cuyas cubetas miden como mucho una décima del rango; la
+    cubeta del borde puede aportar muestras de hasta un ancho antes del
+    inicio del rango.
+
+    Atributos:
+        raw_window (float): Segundos de muestras crudas.
+        tiers (Tuple[Tuple[int, int], ...]): Niveles (ancho, retención).
+    """
+
+    def __init__(self, tiers: Iterable[Tuple[int, int]] = DEFAULT_ROLLUP_TIERS,
+                 raw_window: float = DEFAULT_RAW_WINDOW, max_raw: int = 4096):
+        """
+        Inicializa la serie vacía.
+
+        Args:
+            tiers (Iterable[Tuple[int, int]]): Niveles (ancho de cubeta,
+                retención) en segundos.
+            raw_window (float): Segundos de muestras crudas.
+            max_raw (int): Máximo de muestras crudas conservadas.
+
+        Raises:
+            ValueError: Si algún nivel tiene ancho o retención no positivos.
+        """
+        self.tiers = tuple(sorted((int(w), int(r)) for w, r in tiers))
+        if any(w <= 0 or r < w for w, r in self.tiers):
+            raise ValueError("Cada nivel requiere ancho > 0 y retención >= ancho.")
+        self.raw_window = raw_window
+        self._raw: Deque[Tuple[float, float]] = deque(maxlen=max_raw)
+        self._raw_evicted = -math.inf  # marca de la última muestra cruda expulsada por tamaño
+        self._slots = [-(-r // w) for w, r in self.tiers]
+        self._stamps: List[List[int]] = [[-1] * n for n in self._slots]
+        self._buckets: List[List[Optional[MetricStats]]] = [[None] * n for n in self._slots]
+
+    def add(self, value: float, now: float):
+        """Registra una muestra en el instante `now` (segundos)."""
+        raw = self._raw
+        if len(raw) == raw.maxlen:
+            self._raw_evicted = raw[0][0]
+        raw.append((now, value))
+        oldest = now - self.raw_window
+        while raw[0][0] < oldest:
+            raw.popleft()
+
+        for k, (width, _) in enumerate(self.tiers):
+            index = int(now // width)
+            slot = index % self._slots[k]
+            if self._stamps[k][slot] != index:
+                self._stamps[k][slot] = index
+                self._buckets[k][slot] = MetricStats()
+            self._buckets[k][slot].add(value)
+
+    def merge(self, other: "RollupSeries"):
+        """
+        Incorpora otra serie con los mismos niveles.
+
+        Las cubetas del mismo intervalo se combinan y, en cada posición, se
+        conserva el intervalo más reciente de los dos.
+        """
+        raw = sorted(chain(self._raw, other._raw))
+        evicted = max(self._raw_evicted, other._raw_evicted)
+        overflow = len(raw) - self._raw.maxlen
+        if overflow > 0:
+            evicted = max(evicted, raw[overflow - 1][0])
+            del raw[:overflow]
+        self._raw.clear()
+        self._raw.extend(raw)
+        self._raw_evicted = evicted
+
+        for k in range(len(self.tiers)):
+            stamps, buckets = self._stamps[k], self._buckets[k]
+            for slot, index in enumerate(other._stamps[k]):
+                if index < 0 or index < stamps[slot]:
+                    continue
+                if index > stamps[slot]:
+                    stamps[slot] = index
+                    buckets[slot] = MetricStats()
+                buckets[slot].merge(other._buckets[k][slot])
+
+    def select_tier(self, window: float, now: float) -> Optional[int]:
+        """
+        Elige el nivel que responde un rango de `window` segundos.
+
+        Returns:
+            Optional[int]: Índice en `tiers`, o None para las muestras crudas.
+        """
+        for k in range(len(self.tiers) - 1, -1, -1):
+            width, retention = self.tiers[k]
+            if retention >= window and width * 10 <= window:
+                return k
+        if window <= self.raw_window and self._raw_evicted < now - window:
+            return None
+        for k, (_, retention) in enumerate(self.tiers):
+            if retention >= window:
+                return k
+        return len(self.tiers) - 1 if self.tiers else None
+
+    def query(self, window: float, now: float) -> MetricStats:
+        """
+        Agrega las muestras de los últimos `window` segundos.
+
+        Returns:
+            MetricStats: Agregados del rango (vacío si no hay datos).
+        """
+        result = MetricStats()
+        start = now - window
+        k = self.select_tier(window, now)
+        if k is None:
+            for stamp, value in self._raw:
+                if start <= stamp <= now:
+                    result.add(value)
+            return result
+
+        width = self.tiers[k][0]
+        slots = self._slots[k]
+        last = int(now // width)
+        first = max(int(start // width), last - slots + 1)
+        stamps = self._stamps[k]
+        buckets = self._buckets[k]
+        for index in range(first, last + 1):
+            slot = index % slots
+            if stamps[slot] == index:
+                result.merge(buckets[slot])
+        return result
+
+
+class RateCounter:
+    """
+    Contador de eventos por ventana deslizante con cubetas de un segundo.
+
+    Guarda `horizon` cubetas en un buffer circular; cada cubeta recuerda a
+    qué segundo pertenece, de modo que al llegar a un segundo nuevo se
+    reinicia sola y los datos con más de `horizon` segundos caducan sin
+    tareas de limpieza. Cualquier ventana de hasta `horizon` segundos puede
+    consultarse sobre el mismo buffer.
+
+    Atributos:
+        horizon (int): Segundos máximos consultables.
+        total (int): Eventos registrados desde la creación.
+    """
+
+    def __init__(self, horizon: int = 3600, clock: Callable[[], float] = time.time):
+        """
+        Inicializa el contador.
+
+        Args:
+            horizon (int): Número de cubetas (segundos) del buffer.
+            clock (Callable[[], float]): Fuente de tiempo en segundos.
+
+        Raises:
+            ValueError: Si `horizon` < 1.
+        """
+        if horizon < 1:
+            raise ValueError("horizon debe ser al menos 1.")
+        self.horizon = horizon
+        self.clock = clock
+        self.total = 0
+        self._counts: List[int] = [0] * horizon
+        self._seconds: List[int] = [-1] * horizon
+
+    def add(self, count: int = 1, now: Optional[float] = None):
+        """Registra `count` eventos en el segundo actual, en O(1)."""
+        second = int(self.clock() if now is None else now)
+        slot = second % self.horizon
+        if self._seconds[slot] != second:
+            self._seconds[slot] = second
+            self._counts[slot] = 0
+        self._counts[slot] += count
+        self.total += count
+
+    def merge(self, other: "RateCounter"):
+        """Incorpora otro contador con el mismo `horizon`."""
+        seconds, counts = self._seconds, self._counts
+        for slot, second in enumerate(other._seconds):
+            if second < 0 or second < seconds[slot]:
+                continue
+            if second > seconds[slot]:
+                seconds[slot] = second
+                counts[slot] = 0
+            counts[slot] += other._counts[slot]
+        self.total += other.total
+
+    def count(self, window: int, now: Optional[float] = None) -> int:
+        """
+        Cuenta los eventos de los últimos `window` segundos (incluido el
+        segundo en curso), en O(window).
+
+        Raises:
+            ValueError: Si `window` no está entre 1 y `horizon`.
+        """
+        if not 1 <= window <= self.horizon:
+            raise ValueError(f"La ventana debe estar entre 1 y {self.horizon} segundos.")
+        second = int(self.clock() if now is None else now)
+        oldest = second - window
+        horizon = self.horizon
+        seconds = self._seconds
+        counts = self._counts
+        total = 0
+        for s in range(second, oldest, -1):
+            slot = s % horizon
+            if seconds[slot] == s:
+                total += counts[slot]
+        return total
+
+    def rate(self, window: int, now: Optional[float] = None) -> float:
+        """Eventos por segundo promediados en los últimos `window` segundos."""
+        return self.count(window, now) / window
+
+
+class TimerToken(NamedTuple):
+    """
+    Cronómetro en curso devuelto por `TelemetrySystem.start_timer`.
+
+    Lleva consigo el instante de inicio, así que detenerlo no requiere
+    consultar ningún estado compartido.
+
+    Atributos:
+        event (str): Evento cronometrado ("queue", "match", ...).
+        entity (Hashable): Entidad medida (ID de jugador, de partida...) o None.
+        started_ns (int): Instante de inicio según `time.perf_counter_ns()`.
+    """
+    event: str
+    entity: Optional[Hashable]
+    started_ns: int
+
+
+class _Shard:
+    """
+    Fragmento de métricas de un hilo.
+
+    Solo el hilo dueño escribe en él; el candado únicamente se disputa con
+    los lectores que combinan fragmentos, nunca entre hilos escritores.
+    """
+
+    __slots__ = ("lock", "stats", "sketches", "data", "rollups", "requests")
+
+    def __init__(self, request_horizon: int, clock: Callable[[], float]):
+        self.lock = threading.Lock()
+        self.stats: Dict[str, MetricStats] = {}
+        self.sketches: Dict[str, QuantileSketch] = {}
+        self.data: Dict[str, Deque[float]] = {}
+        self.rollups: Dict[str, RollupSeries] = {}
+        self.requests = RateCounter(horizon=request_horizon, clock=clock)
+
+
+class _ShardOwner:
+    """
+    Testigo de vida del hilo dueño de un fragmento: solo lo referencia el
+    `threading.local` del hilo, así que se libera cuando el hilo termina.
+    """
+
+    __slots__ = ("__weakref__",)
+
+
+def _retire_shard(system_ref: "weakref.ref[TelemetrySystem]", shard: _Shard):
+    """Finalizador del testigo: combina el fragmento del hilo terminado."""
+    system = system_ref()
+    if system is not None:
+        system._retire(shard)
+
 
 class TelemetrySystem:
     """
@@ -21,69 +558,319 @@ class TelemetrySystem:
     y registrar solicitudes procesadas, simulando un sistema básico de métricas
     de rendimiento para plataformas de videojuegos o aplicaciones en línea.
 
+    Es segura para hilos: cada hilo registra en su propio fragmento y las
+    lecturas (`data`, `stats`, `sketches`, `get_*`) combinan todos ellos.
+
     Atributos:
-        data (Dict[str, List[float]]):
-            Diccionario que almacena listas de métricas por tipo:
+        data (Dict[str, Deque[float]]):
+            Vista combinada de las últimas muestras crudas por tipo
+            (buffer circular de `max_samples` elementos por hilo):
             - "queue_times": tiempos de espera en cola.
             - "match_durations": duraciones de partidas.
-            - "requests_per_minute": registros de solicitudes por minuto.
 
-        start_times (Dict[str, float]):
-            Diccionario temporal que almacena el tiempo de inicio de cada evento.
+        stats (Dict[str, MetricStats]):
+            Vista combinada de los agregados incrementales de cada métrica.
+
+        sketches (Dict[str, QuantileSketch]):
+            Vista combinada de los sketches de percentiles de las métricas
+            indicadas en `sketch_metrics`.
+
+        start_times (Dict[Tuple[str, Hashable], TimerToken]):
+            Cronómetros en curso por (evento, entidad).
+
+        log (TelemetryLog | None):
+            Registro persistente opcional de todas las muestras.
     """
 
-    def __init__(self):
-        """Inicializa el sistema de telemetría con estructuras vacías para las métricas."""
-        self.data: Dict[str, List[float]] = {
-            "queue_times": [],
-            "match_durations": [],
-            "requests_per_minute": []
-        }
-        self.start_times: Dict[str, float] = {}
+    def __init__(self, max_samples: Optional[int] = DEFAULT_MAX_SAMPLES,
+                 sketch_metrics: Iterable[str] = DEFAULT_SKETCH_METRICS,
+                 sketch_alpha: float = 0.01, request_horizon: int = 3600,
+                 rollup_metrics: Iterable[str] = DEFAULT_ROLLUP_METRICS,
+                 rollup_tiers: Iterable[Tuple[int, int]] = DEFAULT_ROLLUP_TIERS,
+                 log=None, clock: Callable[[], float] = time.time):
+        """
+        Inicializa el sistema de telemetría con estructuras vacías para las métricas.
 
-    def start_timer(self, event: str):
+        Args:
+            max_samples (int, opcional): Muestras crudas conservadas por
+                métrica y por hilo. 0 desactiva las muestras crudas; None las
+                conserva todas (memoria sin límite).
+            sketch_metrics (Iterable[str]): Métricas con sketch de percentiles.
+            sketch_alpha (float): Error relativo de los sketches.
+            request_horizon (int): Segundos de historial del contador de solicitudes.
+            rollup_metrics (Iterable[str]): Métricas con agregados por intervalo.
+            rollup_tiers (Iterable[Tuple[int, int]]): Niveles (ancho de cubeta,
+                retención) en segundos de esos agregados.
+            log (TelemetryLog, opcional): Registro persistente donde se anexa
+                cada muestra registrada (ver `telemetry_log`).
+            clock (Callable[[], float]): Fuente de tiempo en segundos de las
+                solicitudes y los agregados por intervalo.
+        """
+        self.max_samples = max_samples
+        self.sketch_metrics = set(sketch_metrics)
+        self.sketch_alpha = sketch_alpha
+        self.request_horizon = request_horizon
+        self.rollup_metrics = set(rollup_metrics)
+        self.rollup_tiers = tuple(rollup_tiers)
+        self.clock = clock
+        self.start_times: Dict[Tuple[str, Optional[Hashable]], TimerToken] = {}
+        self.log = log
+
+        self._local = threading.local()
+        self._shards_lock = threading.Lock()
+        # El primer fragmento acumula los de hilos que ya terminaron
+        self._retired = _Shard(request_horizon, clock)
+        self._shards: List[_Shard] = [self._retired]
+
+    # -------------------------------------------------------
+    # Cronómetros por evento y entidad
+    # -------------------------------------------------------
+    def start_timer(self, event: str, entity: Optional[Hashable] = None) -> TimerToken:
         """
         Inicia un cronómetro para un evento determinado.
 
         Args:
             event (str): Nombre del evento que se desea cronometrar.
                          Ejemplos: "queue", "match".
+            entity (Hashable, opcional): Entidad medida (ID de jugador o de
+                partida). Cronómetros de entidades distintas no se pisan.
+
+        Returns:
+            TimerToken: Token que puede pasarse a `stop_timer()`.
         """
-        self.start_times[event] = time.time()
+        token = TimerToken(event, entity, time.perf_counter_ns())
+        self.start_times[(event, entity)] = token
+        return token
 
-    def stop_timer(self, event: str):
+    def stop_timer(self, event: Union[str, TimerToken],
+                   entity: Optional[Hashable] = None) -> float:
         """
         Detiene el cronómetro de un evento y almacena la duración registrada.
 
         Args:
-            event (str): Nombre del evento a detener.
+            event (str | TimerToken): Nombre del evento a detener, o el token
+                devuelto por `start_timer()` (en cuyo caso `entity` se ignora).
+            entity (Hashable, opcional): Entidad del cronómetro a detener.
+
+        Returns:
+            float: Duración medida en segundos.
 
         Raises:
             ValueError: Si el evento no fue iniciado previamente con `start_timer()`.
         """
-        if event not in self.start_times:
-            raise ValueError(f"No se inició el evento '{event}' antes de detenerlo.")
+        now = time.perf_counter_ns()
+        if isinstance(event, TimerToken):
+            token = event
+            key = (token.event, token.entity)
+            # Solo se descarta el registro si no lo reemplazó otro start_timer
+            if self.start_times.get(key) is token:
+                self.start_times.pop(key, None)
+        else:
+            token = self.start_times.pop((event, entity), None)
+            if token is None:
+                raise ValueError(f"No se inició el evento '{event}' antes de detenerlo.")
 
-        duration = time.time() - self.start_times[event]
+        duration = (now - token.started_ns) / 1e9
 
         # Clasificar el tipo de métrica según el evento
-        if event == "match":
-            self.data["match_durations"].append(duration)
-        elif event == "queue":
-            self.data["queue_times"].append(duration)
+        metric = EVENT_METRICS.get(token.event)
+        if metric is not None:
+            self.record(metric, duration)
+        return duration
+
+    # -------------------------------------------------------
+    # Registro de muestras
+    # -------------------------------------------------------
+    def record(self, metric: str, value: float):
+        """
+        Registra directamente una muestra de una métrica.
+
+        Permite a otros módulos (por ejemplo, el servicio de emparejamiento)
+        medir por su cuenta, jugador a jugador, sin usar los cronómetros
+        globales de `start_timer()`/`stop_timer()`.
+
+        Args:
+            metric (str): Clave de la métrica. Ejemplos: "queue_times", "match_durations".
+            value (float): Valor de la muestra.
 
-        # Eliminar evento del registro temporal
-        del self.start_times[event]
+        Raises:
+            ValueError: Si el registro persistente ya se cerró (la muestra no
+                se registra en ninguna parte).
+        """
+        # Primero el registro persistente: si está cerrado, no se toca nada
+        if self.log is not None:
+            self.log.append(metric, value)
+
+        shard = self._shard()
+        with shard.lock:
+            stats = shard.stats.get(metric)
+            if stats is None:
+                stats = shard.stats[metric] = MetricStats()
+            stats.add(value)
+
+            if metric in self.sketch_metrics:
+                sketch = shard.sketches.get(metric)
+                if sketch is None:
+                    sketch = shard.sketches[metric] = QuantileSketch(alpha=self.sketch_alpha)
+                sketch.add(value)
+
+            if self.max_samples != 0:
+                samples = shard.data.get(metric)
+                if samples is None:
+                    samples = shard.data[metric] = deque(maxlen=self.max_samples)
+                samples.append(value)
+
+            if metric in self.rollup_metrics:
+                series = shard.rollups.get(metric)
+                if series is None:
+                    series = shard.rollups[metric] = RollupSeries(self.rollup_tiers)
+                series.add(value, self.clock())
 
     def record_request(self):
         """
         Registra una nueva solicitud entrante en el sistema.
 
         Simula la captura de peticiones para medir la carga o el tráfico
-        del sistema durante un periodo de tiempo.
+        del sistema durante un periodo de tiempo. Solo incrementa la cubeta
+        del segundo actual: no guarda marcas de tiempo por solicitud.
         """
-        timestamp = time.time()
-        self.data["requests_per_minute"].append(timestamp)
+        shard = self._shard()
+        with shard.lock:
+            shard.requests.add()
+
+    def merge_sketch(self, metric: str, sketch: QuantileSketch):
+        """
+        Incorpora el sketch de otro proceso o shard a una métrica.
+
+        Args:
+            metric (str): Clave de la métrica.
+            sketch (QuantileSketch): Sketch a combinar (mismo alpha).
+        """
+        shard = self._shard()
+        with shard.lock:
+            own = shard.sketches.get(metric)
+            if own is None:
+                own = shard.sketches[metric] = QuantileSketch(alpha=sketch.alpha,
+                                                              max_buckets=sketch.max_buckets)
+            own.merge(sketch)
+
+    def track_percentiles(self, metric: str):
+        """
+        Activa el sketch de percentiles de una métrica adicional.
+
+        Solo afecta a las muestras registradas a partir de la llamada.
+
+        Args:
+            metric (str): Clave de la métrica.
+        """
+        self.sketch_metrics.add(metric)
+
+    def _shard(self) -> _Shard:
+        """
+        Fragmento del hilo actual (se crea en su primer registro). Cuando el
+        hilo termina, el fragmento se combina en el de retirados.
+        """
+        shard = getattr(self._local, "shard", None)
+        if shard is None:
+            shard = self._local.shard = _Shard(self.request_horizon, self.clock)
+            owner = self._local.owner = _ShardOwner()
+            weakref.finalize(owner, _retire_shard, weakref.ref(self), shard)
+            with self._shards_lock:
+                self._shards.append(shard)
+        return shard
+
+    def _retire(self, shard: _Shard):
+        """Combina el fragmento de un hilo terminado y lo quita de la lista."""
+        retired = self._retired
+        with self._shards_lock:
+            self._shards.remove(shard)
+            with retired.lock, shard.lock:
+                for metric, stats in shard.stats.items():
+                    retired.stats.setdefault(metric, MetricStats()).merge(stats)
+                for metric, sketch in shard.sketches.items():
+                    own = retired.sketches.get(metric)
+                    if own is None:
+                        retired.sketches[metric] = sketch
+                    else:
+                        own.merge(sketch)
+                for metric, samples in shard.data.items():
+                    own = retired.data.get(metric)
+                    if own is None:
+                        own = retired.data[metric] = deque(maxlen=self.max_samples)
+                    own.extend(samples)
+                for metric, series in shard.rollups.items():
+                    own = retired.rollups.get(metric)
+                    if own is None:
+                        retired.rollups[metric] = series
+                    else:
+                        own.merge(series)
+                retired.requests.merge(shard.requests)
+
+    # -------------------------------------------------------
+    # Lecturas combinadas
+    # -------------------------------------------------------
+    def _snapshot_shards(self) -> Iterator[_Shard]:
+        """
+        Recorre los fragmentos con la lista bloqueada, para que un retiro
+        simultáneo no haga contar un fragmento dos veces (o ninguna).
+        """
+        with self._shards_lock:
+            yield from self._shards
+
+    @property
+    def data(self) -> Dict[str, Deque[float]]:
+        """Muestras crudas de todos los hilos (copia)."""
+        merged: Dict[str, Deque[float]] = {
+            metric: deque() for metric in EVENT_METRICS.values()
+        }
+        for shard in self._snapshot_shards():
+            with shard.lock:
+                for metric, samples in shard.data.items():
+                    merged.setdefault(metric, deque()).extend(samples)
+        return merged
+
+    @property
+    def stats(self) -> Dict[str, MetricStats]:
+        """Agregados combinados de todos los hilos (copia)."""
+        merged: Dict[str, MetricStats] = {}
+        for shard in self._snapshot_shards():
+            with shard.lock:
+                for metric, stats in shard.stats.items():
+                    merged.setdefault(metric, MetricStats()).merge(stats)
+        return merged
+
+    @property
+    def sketches(self) -> Dict[str, QuantileSketch]:
+        """Sketches combinados de todos los hilos (copia)."""
+        merged = {metric: QuantileSketch(alpha=self.sketch_alpha) for metric in self.sketch_metrics}
+        for shard in self._snapshot_shards():
+            with shard.lock:
+                for metric, sketch in shard.sketches.items():
+                    if metric in merged:
+                        merged[metric].merge(sketch)
+                    else:
+                        merged[metric] = sketch.copy()
+        return merged
+
+    def _request_count(self, window: int) -> int:
+        total = 0
+        for shard in self._snapshot_shards():
+            with shard.lock:
+                total += shard.requests.count(window)
+        return total
+
+    def get_requests_per_minute(self) -> int:
+        """Solicitudes registradas en los últimos 60 segundos."""
+        return self._request_count(min(60, self.request_horizon))
+
+    def get_requests_per_second(self, window: int = 1) -> float:
+        """
+        Solicitudes por segundo promediadas en los últimos `window` segundos.
+
+        Args:
+            window (int): Tamaño de la ventana en segundos (por defecto 1).
+        """
+        return self._request_count(window) / window
 
     def get_average(self, metric: str) -> float:
         """
@@ -92,12 +879,83 @@ class TelemetrySystem:
         Args:
             metric (str): Clave de la métrica a evaluar. Puede ser:
                           "queue_times", "match_durations" o "requests_per_minute".
+                          Esta última devuelve las solicitudes del último minuto.
 
         Returns:
             float: Valor promedio de la métrica seleccionada. Retorna 0.0 si no hay datos.
         """
-        values = self.data.get(metric, [])
-        if not values:
-            return 0.0
-        return sum(values) / len(values)
+        if metric == "requests_per_minute":
+            return float(self.get_requests_per_minute())
+        stats = self.stats.get(metric)
+        return stats.mean if stats is not None else 0.0
+
+    def get_stats(self, metric: str) -> Dict[str, float]:
+        """
+        Devuelve el resumen de una métrica: conteo, media, varianza, mínimo
+        y máximo de todas las muestras registradas. El costo es O(hilos),
+        independiente del número de muestras.
+
+        Args:
+            metric (str): Clave de la métrica a consultar.
+
+        Returns:
+            Dict[str, float]: Resumen de la métrica (ceros si no hay datos).
+        """
+        return self.stats.get(metric, MetricStats()).as_dict()
+
+    def get_window_stats(self, metric: str, window: float,
+                         now: Optional[float] = None) -> Dict[str, float]:
+        """
+        Resume una métrica en los últimos `window` segundos.
+
+        Se responde con el nivel de agregación más grueso que cubre el rango
+        (ver RollupSeries); por ejemplo, 5 minutos con cubetas de 10 s y un
+        día con cubetas de 1 min.
 
+        Args:
+            metric (str): Clave de la métrica (debe estar en `rollup_metrics`).
+            window (float): Tamaño del rango en segundos.
+            now (float, opcional): Fin del rango; por defecto, `clock()`.
+
+        Returns:
+            Dict[str, float]: Conteo, media, varianza, mínimo y máximo del rango.
+
+        Raises:
+            ValueError: Si la métrica no tiene agregados o `window` no es positivo.
+        """
+        if metric not in self.rollup_metrics:
+            raise ValueError(f"La métrica '{metric}' no tiene agregados por intervalo.")
+        if window <= 0:
+            raise ValueError("La ventana debe ser positiva.")
+        now = self.clock() if now is None else now
+        merged = MetricStats()
+        for shard in self._snapshot_shards():
+            with shard.lock:
+                series = shard.rollups.get(metric)
+                if series is not None:
+                    merged.merge(series.query(window, now))
+        return merged.as_dict()
+
+    def get_percentile(self, metric: str, q: float) -> float:
+        """
+        Calcula un percentil aproximado de una métrica con sketch.
+
+        El valor devuelto tiene un error relativo de como mucho
+        `sketch_alpha` (1 % por defecto) respecto del percentil exacto.
+
+        Args:
+            metric (str): Clave de la métrica ("queue_times", "match_durations", ...).
+            q (float): Percentil entre 0 y 100 (por ejemplo 50, 95 o 99).
+
+        Returns:
+            float: Valor del percentil. Retorna 0.0 si no hay datos.
+
+        Raises:
+            ValueError: Si la métrica no tiene sketch o `q` está fuera de [0, 100].
+        """
+        sketch = self.sketches.get(metric)
+        if sketch is None:
+            raise ValueError(f"La métrica '{metric}' no tiene sketch de percentiles.")
+        if not 0 <= q <= 100:
+            raise ValueError("El percentil debe estar entre 0 y 100.")
+        return sketch.quantile(q / 100)
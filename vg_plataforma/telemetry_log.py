@@ -0,0 +1,392 @@
+# ===========================================================
+# Archivo: telemetry_log.py
+# Descripción:
+# Este módulo implementa la persistencia opcional de las
+# muestras de TelemetrySystem en un registro binario de solo
+# anexado sobre archivos mapeados en memoria (mmap).
+#
+# Cada muestra es un registro de ancho fijo (24 bytes):
+#   - id de métrica (uint32, más 4 bytes de relleno)
+#   - marca de tiempo en nanosegundos (int64)
+#   - valor (float64)
+#
+# Los registros se escriben directamente en la página mapeada,
+# sin llamadas al sistema por muestra, y el contador de la
+# cabecera se actualiza después de cada registro: si el proceso
+# cae, el sistema operativo conserva las páginas y el lector solo
+# ve registros completos. Al llenarse, el segmento se recorta a
+# su tamaño real y se abre el siguiente.
+#
+# Opcionalmente (`batch_records` > 1) cada hilo empaqueta sus
+# muestras en un búfer propio, sin tomar el candado del registro,
+# y las copia al segmento por lotes. Es algo más rápido con muchos
+# hilos, pero una caída pierde los búferes aún sin volcar (hasta
+# `batch_records` muestras por hilo). `flush()`, `close()` y el fin
+# de cada hilo vuelcan los búferes pendientes.
+#
+# Los nombres de las métricas se guardan aparte, en
+# "metrics.json", en el orden de sus ids.
+#
+# El lector carga un segmento como columnas: vistas sin copia
+# sobre el archivo con numpy si está instalado, o arreglos
+# `array` en caso contrario.
+#
+# Incluye:
+#   - Clase TelemetryLog (escritura con rotación de segmentos)
+#   - Funciones list_segments, read_metric_names y read_segment
+#
+# ===========================================================
+
+import json
+import mmap
+import os
+import struct
+import threading
+import time
+import weakref
+from array import array
+from typing import Dict, List, Optional
+
+try:
+    import numpy as np
+except ImportError:  # numpy es opcional: se usa la lectura con `array`
+    np = None
+
+
+# Cabecera: firma, versión y número de registros válidos
+_MAGIC = b"VGTL"
+_VERSION = 1
+_HEADER = struct.Struct("<4sIQ")
+_RECORD = struct.Struct("<I4xqd")
+
+# Nombre del archivo de nombres de métricas y extensión de los segmentos
+NAMES_FILE = "metrics.json"
+SEGMENT_SUFFIX = ".tlog"
+
+# Registros por segmento si no se indica otra cosa (24 MiB por segmento)
+DEFAULT_SEGMENT_RECORDS = 1 << 20
+
+# Muestras que cada hilo acumula antes de volcarlas al segmento
+# (1: cada muestra se escribe directamente)
+DEFAULT_BATCH_RECORDS = 1
+
+if np is not None:
+    RECORD_DTYPE = np.dtype({"names": ["metric", "timestamp", "value"],
+                             "formats": ["<u4", "<i8", "<f8"],
+                             "offsets": [0, 8, 16], "itemsize": _RECORD.size})
+
+
+class _Buffer:
+    """Lote de registros empaquetados de un hilo, aún sin volcar."""
+
+    __slots__ = ("data", "count", "lock")
+
+    def __init__(self, records: int):
+        self.data = bytearray(records * _RECORD.size)
+        self.count = 0
+        self.lock = threading.Lock()
+
+
+class _BufferOwner:
+    """
+    Testigo de vida del hilo dueño de un búfer: solo lo referencia el
+    `threading.local` del hilo, así que se libera cuando el hilo termina.
+    """
+
+    __slots__ = ("__weakref__",)
+
+
+def _release_buffer(log_ref: "weakref.ref[TelemetryLog]", buffer: _Buffer):
+    """Finalizador del testigo: vuelca el búfer del hilo terminado."""
+    log = log_ref()
+    if log is not None:
+        log._release(buffer)
+
+
+class TelemetryLog:
+    """
+    Registro de muestras de solo anexado, en segmentos mapeados en memoria.
+
+    Se conecta a TelemetrySystem con su parámetro `log`; cada `record()`
+    (y por tanto cada `stop_timer()`) anexa una muestra.
+
+    Atributos:
+        directory (str): Carpeta de los segmentos.
+        segment_records (int): Capacidad de cada segmento, en registros.
+        batch_records (int): Muestras por lote de cada hilo.
+        metric_ids (Dict[str, int]): Id asignado a cada métrica.
+    """
+
+    def __init__(self, directory: str, segment_records: int = DEFAULT_SEGMENT_RECORDS,
+                 batch_records: int = DEFAULT_BATCH_RECORDS):
+        """
+        Abre (o crea) el registro en una carpeta.
+
+        Si la carpeta ya contiene segmentos, se conservan y la escritura
+        continúa en un segmento nuevo.
+
+        Args:
+            directory (str): Carpeta de los segmentos.
+            segment_records (int): Registros por segmento.
+            batch_records (int): Muestras que acumula cada hilo antes de
+                volcarlas al segmento. Con 1 (por defecto) cada muestra se
+                escribe directamente y sobrevive a una caída del proceso.
+
+        Raises:
+            ValueError: Si `segment_records` o `batch_records` no son positivos.
+        """
+        if segment_records < 1 or batch_records < 1:
+            raise ValueError("segment_records y batch_records deben ser al menos 1.")
+        self.directory = directory
+        self.segment_records = segment_records
+        self.batch_records = batch_records
+        os.makedirs(directory, exist_ok=True)
+
+        names = read_metric_names(directory)
+        self.metric_ids: Dict[str, int] = {name: i for i, name in enumerate(names)}
+
+        segments = list_segments(directory)
+        self._next_index = _segment_index(segments[-1]) + 1 if segments else 0
+        # El candado protege el segmento, los ids de métrica y la lista de
+        # búferes; cada búfer tiene el suyo, que solo disputa un volcado.
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._buffers: List[_Buffer] = []
+        self._closed = False
+        self._file = None
+        self._mm: Optional[mmap.mmap] = None
+        self._count = 0
+        self._open_segment()
+
+    @property
+    def closed(self) -> bool:
+        """Indica si el registro ya se cerró."""
+        return self._closed
+
+    # -------------------------------------------------------
+    # Escritura
+    # -------------------------------------------------------
+    def append(self, metric: str, value: float, timestamp_ns: Optional[int] = None):
+        """
+        Anexa una muestra al segmento actual, rotándolo si está lleno (o al
+        búfer del hilo, volcando el lote si se llenó, con `batch_records` > 1).
+
+        Args:
+            metric (str): Nombre de la métrica.
+            value (float): Valor de la muestra.
+            timestamp_ns (int, opcional): Marca de tiempo; por defecto, la
+                hora actual (`time.time_ns()`).
+
+        Raises:
+            ValueError: Si el registro ya se cerró.
+        """
+        if self._closed:
+            raise ValueError("El registro de telemetría está cerrado.")
+        if timestamp_ns is None:
+            timestamp_ns = time.time_ns()
+        if self.batch_records == 1:
+            with self._lock:
+                if self._mm is None:
+                    raise ValueError("El registro de telemetría está cerrado.")
+                metric_id = self.metric_ids.get(metric)
+                if metric_id is None:
+                    metric_id = self._register_metric(metric)
+                if self._count == self.segment_records:
+                    self._close_segment()
+                    self._open_segment()
+                count = self._count
+                _RECORD.pack_into(self._mm, _HEADER.size + count * _RECORD.size,
+                                  metric_id, timestamp_ns, value)
+                self._count = count + 1
+                _HEADER.pack_into(self._mm, 0, _MAGIC, _VERSION, count + 1)
+            return
+        metric_id = self.metric_ids.get(metric)
+        if metric_id is None:
+            with self._lock:
+                metric_id = self.metric_ids.get(metric)
+                if metric_id is None:
+                    metric_id = self._register_metric(metric)
+        buffer = self._buffer()
+        with buffer.lock:
+            _RECORD.pack_into(buffer.data, buffer.count * _RECORD.size,
+                              metric_id, timestamp_ns, value)
+            buffer.count += 1
+            if buffer.count == self.batch_records:
+                self._drain(buffer)
+
+    def flush(self):
+        """
+        Vuelca los búferes de todos los hilos y fuerza la escritura a disco
+        de las páginas del segmento actual.
+        """
+        self._drain_all()
+        with self._lock:
+            if self._mm is not None:
+                self._mm.flush()
+
+    def close(self):
+        """
+        Vuelca los búferes pendientes y cierra el segmento actual
+        (recortándolo a su tamaño real). Las muestras que otros hilos
+        anexen a la vez que el cierre pueden descartarse.
+        """
+        self._closed = True
+        self._drain_all()
+        with self._lock:
+            self._close_segment()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    # -------------------------------------------------------
+    # Búferes por hilo
+    # -------------------------------------------------------
+    def _buffer(self) -> _Buffer:
+        """
+        Búfer del hilo actual (se crea en su primera muestra). Cuando el hilo
+        termina, el búfer se vuelca y se quita de la lista.
+        """
+        buffer = getattr(self._local, "buffer", None)
+        if buffer is None:
+            buffer = self._local.buffer = _Buffer(self.batch_records)
+            owner = self._local.owner = _BufferOwner()
+            weakref.finalize(owner, _release_buffer, weakref.ref(self), buffer)
+            with self._lock:
+                self._buffers.append(buffer)
+        return buffer
+
+    def _drain(self, buffer: _Buffer):
+        """
+        Copia el lote de un búfer al segmento (con su candado tomado),
+        rotando segmentos si hace falta. Si el registro está cerrado, el lote
+        se descarta.
+        """
+        size = _RECORD.size
+        data = memoryview(buffer.data)
+        done, total = 0, buffer.count
+        with self._lock:
+            while done < total and self._mm is not None:
+                if self._count == self.segment_records:
+                    self._close_segment()
+                    self._open_segment()
+                n = min(total - done, self.segment_records - self._count)
+                start = _HEADER.size + self._count * size
+                self._mm[start:start + n * size] = data[done * size:(done + n) * size]
+                self._count += n
+                done += n
+                _HEADER.pack_into(self._mm, 0, _MAGIC, _VERSION, self._count)
+        buffer.count = 0
+
+    def _drain_all(self):
+        """Vuelca los búferes de todos los hilos."""
+        with self._lock:
+            buffers = list(self._buffers)
+        for buffer in buffers:
+            with buffer.lock:
+                self._drain(buffer)
+
+    def _release(self, buffer: _Buffer):
+        """Vuelca el búfer de un hilo terminado y lo quita de la lista."""
+        with buffer.lock:
+            self._drain(buffer)
+        with self._lock:
+            self._buffers.remove(buffer)
+
+    # -------------------------------------------------------
+    # Segmentos y nombres de métricas
+    # -------------------------------------------------------
+    def _open_segment(self):
+        path = os.path.join(self.directory, f"segment-{self._next_index:06d}{SEGMENT_SUFFIX}")
+        self._next_index += 1
+        self._file = open(path, "w+b")
+        self._file.truncate(_HEADER.size + self.segment_records * _RECORD.size)
+        self._mm = mmap.mmap(self._file.fileno(), 0)
+        self._count = 0
+        _HEADER.pack_into(self._mm, 0, _MAGIC, _VERSION, 0)
+
+    def _close_segment(self):
+        if self._mm is None:
+            return
+        self._mm.flush()
+        self._mm.close()
+        self._file.truncate(_HEADER.size + self._count * _RECORD.size)
+        self._file.close()
+        self._mm = self._file = None
+
+    def _register_metric(self, metric: str) -> int:
+        """Asigna un id a una métrica nueva y reescribe el archivo de nombres."""
+        metric_id = self.metric_ids[metric] = len(self.metric_ids)
+        path = os.path.join(self.directory, NAMES_FILE)
+        with open(path + ".tmp", "w", encoding="utf-8") as fh:
+            json.dump(list(self.metric_ids), fh)
+        os.replace(path + ".tmp", path)
+        return metric_id
+
+
+# -----------------------------------------------------------
+# Lectura para análisis fuera de línea
+# -----------------------------------------------------------
+def _segment_index(path: str) -> int:
+    return int(os.path.basename(path)[len("segment-"):-len(SEGMENT_SUFFIX)])
+
+
+def list_segments(directory: str) -> List[str]:
+    """Rutas de los segmentos de una carpeta, en orden de escritura."""
+    if not os.path.isdir(directory):
+        return []
+    names = [n for n in os.listdir(directory)
+             if n.startswith("segment-") and n.endswith(SEGMENT_SUFFIX)]
+    return [os.path.join(directory, n) for n in sorted(names)]
+
+
+def read_metric_names(directory: str) -> List[str]:
+    """Nombres de las métricas de una carpeta; la posición es el id."""
+    path = os.path.join(directory, NAMES_FILE)
+    if not os.path.exists(path):
+        return []
+    with open(path, encoding="utf-8") as fh:
+        return json.load(fh)
+
+
+def read_segment(path: str) -> Dict[str, object]:
+    """
+    Carga un segmento como columnas "metric", "timestamp" y "value".
+
+    Con numpy, las columnas son vistas sin copia de un arreglo estructurado
+    sobre el archivo mapeado en memoria. Sin numpy, son arreglos `array`
+    ('I', 'q' y 'd') construidos recorriendo los registros.
+
+    Args:
+        path (str): Ruta del segmento.
+
+    Returns:
+        Dict[str, object]: Columnas del segmento, con un elemento por registro.
+
+    Raises:
+        ValueError: Si el archivo no es un segmento válido.
+    """
+    with open(path, "rb") as fh:
+        size = os.fstat(fh.fileno()).st_size
+        if size < _HEADER.size:
+            raise ValueError(f"'{path}' no es un segmento de telemetría.")
+        mm = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+    magic, version, count = _HEADER.unpack_from(mm, 0)
+    if magic != _MAGIC or version != _VERSION:
+        raise ValueError(f"'{path}' no es un segmento de telemetría.")
+    count = min(count, (size - _HEADER.size) // _RECORD.size)
+
+    if np is not None:
+        records = np.frombuffer(mm, dtype=RECORD_DTYPE, count=count, offset=_HEADER.size)
+        return {name: records[name] for name in RECORD_DTYPE.names}
+
+    columns = {"metric": array("I"), "timestamp": array("q"), "value": array("d")}
+    end = _HEADER.size + count * _RECORD.size
+    for metric_id, timestamp_ns, value in _RECORD.iter_unpack(mm[_HEADER.size:end]):
+        columns["metric"].append(metric_id)
+        columns["timestamp"].append(timestamp_ns)
+        columns["value"].append(value)
+    mm.close()
+    return columns
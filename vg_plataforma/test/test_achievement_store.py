@@ -0,0 +1,135 @@
+# ===========================================================
+# Archivo: test_achievement_store.py
+# Descripción:
+# Este archivo contiene las pruebas unitarias del módulo
+# "achievement_store", la persistencia del sistema de logros
+# con registro de eventos e instantáneas.
+#
+# Las pruebas validan que la recuperación (instantánea más tramo
+# final del registro) reproduzca el estado en memoria y que una
+# escritura incompleta no corrompa el registro.
+#
+# ===========================================================
+
+import os
+
+import pytest
+from achievement_store import LOG_FILE, AchievementStore
+from achievements import WIN_EVENT, AchievementSystem
+
+
+# -----------------------------------------------------------
+# Prueba 1: Recuperación con instantánea y tramo final
+# -----------------------------------------------------------
+def test_recovery_loads_snapshot_and_replays_tail(tmp_path):
+    """
+    Verifica que al reabrir el almacén se cargue la última instantánea,
+    se reprocesen solo los eventos posteriores y el estado coincida con
+    el que había en memoria.
+    """
+
+    directory = str(tmp_path)
+    with AchievementStore(directory, keep_snapshots=1) as store:
+        for i in range(12):
+            store.register_win(f"p{i % 3}")
+        store.register_loss("p0")
+        store.register_tournament_win("p1")
+        store.snapshot()
+        store.register_win("p2")
+        store.ingest([("p3", "win"), ("p1", "tournament_win")])
+        with pytest.raises(ValueError):
+            store.ingest([("p3", "empate")])
+        expected = store.system
+
+    snapshots = [n for n in os.listdir(directory) if n.startswith("snapshot-")]
+    assert len(snapshots) == 1
+
+    with AchievementStore(directory) as recovered:
+        state = recovered.system
+        assert state.win_count == expected.win_count
+        assert state.win_streak == expected.win_streak
+        assert state.tournament_wins == expected.tournament_wins
+        assert state.achievements == expected.achievements
+        assert state.holders("FIVE_WINS") == expected.holders("FIVE_WINS")
+        assert recovered.get_achievements("p3") == ["FIRST_WIN"]
+
+
+# -----------------------------------------------------------
+# Prueba 2: Escritura incompleta y reglas incompatibles
+# -----------------------------------------------------------
+def test_truncated_log_line_and_mismatched_rules(tmp_path):
+    """
+    Verifica que una última línea incompleta del registro se descarte
+    y que una instantánea no se cargue con reglas distintas.
+    """
+
+    directory = str(tmp_path)
+    with AchievementStore(directory) as store:
+        store.register_win("p1")
+        snapshot = store.system.dump_snapshot()
+    with open(os.path.join(directory, LOG_FILE), "ab") as fh:
+        fh.write(b"p2\tw")  # caída a mitad de escritura
+
+    with AchievementStore(directory) as store:
+        assert store.system.win_count == {"p1": 1}
+        store.register_win("p2")
+    with AchievementStore(directory) as store:
+        assert store.system.win_count == {"p1": 1, "p2": 1}
+
+    with pytest.raises(ValueError):
+        AchievementSystem.load_snapshot(snapshot, rules=())
+
+
+# -----------------------------------------------------------
+# Prueba 3: Última línea incompleta más larga que un bloque
+# -----------------------------------------------------------
+def test_long_truncated_tail_keeps_complete_lines(tmp_path):
+    """
+    Verifica que, si la última línea incompleta ocupa más que el bloque
+    con el que se busca el salto de línea, el registro se recorte solo
+    hasta la última línea completa y no se pierdan los eventos previos.
+    """
+
+    directory = str(tmp_path)
+    with AchievementStore(directory) as store:
+        store.register_win("p1")
+        store.register_win("p2")
+    with open(os.path.join(directory, LOG_FILE), "ab") as fh:
+        fh.write(b"x" * 10_000)  # caída a mitad de una línea muy larga
+
+    with AchievementStore(directory) as store:
+        assert store.system.win_count == {"p1": 1, "p2": 1}
+    assert os.path.getsize(os.path.join(directory, LOG_FILE)) == len(b"p1\twin\np2\twin\n")
+
+
+# -----------------------------------------------------------
+# Prueba 4: Los cambios de rating se registran y se reprocesan
+# -----------------------------------------------------------
+def test_rating_events_survive_recovery(tmp_path):
+    """
+    Verifica que los hitos de rating se registren como eventos y se
+    recuperen al reabrir el almacén, con o sin instantánea, en el mismo
+    orden de obtención.
+    """
+    from achievements import DEFAULT_RULES, RATING, RATING_EVENT, AchievementRule
+
+    rules = DEFAULT_RULES + (AchievementRule("RATING_1500", RATING, 1500),)
+    directory = str(tmp_path)
+    with AchievementStore(directory, rules=rules) as store:
+        assert store.update_rating("p1", 1600) == ["RATING_1500"]
+        store.register_win("p1")
+        store.ingest([("p2", WIN_EVENT), ("p2", (RATING_EVENT, 1550))])
+        with pytest.raises(ValueError):
+            store.update_rating("p3", 1500.5)
+        with pytest.raises(ValueError):
+            store.ingest([("p3", RATING_EVENT)])
+        expected = store.system.achievements
+
+    with AchievementStore(directory, rules=rules) as recovered:
+        assert recovered.system.achievements == expected
+        assert recovered.get_achievements("p1") == ["RATING_1500", "FIRST_WIN"]
+        assert recovered.system.best_rating == {"p1": 1600, "p2": 1550}
+        recovered.snapshot()
+        recovered.update_rating("p3", 1700)
+    with AchievementStore(directory, rules=rules) as recovered:
+        assert recovered.system.holders("RATING_1500") == ["p1", "p2", "p3"]
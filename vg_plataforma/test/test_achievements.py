@@ -62,3 +62,232 @@ def test_tournament_win_achievement():
     # Se valida que el logro 'TOURNAMENT_WIN' se haya otorgado
     assert "TOURNAMENT_WIN" in a.get_achievements("player2")
 
+
+
+# -----------------------------------------------------------
+# Prueba 4: Reglas compiladas de rachas, torneos y rating
+# -----------------------------------------------------------
+def test_compiled_rules_for_streaks_tournaments_and_rating():
+    """
+    Verifica que las reglas por umbral se otorguen al cruzar su umbral,
+    una sola vez, y que una derrota reinicie la racha.
+    """
+    from achievements import (DEFAULT_RULES, RATING, STREAK, TOURNAMENTS,
+                              AchievementRule, RuleIndex)
+
+    rules = DEFAULT_RULES + (
+        AchievementRule("STREAK_3", STREAK, 3),
+        AchievementRule("THREE_TOURNAMENTS", TOURNAMENTS, 3),
+        AchievementRule("RATING_1500", RATING, 1500),
+        AchievementRule("RATING_2000", RATING, 2000),
+    )
+    a = AchievementSystem(rules)
+
+    a.register_win("p1")
+    a.register_win("p1")
+    a.register_loss("p1")
+    assert a.register_win("p1") == []
+    a.register_win("p1")
+    assert a.register_win("p1") == ["FIVE_WINS", "STREAK_3"]
+
+    for _ in range(3):
+        a.register_tournament_win("p1")
+    assert a.get_achievements("p1").count("TOURNAMENT_WIN") == 1
+    assert "THREE_TOURNAMENTS" in a.get_achievements("p1")
+
+    # Un salto de rating cruza varios hitos a la vez; bajar no los repite
+    assert a.update_rating("p1", 2100) == ["RATING_1500", "RATING_2000"]
+    assert a.update_rating("p1", 1400) == []
+    assert a.update_rating("p1", 2200) == []
+
+    assert RuleIndex(rules).crossed(RATING, 1499, 1500) == ["RATING_1500"]
+    with pytest.raises(ValueError):
+        RuleIndex([AchievementRule("X", "losses", 1)])
+
+
+# -----------------------------------------------------------
+# Prueba 5: Almacenamiento en máscaras de bits y consultas masivas
+# -----------------------------------------------------------
+def test_bitmask_storage_and_holders():
+    """
+    Verifica que los logros se consulten en O(1) por jugador, que la
+    consulta masiva por código devuelva a sus poseedores y que la vista
+    de compatibilidad `achievements` siga entregando listas de códigos.
+    """
+
+    a = AchievementSystem()
+    a.register_tournament_win("p2")
+    a.register_win("p2")
+    a.register_win("p3")
+    a.register_tournament_win("p1")
+    a.register_tournament_win("p1")
+
+    assert a.has_achievement("p2", "TOURNAMENT_WIN")
+    assert not a.has_achievement("p3", "TOURNAMENT_WIN")
+    assert not a.has_achievement("p3", "NO_EXISTE")
+    assert a.holders("TOURNAMENT_WIN") == ["p2", "p1"]
+    assert a.holders("FIRST_WIN") == ["p2", "p3"]
+    assert a.get_achievements("p2") == ["TOURNAMENT_WIN", "FIRST_WIN"]
+    assert a.get_achievements("desconocido") == []
+    assert a.achievements == {"p2": ["TOURNAMENT_WIN", "FIRST_WIN"],
+                              "p3": ["FIRST_WIN"], "p1": ["TOURNAMENT_WIN"]}
+    with pytest.raises(ValueError):
+        a.holders("NO_EXISTE")
+
+
+# -----------------------------------------------------------
+# Prueba 6: Ingesta masiva equivalente a llamadas sucesivas
+# -----------------------------------------------------------
+def test_ingest_matches_sequential_calls():
+    """
+    Verifica que `ingest` deje el mismo estado que registrar los eventos
+    uno a uno y que devuelva los logros desbloqueados en el lote.
+    """
+    import random
+    from achievements import (DEFAULT_RULES, LOSS_EVENT, STREAK, TOURNAMENT_WIN_EVENT,
+                              WIN_EVENT, AchievementRule)
+
+    rules = DEFAULT_RULES + (AchievementRule("STREAK_3", STREAK, 3),
+                             AchievementRule("STREAK_6", STREAK, 6))
+    rng = random.Random(7)
+    kinds = [WIN_EVENT] * 6 + [LOSS_EVENT] * 3 + [TOURNAMENT_WIN_EVENT]
+    events = [(f"p{rng.randrange(20)}", rng.choice(kinds)) for _ in range(2000)]
+
+    sequential = AchievementSystem(rules)
+    calls = {WIN_EVENT: sequential.register_win, LOSS_EVENT: sequential.register_loss,
+             TOURNAMENT_WIN_EVENT: sequential.register_tournament_win}
+    for player_id, event in events[:300]:
+        calls[event](player_id)
+
+    batched = AchievementSystem(rules)
+    batched.ingest(events[:150])
+    unlocked = batched.ingest(iter(events[150:300]))
+    assert all(code in batched.get_achievements(p) for p, code in unlocked)
+
+    for system in (sequential, batched):
+        assert system.win_count and system.win_streak
+    assert batched.win_count == sequential.win_count
+    assert batched.win_streak == sequential.win_streak
+    assert batched.tournament_wins == sequential.tournament_wins
+    assert batched.achievements == sequential.achievements
+
+    with pytest.raises(ValueError):
+        batched.ingest([("p1", WIN_EVENT), ("p1", "empate")])
+    assert batched.win_count == sequential.win_count
+
+
+# -----------------------------------------------------------
+# Prueba 7: Los logros se devuelven en el orden en que se obtuvieron
+# -----------------------------------------------------------
+def test_achievements_keep_award_order():
+    """
+    Verifica que `get_achievements` devuelva los códigos en el orden en
+    que se otorgaron (no en el de definición de las reglas) y que ese
+    orden sobreviva a una instantánea.
+    """
+    a = AchievementSystem()
+    a.register_tournament_win("p1")
+    a.register_win("p1")
+    for _ in range(5):
+        a.register_win("p2")
+    a.register_tournament_win("p2")
+
+    assert a.get_achievements("p1") == ["TOURNAMENT_WIN", "FIRST_WIN"]
+    assert a.get_achievements("p2") == ["FIRST_WIN", "FIVE_WINS", "TOURNAMENT_WIN"]
+    assert a.has_achievement("p1", "FIRST_WIN") and not a.has_achievement("p1", "FIVE_WINS")
+
+    restored = AchievementSystem.load_snapshot(a.dump_snapshot())
+    assert restored.achievements == a.achievements
+    restored.register_win("p1")
+    assert restored.get_achievements("p1") == ["TOURNAMENT_WIN", "FIRST_WIN"]
+
+
+# -----------------------------------------------------------
+# Prueba 8: La ingesta otorga en el orden de los eventos
+# -----------------------------------------------------------
+def test_ingest_awards_in_event_order():
+    """
+    Verifica que `ingest` otorgue cada logro en el evento que cruza su
+    umbral: los poseedores de cada logro, el orden de los logros de cada
+    jugador y los pares devueltos coinciden con las llamadas sucesivas,
+    también cuando los jugadores se intercalan o el flujo ocupa varios
+    bloques.
+    """
+    import random
+    import achievements
+    from achievements import (DEFAULT_RULES, LOSS_EVENT, RATING, RATING_EVENT, STREAK,
+                              TOURNAMENT_WIN_EVENT, WIN_EVENT, AchievementRule)
+
+    a = AchievementSystem()
+    assert a.ingest([("a", LOSS_EVENT), ("b", WIN_EVENT), ("a", WIN_EVENT)]) == [
+        ("b", "FIRST_WIN"), ("a", "FIRST_WIN")]
+    assert a.holders("FIRST_WIN") == ["b", "a"]
+
+    rules = DEFAULT_RULES + (AchievementRule("STREAK_3", STREAK, 3),
+                             AchievementRule("RATING_1500", RATING, 1500))
+    rng = random.Random(11)
+    kinds = [WIN_EVENT] * 5 + [LOSS_EVENT] * 2 + [TOURNAMENT_WIN_EVENT, RATING_EVENT]
+    events = []
+    for _ in range(1500):
+        event = rng.choice(kinds)
+        if event == RATING_EVENT:
+            event = (RATING_EVENT, rng.randrange(1000, 1600))
+        events.append((f"p{rng.randrange(30)}", event))
+
+    sequential = AchievementSystem(rules)
+    calls = {WIN_EVENT: sequential.register_win, LOSS_EVENT: sequential.register_loss,
+             TOURNAMENT_WIN_EVENT: sequential.register_tournament_win}
+    expected = []
+    for player_id, event in events:
+        if isinstance(event, tuple):
+            codes = sequential.update_rating(player_id, event[1])
+        else:
+            codes = calls[event](player_id) or []
+        expected += [(player_id, code) for code in codes]
+
+    chunk = achievements.INGEST_CHUNK
+    achievements.INGEST_CHUNK = 100
+    try:
+        batched = AchievementSystem(rules)
+        assert batched.ingest(iter(events)) == expected
+    finally:
+        achievements.INGEST_CHUNK = chunk
+    assert batched.achievements == sequential.achievements
+    assert batched.win_streak == sequential.win_streak
+    assert batched.best_rating == sequential.best_rating
+    for code in batched.rules:
+        assert batched.holders(code) == sequential.holders(code)
+
+
+# -----------------------------------------------------------
+# Prueba 9: La ingesta respeta el desempate de la clasificación
+# -----------------------------------------------------------
+def test_ingest_keeps_leaderboard_tie_order():
+    """
+    Verifica que tras `ingest` la clasificación ordene a los empatados
+    igual que tras llamar a `register_win` evento a evento: a igual número
+    de victorias, primero quien llegó antes a ese conteo.
+    """
+    import random
+    from achievements import LOSS_EVENT, WIN_EVENT
+
+    # "a" gana primero, pero "b" llega antes a sus 2 victorias
+    a = AchievementSystem()
+    a.ingest([("a", WIN_EVENT), ("b", WIN_EVENT), ("b", WIN_EVENT), ("a", WIN_EVENT)])
+    assert a.leaderboard.top(2) == [("b", 2), ("a", 2)]
+
+    rng = random.Random(5)
+    sequential = AchievementSystem()
+    batched = AchievementSystem()
+    for _ in range(3):
+        events = [(f"p{rng.randrange(40)}", rng.choice((WIN_EVENT, WIN_EVENT, LOSS_EVENT)))
+                  for _ in range(200)]
+        for player_id, event in events:
+            if event == WIN_EVENT:
+                sequential.register_win(player_id)
+            else:
+                sequential.register_loss(player_id)
+        batched.ingest(events)
+        assert batched.leaderboard.top(40) == sequential.leaderboard.top(40)
+        for player_id in sequential.win_count:
+            assert batched.leaderboard.rank(player_id) == sequential.leaderboard.rank(player_id)
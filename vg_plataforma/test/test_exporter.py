@@ -0,0 +1,99 @@
+# ===========================================================
+# Archivo: test_exporter.py
+# Descripción:
+# Este archivo contiene las pruebas unitarias del módulo
+# "exporter", que publica las métricas de TelemetrySystem en
+# formato de texto de Prometheus desde hilos en segundo plano.
+#
+# Las pruebas validan el formato de exposición, la escritura en
+# archivo y HTTP local, y la política de descarte con el buffer
+# lleno.
+#
+# ===========================================================
+
+import urllib.request
+
+import pytest
+from exporter import DROP_NEWEST, PrometheusExporter, render_prometheus
+from telemetry import TelemetrySystem
+
+
+# -----------------------------------------------------------
+# Prueba 1: Formato de texto de Prometheus
+# -----------------------------------------------------------
+def test_render_prometheus_summary_and_gauge():
+    """
+    Verifica que cada métrica se publique como summary con cuantiles
+    (si tiene sketch), suma y conteo, y que los nombres se saneen.
+    """
+
+    t = TelemetrySystem()
+    for value in (1.0, 2.0, 3.0):
+        t.record("queue_times", value)
+    t.record("profile.matchmaking.find_matches", 0.5)
+    t.record_request()
+
+    text = render_prometheus(t)
+    assert "# TYPE vg_plataforma_queue_times summary" in text
+    assert 'vg_plataforma_queue_times{quantile="0.5"}' in text
+    assert "vg_plataforma_queue_times_sum 6.0" in text
+    assert "vg_plataforma_queue_times_count 3" in text
+    assert "vg_plataforma_profile_matchmaking_find_matches_count 1" in text
+    assert "vg_plataforma_requests_per_minute 1" in text
+    assert text.endswith("\n")
+
+
+# -----------------------------------------------------------
+# Prueba 2: Exportación a archivo y HTTP local
+# -----------------------------------------------------------
+def test_exporter_writes_file_and_serves_http(tmp_path):
+    """
+    Verifica que al detener el exportador la última instantánea quede
+    en el archivo y que el endpoint HTTP sirva el mismo texto.
+    """
+
+    t = TelemetrySystem()
+    t.record("match_durations", 42.0)
+    path = tmp_path / "metrics.prom"
+
+    exporter = PrometheusExporter(t, interval=60, path=str(path), port=0)
+    exporter.start()
+    try:
+        exporter.export_now()
+        for _ in range(200):
+            if exporter._latest:
+                break
+            exporter._stop.wait(0.01)
+        url = f"http://127.0.0.1:{exporter.port}/metrics"
+        body = urllib.request.urlopen(url, timeout=5).read().decode("utf-8")
+        assert "vg_plataforma_match_durations_count 1" in body
+    finally:
+        exporter.stop()
+
+    assert "vg_plataforma_match_durations_count 1" in path.read_text(encoding="utf-8")
+
+
+# -----------------------------------------------------------
+# Prueba 3: Política de descarte con el buffer lleno
+# -----------------------------------------------------------
+def test_exporter_drop_policies():
+    """
+    Verifica que sin hilo de salida el buffer no crezca más allá de
+    `max_pending` y que cada política descarte la instantánea adecuada.
+    """
+
+    t = TelemetrySystem()
+    oldest = PrometheusExporter(t, max_pending=2)
+    for _ in range(3):
+        assert oldest.export_now()
+    assert oldest.dropped == 1 and len(oldest._pending) == 2
+    # La más reciente ya refleja el descarte
+    assert "vg_plataforma_exporter_dropped_total 1" in oldest._pending[-1]
+
+    newest = PrometheusExporter(t, max_pending=1, drop_policy=DROP_NEWEST)
+    assert newest.export_now()
+    assert not newest.export_now()
+    assert newest.dropped == 1 and len(newest._pending) == 1
+
+    with pytest.raises(ValueError):
+        PrometheusExporter(t, drop_policy="bloquear")
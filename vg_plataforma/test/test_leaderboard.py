@@ -0,0 +1,95 @@
+# ===========================================================
+# Archivo: test_leaderboard.py
+# Descripción:
+# Este archivo contiene las pruebas unitarias del módulo
+# "leaderboard", la clasificación incremental por victorias que
+# mantiene AchievementSystem.
+#
+# Las pruebas validan el top-K y el puesto de cada jugador frente
+# a ordenar todos los conteos, tanto con victorias individuales
+# como con ingesta masiva e instantáneas.
+#
+# ===========================================================
+
+import random
+
+import pytest
+from achievements import AchievementSystem
+from leaderboard import WinsLeaderboard
+
+
+def _expected_rank(win_count, player_id):
+    return 1 + sum(1 for c in win_count.values() if c > win_count[player_id])
+
+
+# -----------------------------------------------------------
+# Prueba 1: Top-K y puesto con victorias individuales
+# -----------------------------------------------------------
+def test_leaderboard_top_and_rank():
+    """
+    Verifica el orden del top-K (empates por orden de llegada al conteo)
+    y que el puesto coincida con contar a los jugadores con más victorias.
+    """
+
+    a = AchievementSystem()
+    for player_id in ["a", "b", "b", "c", "c", "a"]:
+        a.register_win(player_id)
+
+    board = a.leaderboard
+    assert board.top(2) == [("b", 2), ("c", 2)]
+    assert board.top(10) == [("b", 2), ("c", 2), ("a", 2)]
+    assert board.rank("a") == 1 and board.rank("nadie") is None
+
+    rng = random.Random(3)
+    for _ in range(3000):
+        a.register_win(f"p{rng.randrange(200)}")
+    for player_id in ("p0", "p7", "a"):
+        assert board.rank(player_id) == _expected_rank(a.win_count, player_id)
+    ordered = sorted(a.win_count.values(), reverse=True)
+    assert [count for _, count in board.top(50)] == ordered[:50]
+
+    with pytest.raises(ValueError):
+        board.update("a", -1)
+
+
+# -----------------------------------------------------------
+# Prueba 2: Ingesta masiva e instantáneas
+# -----------------------------------------------------------
+def test_leaderboard_with_ingest_and_snapshot():
+    """
+    Verifica que la clasificación siga siendo correcta tras una ingesta
+    masiva y al reconstruirse desde una instantánea.
+    """
+
+    rng = random.Random(5)
+    events = [(f"p{rng.randrange(500)}", "win") for _ in range(20000)]
+    a = AchievementSystem()
+    a.ingest(events)
+    restored = AchievementSystem.load_snapshot(a.dump_snapshot())
+
+    for system in (a, restored):
+        board = system.leaderboard
+        assert len(board) == len(a.win_count)
+        assert [c for _, c in board.top(20)] == sorted(a.win_count.values(), reverse=True)[:20]
+        for player_id in ("p1", "p99", "p250"):
+            assert board.rank(player_id) == _expected_rank(a.win_count, player_id)
+
+    # Conteos altos amplían el árbol sin perder los existentes
+    board = WinsLeaderboard.from_counts({"x": 3, "y": 1})
+    board.update("y", 1000)
+    assert board.top(2) == [("y", 1000), ("x", 3)] and board.rank("x") == 2
+    board.update("y", 0)
+    assert board.top(5) == [("x", 3)] and len(board) == 1
+
+    # Actualizar en bloque equivale a actualizar uno a uno, en orden
+    one = WinsLeaderboard.from_counts({"x": 3, "y": 1})
+    bulk = WinsLeaderboard.from_counts({"x": 3, "y": 1})
+    changes = {"z": 3, "y": 40, "x": 0, "w": 3}
+    for player_id, count in changes.items():
+        one.update(player_id, count)
+    bulk.update_many(changes)
+    assert bulk.top(10) == one.top(10) == [("y", 40), ("z", 3), ("w", 3)]
+    assert bulk.rank("w") == one.rank("w") == 2
+    with pytest.raises(ValueError):
+        bulk.update_many({"v": 2, "y": -1})
+    assert bulk.top(10) == one.top(10)
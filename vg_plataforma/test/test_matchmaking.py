@@ -13,7 +13,7 @@
 # ===========================================================
 
 import pytest
-from matchmaking import Matchmaker, Player
+from matchmaking import Matchmaker, Player, RatingWindow
 
 
 # -----------------------------------------------------------
@@ -79,3 +79,159 @@ def test_rating_update_after_game():
 
     # El rating del perdedor debe disminuir
     assert new_r2 < 1200, "El rating del jugador perdedor no disminuyó correctamente."
+
+
+# -----------------------------------------------------------
+# Prueba 3: Emparejamiento por índice ordenado y desempate
+# -----------------------------------------------------------
+def test_find_matches_uses_rating_order_and_tie_rule():
+    """
+    Verifica que el emparejamiento siga el orden de rating (y no el de
+    llegada) y que, con cola impar, quede en espera el jugador cuya
+    exclusión minimiza la diferencia total (a igualdad, el más reciente).
+    """
+
+    m = Matchmaker()
+
+    # Se encolan jugadores en un orden distinto al de su rating
+    for pid, rating in [("a", 1500), ("b", 1000), ("c", 1510), ("d", 1005)]:
+        m.enqueue(Player(id=pid, rating=rating))
+
+    pairs = {frozenset((x.id, y.id)) for x, y in m.find_matches()}
+    assert pairs == {frozenset(("b", "d")), frozenset(("a", "c"))}
+
+    # Con tres jugadores, excluir a 'x' o a 'z' cuesta lo mismo (10):
+    # queda en cola 'x', que llegó después que 'z'.
+    for pid, rating in [("z", 1020), ("x", 1000), ("y", 1010)]:
+        m.enqueue(Player(id=pid, rating=rating))
+
+    matches = m.find_matches()
+    assert [(a.id, b.id) for a, b in matches] == [("y", "z")]
+    assert [p.id for p in m.queue] == ["x"]
+
+
+# -----------------------------------------------------------
+# Prueba 4: Modo incremental con ventana que se amplía
+# -----------------------------------------------------------
+def test_incremental_enqueue_and_widening_window():
+    """
+    Verifica que en modo incremental `enqueue` empareje en el acto a
+    jugadores compatibles y que `tick` empareje a los que quedaron fuera
+    cuando sus ventanas se amplían con el tiempo de espera.
+    """
+
+    window = RatingWindow(base=50, step=50, interval=10.0, maximum=200)
+    m = Matchmaker(window=window)
+
+    # Sin rivales cercanos, ambos quedan en cola (diferencia 120 > 50)
+    assert m.enqueue(Player(id="p1", rating=1200), now=0.0) is None
+    assert m.enqueue(Player(id="p2", rating=1320), now=0.0) is None
+
+    # Un tercero dentro de la ventana de p1 se empareja de inmediato
+    match = m.enqueue(Player(id="p3", rating=1230), now=1.0)
+    assert match is not None
+    assert (match[0].id, match[1].id) == ("p1", "p3")
+
+    # p4 llega tarde; a los 20 s p2 acepta 150, pero p4 solo 50 (espera 5 s)
+    assert m.enqueue(Player(id="p4", rating=1450), now=15.0) is None
+    assert m.tick(now=20.0) == []
+
+    # A los 35 s p4 ya acepta 150 (espera 20 s) y p2 acepta 200
+    matches = m.tick(now=35.0)
+    assert [(a.id, b.id) for a, b in matches] == [("p2", "p4")]
+    assert m.queue == []
+
+
+# -----------------------------------------------------------
+# Prueba 5: Actualización de ratings por lotes
+# -----------------------------------------------------------
+def test_batch_rating_update_matches_scalar():
+    """
+    Verifica que la actualización por lotes produzca exactamente los mismos
+    ratings que la versión escalar, y que el modo secuencial encadene los
+    ratings de un jugador que aparece en varias partidas del lote.
+    """
+
+    m = Matchmaker()
+    ratings = [1200, 1500, 980, 2100, 1337, 1200]
+    opponents = [1200, 1210, 1450, 1700, 1337, 1800]
+    outcomes = [1.0, 0.0, 1.0, 0.0, 1.0, 1.0]
+
+    new1, new2 = m.update_ratings_batch(ratings, opponents, outcomes)
+    assert type(new1) is list and type(new2) is list
+    for i, (r1, r2, s1) in enumerate(zip(ratings, opponents, outcomes)):
+        winner = "a" if s1 == 1.0 else "b"
+        expected = m.update_ratings(Player("a", r1), Player("b", r2), winner_id=winner)
+        assert (new1[i], new2[i]) == expected
+
+    # Modo secuencial: 'x' juega dos partidas seguidas dentro del lote
+    seq1, seq2 = m.update_ratings_batch(
+        [1200, 1200], [1200, 1300], [1.0, 1.0],
+        player_ids=["x", "x"], opponent_ids=["y", "z"],
+    )
+    first, _ = m.update_ratings(Player("x", 1200), Player("y", 1200), winner_id="x")
+    second, third = m.update_ratings(Player("x", first), Player("z", 1300), winner_id="x")
+    assert seq1 == [first, second]
+    assert seq2[1] == third
+
+    with pytest.raises(ValueError):
+        m.update_ratings_batch([1200], [1200], [0.5])
+
+
+# -----------------------------------------------------------
+# Prueba 6: Abandono de la cola y reingreso
+# -----------------------------------------------------------
+def test_dequeue_is_queued_and_requeue():
+    """
+    Verifica que un jugador pueda abandonar la cola sin afectar a los
+    demás, que `is_queued` refleje su estado y que `requeue` conserve
+    su tiempo de espera al actualizar su rating.
+    """
+
+    m = Matchmaker(window=RatingWindow(base=10, step=100, interval=10.0, maximum=500))
+    m.enqueue(Player(id="p1", rating=1200), now=0.0)
+    m.enqueue(Player(id="p2", rating=1500), now=0.0)
+    assert m.is_queued("p1") and m.is_queued("p2")
+
+    # No se permite encolar dos veces al mismo jugador
+    with pytest.raises(ValueError):
+        m.enqueue(Player(id="p1", rating=1200))
+
+    # p2 cancela: deja de estar en cola y no puede ser emparejado
+    assert m.dequeue("p2").id == "p2"
+    assert m.dequeue("p2") is None
+    assert not m.is_queued("p2")
+    assert m.enqueue(Player(id="p3", rating=1500), now=1.0) is None
+
+    # p1 vuelve con otro rating conservando su instante de entrada (0 s):
+    # a los 10 s su ventana ya es 110 y acepta a p3 (diferencia 100), pero
+    # la de p3 (espera 9 s) sigue en 10; a los 11 s ambas lo aceptan.
+    assert m.requeue(Player(id="p1", rating=1400), now=5.0) is None
+    assert m.tick(now=10.0) == []
+    matches = m.tick(now=11.0)
+    assert [(a.id, b.id) for a, b in matches] == [("p1", "p3")]
+    assert not m.is_queued("p1") and m.queue == []
+
+
+# -----------------------------------------------------------
+# Prueba 7: Ratings por lotes con NumPy (dependencia opcional)
+# -----------------------------------------------------------
+def test_batch_rating_update_with_numpy_returns_lists(monkeypatch):
+    """
+    Con NumPy instalado, verifica que la ruta vectorizada devuelva listas
+    de enteros idénticas a las de la ruta en Python puro.
+    """
+    pytest.importorskip("numpy")
+    import random
+    import matchmaking
+
+    rng = random.Random(3)
+    ratings = [rng.randrange(800, 2400) for _ in range(500)]
+    opponents = [rng.randrange(800, 2400) for _ in range(500)]
+    outcomes = [rng.choice((0.0, 1.0)) for _ in range(500)]
+
+    m = Matchmaker()
+    vectorized = m.update_ratings_batch(ratings, opponents, outcomes)
+    monkeypatch.setattr(matchmaking, "np", None)
+    assert vectorized == m.update_ratings_batch(ratings, opponents, outcomes)
+    assert all(type(r) is int for r in vectorized[0] + vectorized[1])
@@ -0,0 +1,137 @@
+# ===========================================================
+# Archivo: test_matchmaking_service.py
+# Descripción:
+# Este archivo contiene las pruebas unitarias del módulo
+# "matchmaking_service", el bucle asíncrono (asyncio) que
+# agrupa solicitudes de emparejamiento en ticks.
+#
+# Las pruebas validan la entrega de emparejamientos a los
+# clientes que esperan, la cancelación, la backpressure de la
+# cola de solicitudes y el registro del tiempo en cola.
+#
+# ===========================================================
+
+import asyncio
+import pytest
+from matchmaking import Player
+from matchmaking_service import MatchmakingService
+from telemetry import TelemetrySystem
+
+
+# -----------------------------------------------------------
+# Prueba 1: Entrega de emparejamientos y telemetría
+# -----------------------------------------------------------
+def test_service_delivers_matches_and_records_queue_time():
+    """
+    Verifica que dos jugadores encolados de forma asíncrona reciban el
+    mismo emparejamiento, que un jugador que cancela vea su espera
+    cancelada y que el tiempo en cola se registre por jugador.
+    """
+
+    async def scenario():
+        telemetry = TelemetrySystem()
+        async with MatchmakingService(telemetry=telemetry, tick_interval=0.01) as service:
+            f1 = await service.submit(Player(id="p1", rating=1200))
+            f3 = await service.submit(Player(id="p3", rating=1800))
+            await service.cancel("p3")
+            f2 = await service.submit(Player(id="p2", rating=1210))
+
+            match = await asyncio.wait_for(f1, timeout=1.0)
+            assert await f2 is match
+            assert {p.id for p in match} == {"p1", "p2"}
+            with pytest.raises(asyncio.CancelledError):
+                await f3
+        return telemetry
+
+    telemetry = asyncio.run(scenario())
+
+    # Se registró un tiempo en cola por cada jugador emparejado
+    assert len(telemetry.data["queue_times"]) == 2
+
+
+# -----------------------------------------------------------
+# Prueba 2: Backpressure de la cola de solicitudes
+# -----------------------------------------------------------
+def test_service_applies_backpressure_when_intake_is_full():
+    """
+    Verifica que, con la cola de solicitudes llena, un nuevo envío
+    espere hasta que un tick libere espacio.
+    """
+
+    async def scenario():
+        service = MatchmakingService(max_pending=1)
+        await service.submit(Player(id="p1", rating=1200))
+
+        # La cola de solicitudes está llena: el segundo envío no avanza
+        blocked = asyncio.ensure_future(service.submit(Player(id="p2", rating=1200)))
+        await asyncio.sleep(0.01)
+        assert not blocked.done()
+
+        # Un tick consume la solicitud pendiente y libera espacio
+        service.process_tick()
+        await asyncio.wait_for(blocked, timeout=1.0)
+
+    asyncio.run(scenario())
+
+
+# -----------------------------------------------------------
+# Prueba 3: Espera cancelada y errores en un tick
+# -----------------------------------------------------------
+def test_service_cancelled_wait_leaves_queue_and_loop_survives_errors():
+    """
+    Verifica que un cliente que deja de esperar (timeout) salga de la
+    cola, de modo que el siguiente jugador no quede emparejado con él, y
+    que un error dentro de un tick no detenga el bucle del servicio.
+    """
+
+    async def scenario():
+        async with MatchmakingService(tick_interval=0.01) as service:
+            with pytest.raises(asyncio.TimeoutError):
+                await asyncio.wait_for(service.enqueue(Player(id="ghost", rating=1200)), 0.05)
+            assert not service.matchmaker.is_queued("ghost")
+
+            # Un tick que falla una vez no detiene el bucle
+            original = service.process_tick
+            failures = []
+
+            def flaky_tick():
+                if not failures:
+                    failures.append(True)
+                    raise RuntimeError("fallo simulado")
+                return original()
+
+            service.process_tick = flaky_tick
+            await asyncio.sleep(0.03)
+            assert failures
+
+            f1 = await service.submit(Player(id="real", rating=1210))
+            f2 = await service.submit(Player(id="other", rating=1220))
+            match = await asyncio.wait_for(f1, timeout=1.0)
+            assert await f2 is match
+            assert {p.id for p in match} == {"real", "other"}
+
+    asyncio.run(scenario())
+
+
+# -----------------------------------------------------------
+# Prueba 4: El tiempo en cola cuenta desde el envío
+# -----------------------------------------------------------
+def test_service_queue_time_starts_at_submit():
+    """
+    Verifica que el tiempo en cola se mida desde `submit`, no desde el
+    tick que aplica la solicitud.
+    """
+    now = [1.0]
+
+    async def scenario():
+        telemetry = TelemetrySystem()
+        service = MatchmakingService(telemetry=telemetry, clock=lambda: now[0])
+        await service.submit(Player(id="p1", rating=1200))
+        now[0] = 3.0
+        await service.submit(Player(id="p2", rating=1210))
+        now[0] = 10.0
+        assert len(service.process_tick()) == 1
+        return telemetry
+
+    telemetry = asyncio.run(scenario())
+    assert sorted(telemetry.data["queue_times"]) == [7.0, 9.0]
@@ -0,0 +1,112 @@
+# ===========================================================
+# Archivo: test_player_store.py
+# Descripción:
+# Este archivo contiene las pruebas unitarias del módulo
+# "player_store", el almacén compacto de jugadores en cola
+# que el Matchmaker puede usar en lugar de objetos Player.
+#
+# Las pruebas validan que el Matchmaker produzca los mismos
+# emparejamientos con el almacén compacto que con su cola
+# por defecto, incluso después de compactar las ranuras.
+#
+# ===========================================================
+
+import random
+import pytest
+from matchmaking import Matchmaker, Player, RatingWindow
+from player_store import PlayerStore
+
+
+# -----------------------------------------------------------
+# Prueba 1: Mismos emparejamientos que la cola por defecto
+# -----------------------------------------------------------
+def test_compact_store_matches_default_queue():
+    """
+    Verifica que, para la misma secuencia de jugadores, el Matchmaker
+    con PlayerStore forme exactamente los mismos pares que el Matchmaker
+    por defecto, y que el almacén se compacte tras cada emparejamiento.
+    """
+
+    rng = random.Random(7)
+    window = RatingWindow(base=20, step=20, interval=1.0, maximum=200)
+    plain = Matchmaker(window=window)
+    store = PlayerStore()
+    compact = Matchmaker(window=window, store=store)
+
+    def ids(matches):
+        return [(a.id, b.id) for a, b in matches]
+
+    for i in range(300):
+        player = Player(id=f"p{i}", rating=rng.randint(1000, 1400))
+        now = i * 0.1
+        a = plain.enqueue(player, now=now)
+        b = compact.enqueue(player, now=now)
+        assert (a and (a[0].id, a[1].id)) == (b and (b[0].id, b[1].id))
+        if i % 50 == 49:
+            assert ids(plain.tick(now=now)) == ids(compact.tick(now=now))
+
+    assert [p.id for p in plain.queue] == [p.id for p in compact.queue]
+    assert ids(plain.find_matches()) == ids(compact.find_matches())
+
+    # Tras vaciar la cola el almacén no conserva ranuras muertas
+    assert len(store) <= 1 and store.dead == 0
+
+
+# -----------------------------------------------------------
+# Prueba 2: Compactación durante un tick
+# -----------------------------------------------------------
+def test_compact_store_tick_across_compaction():
+    """
+    Verifica que un tick que forma muchos pares (y, por lo tanto,
+    compacta el almacén a mitad del recorrido de la agenda) entregue los
+    mismos emparejamientos que el Matchmaker por defecto.
+    """
+
+    rng = random.Random(3)
+    window = RatingWindow(base=0, step=10, interval=1.0, maximum=400)
+    plain = Matchmaker(window=window)
+    store = PlayerStore()
+    compact = Matchmaker(window=window, store=store)
+
+    for i in range(200):
+        player = Player(id=f"p{i}", rating=rng.randint(1000, 1400))
+        plain.enqueue(player, now=0.0)
+        compact.enqueue(player, now=0.0)
+
+    for t in range(1, 30):
+        expected = [(a.id, b.id) for a, b in plain.tick(now=float(t))]
+        assert [(a.id, b.id) for a, b in compact.tick(now=float(t))] == expected
+
+    assert [p.id for p in plain.queue] == [p.id for p in compact.queue]
+    assert store.dead <= len(store)
+
+
+# -----------------------------------------------------------
+# Prueba 3: Búsqueda por ID dentro del almacén
+# -----------------------------------------------------------
+def test_compact_store_lookup_by_id():
+    """
+    Verifica que `is_queued`, `dequeue` y `requeue` funcionen con la
+    búsqueda ID → ranura del propio almacén (sin diccionario aparte en
+    el Matchmaker), también tras varias compactaciones.
+    """
+
+    store = PlayerStore()
+    m = Matchmaker(store=store)
+    assert m._slots is None
+
+    for i in range(100):
+        m.enqueue(Player(id=f"p{i}", rating=1000 + i))
+    for i in range(0, 100, 2):
+        assert m.dequeue(f"p{i}").id == f"p{i}"
+    assert m.dequeue("p0") is None
+    assert m.dequeue("nadie") is None
+
+    assert [m.is_queued(f"p{i}") for i in range(6)] == [False, True] * 3
+    m.requeue(Player(id="p1", rating=1500))
+    m.enqueue(Player(id="p0", rating=1001))
+    with pytest.raises(ValueError):
+        m.enqueue(Player(id="p3", rating=1003))
+
+    assert store.slot_of("p1") is not None and m.is_queued("p0")
+    assert len(m.queue) == 51
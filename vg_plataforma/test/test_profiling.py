@@ -0,0 +1,114 @@
+# ===========================================================
+# Archivo: test_profiling.py
+# Descripción:
+# Este archivo contiene las pruebas unitarias del módulo
+# "profiling", la instrumentación de bajo costo de los puntos
+# calientes de emparejamiento, torneos y logros.
+#
+# Las pruebas validan que las llamadas se cuenten solo con la
+# instrumentación activa y que el reporte resuma las latencias
+# de cada función instrumentada.
+#
+# ===========================================================
+
+import pytest
+import profiling
+from achievements import AchievementSystem
+from matchmaking import Matchmaker, Player
+from telemetry import TelemetrySystem
+
+
+@pytest.fixture(autouse=True)
+def _reset_profiling():
+    """Deja la instrumentación global sin activar ni telemetría tras cada prueba."""
+    yield
+    profiling.reset()
+
+
+# -----------------------------------------------------------
+# Prueba 1: Conteo de llamadas y reporte por función
+# -----------------------------------------------------------
+def test_profiling_counts_calls_only_when_enabled():
+    """
+    Verifica que con la instrumentación desactivada no se registre nada
+    y que, al activarla, el reporte incluya llamadas y percentiles de
+    latencia de cada punto instrumentado.
+    """
+
+    m = Matchmaker()
+    a = AchievementSystem()
+    telemetry = TelemetrySystem(max_samples=0)
+
+    # Desactivada: las llamadas no dejan rastro
+    profiling.disable()
+    m.find_matches()
+    a.register_win("p1")
+
+    profiling.enable(telemetry)
+    try:
+        for _ in range(3):
+            m.enqueue(Player("x", 1200))
+            m.enqueue(Player("y", 1210))
+            m.find_matches()
+        a.register_win("p1")
+        m.update_ratings(Player("x", 1200), Player("y", 1210), winner_id="x")
+    finally:
+        profiling.disable()
+
+    summary = profiling.report()
+    assert summary["matchmaking.find_matches"]["calls"] == 3
+    assert summary["achievements.register_win"]["calls"] == 1
+    assert summary["matchmaking.update_ratings"]["calls"] == 1
+    assert "tournament.advance_round" not in summary
+
+    entry = summary["matchmaking.find_matches"]
+    assert 0 < entry["p50"] <= entry["p99"] * 1.01
+    assert "matchmaking.find_matches" in profiling.format_report()
+
+
+# -----------------------------------------------------------
+# Prueba 2: Reinicio del estado global
+# -----------------------------------------------------------
+def test_reset_forgets_telemetry():
+    """
+    Verifica que `disable()` conserve las métricas para el reporte y que
+    `reset()` las olvide, de modo que el siguiente `enable()` empiece de cero.
+    """
+    telemetry = profiling.enable(TelemetrySystem(max_samples=0))
+    Matchmaker().find_matches()
+    profiling.disable()
+    assert profiling.report()["matchmaking.find_matches"]["calls"] == 1
+
+    profiling.reset()
+    assert not profiling.is_enabled() and profiling.report() == {}
+    assert profiling.enable() is not telemetry
+    assert profiling.report() == {}
+
+
+# -----------------------------------------------------------
+# Prueba 3: Reinicio durante una medición
+# -----------------------------------------------------------
+def test_reset_during_measurement_is_safe():
+    """
+    Verifica que un `reset()` mientras una función o un bloque se están
+    midiendo no falle: la medición va al sistema activo al entrar.
+    """
+    telemetry = profiling.enable(TelemetrySystem(max_samples=0))
+
+    @profiling.profiled("test.reset_inside")
+    def resets():
+        profiling.reset()
+
+    resets()
+    assert telemetry.stats[profiling.METRIC_PREFIX + "test.reset_inside"].count == 1
+
+    telemetry = profiling.enable(TelemetrySystem(max_samples=0))
+    with profiling.profile_block("test.reset_block"):
+        profiling.reset()
+    assert telemetry.stats[profiling.METRIC_PREFIX + "test.reset_block"].count == 1
+
+    # Tras el reinicio no se mide nada
+    resets()
+    with profiling.profile_block("test.reset_block"):
+        pass
+    assert profiling.report() == {}
@@ -0,0 +1,74 @@
+# ===========================================================
+# Archivo: test_sharded_matchmaking.py
+# Descripción:
+# Este archivo contiene las pruebas unitarias del módulo
+# "sharded_matchmaking", que reparte la cola en franjas de
+# rating solapadas y las empareja en un pool de procesos.
+#
+# Las pruebas validan que nadie se empareje dos veces, que las
+# regiones no se mezclen y que la calidad sea comparable a la
+# del Matchmaker de una sola instancia.
+#
+# ===========================================================
+
+import random
+from concurrent.futures import ThreadPoolExecutor
+
+from matchmaking import Matchmaker, Player
+from sharded_matchmaking import ShardedMatchmaker
+
+
+# -----------------------------------------------------------
+# Prueba 1: Conciliación de franjas en un pool de procesos
+# -----------------------------------------------------------
+def test_sharded_matches_each_player_once_with_comparable_quality():
+    """
+    Verifica que el emparejador particionado, ejecutado en un pool de
+    procesos, empareje a cada jugador como mucho una vez, forme tantos
+    pares como la versión de una sola instancia y mantenga una
+    diferencia de rating total comparable.
+    """
+
+    rng = random.Random(3)
+    players = [Player(id=f"p{i}", rating=rng.randint(900, 2100)) for i in range(2001)]
+
+    single = Matchmaker()
+    for p in players:
+        single.enqueue(p)
+    baseline = single.find_matches()
+
+    with ShardedMatchmaker(band_width=150, overlap=30, max_workers=2) as sharded:
+        for p in players:
+            sharded.enqueue(p)
+        matches = sharded.find_matches()
+
+        ids = [pid for a, b in matches for pid in (a.id, b.id)]
+        assert len(ids) == len(set(ids)), "Un jugador fue emparejado dos veces."
+        assert len(matches) == len(baseline)
+        assert len(sharded.queue) == 1
+
+    def total_gap(pairs):
+        return sum(abs(a.rating - b.rating) for a, b in pairs)
+
+    assert total_gap(matches) <= 2 * total_gap(baseline) + 100
+
+
+# -----------------------------------------------------------
+# Prueba 2: Las regiones no se mezclan
+# -----------------------------------------------------------
+def test_sharded_keeps_regions_apart():
+    """
+    Verifica que jugadores de regiones distintas nunca se emparejen,
+    aunque tengan el mismo rating.
+    """
+
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        sharded = ShardedMatchmaker(executor=pool)
+        sharded.enqueue(Player(id="eu1", rating=1500), region="eu")
+        sharded.enqueue(Player(id="na1", rating=1500), region="na")
+        sharded.enqueue(Player(id="eu2", rating=1700), region="eu")
+
+        matches = sharded.find_matches()
+
+    assert [(a.id, b.id) for a, b in matches] == [("eu1", "eu2")]
+    assert sharded.is_queued("na1")
@@ -0,0 +1,100 @@
+# ===========================================================
+# Archivo: test_swiss.py
+# Descripción:
+# Este archivo contiene las pruebas unitarias del módulo
+# "swiss", que implementa el formato de torneo suizo.
+#
+# Se valida el emparejamiento por grupos de puntuación (con el
+# rating como desempate), la ausencia de revanchas entre rondas
+# y el manejo de pases libres y resultados.
+#
+# ===========================================================
+
+import pytest
+from matchmaking import Player
+from swiss import SwissTournament
+
+
+# -----------------------------------------------------------
+# Prueba 1: Emparejamiento por puntuación y cercanía de rating
+# -----------------------------------------------------------
+def test_swiss_pairs_by_score_then_rating():
+    """
+    Verifica que la primera ronda empareje ratings cercanos y que la
+    segunda enfrente a ganadores con ganadores y perdedores con perdedores.
+    """
+    t = SwissTournament('s1')
+    for player_id, rating in [("a", 1000), ("b", 1010), ("c", 1500),
+                              ("d", 1520), ("e", 2000), ("f", 2030)]:
+        t.register(Player(player_id, rating))
+
+    first = t.pair_round()
+    assert sorted(first) == [("a", "b"), ("c", "d"), ("e", "f")]
+
+    # Ganan b, c y f: quedan dos grupos de puntuación
+    for a, b, winner in [("a", "b", "b"), ("c", "d", "c"), ("e", "f", "f")]:
+        t.set_result(a, b, winner)
+    second = t.pair_round()
+
+    winners, losers = {"b", "c", "f"}, {"a", "d", "e"}
+    pairs = [set(pair) for pair in second]
+    assert sum(pair <= winners for pair in pairs) == 1
+    assert sum(pair <= losers for pair in pairs) == 1
+    assert not set(map(frozenset, first)) & set(map(frozenset, second))
+
+
+# -----------------------------------------------------------
+# Prueba 2: Sin revanchas, un pase libre por jugador
+# -----------------------------------------------------------
+def test_swiss_no_rematches_and_byes():
+    """
+    Con 5 jugadores y 5 rondas (todos contra todos más un pase libre cada
+    uno), ningún par se repite y cada jugador recibe exactamente un pase.
+    """
+    t = SwissTournament('s2')
+    for i in range(5):
+        t.register(Player(f"p{i}", 1200 + 10 * i))
+
+    seen, byes = set(), []
+    for _ in range(5):
+        for a, b in t.pair_round():
+            if b is None:
+                byes.append(a)
+                continue
+            key = tuple(sorted((a, b)))
+            assert key not in seen
+            seen.add(key)
+            t.set_result(a, b, None)
+
+    assert len(seen) == 10
+    assert sorted(byes) == [f"p{i}" for i in range(5)]
+    # 4 empates (2 puntos) más el pase libre (1 punto) para cada uno
+    assert all(score == 3.0 for _, score in t.standings())
+
+    # Ya no quedan rivales posibles
+    with pytest.raises(ValueError):
+        t.pair_round()
+
+
+# -----------------------------------------------------------
+# Prueba 3: Validación de resultados
+# -----------------------------------------------------------
+def test_swiss_result_validation():
+    """
+    Verifica que no se pueda emparejar con resultados pendientes ni
+    registrar resultados de partidos inexistentes o ganadores ajenos.
+    """
+    t = SwissTournament('s3')
+    for player_id in ("a", "b", "c", "d"):
+        t.register(player_id)
+    (a, b), _ = t.pair_round()
+
+    with pytest.raises(ValueError):
+        t.pair_round()
+    with pytest.raises(ValueError):
+        t.set_result(a, b, "x")
+
+    t.set_result(a, b, a)
+    with pytest.raises(ValueError):
+        t.set_result(a, b, a)
+    assert t.scores[a] == 1.0
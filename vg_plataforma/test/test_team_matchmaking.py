@@ -0,0 +1,63 @@
+# ===========================================================
+# Archivo: test_team_matchmaking.py
+# Descripción:
+# Este archivo contiene las pruebas unitarias del módulo
+# "team_matchmaking", encargado de formar partidas por equipos
+# con grupos prearmados (parties).
+#
+# Las pruebas validan que los grupos se mantengan juntos, que
+# los equipos queden equilibrados en rating y que la
+# actualización de ratings por equipo siga la fórmula ELO.
+#
+# ===========================================================
+
+from matchmaking import Player
+from team_matchmaking import TeamMatchmaker
+
+
+# -----------------------------------------------------------
+# Prueba 1: Formación de equipos equilibrados con grupos
+# -----------------------------------------------------------
+def test_team_matches_keep_parties_together_and_balance():
+    """
+    Verifica que en un 3v3 los miembros de un grupo queden en el mismo
+    equipo y que la diferencia de rating medio entre equipos sea mínima.
+    """
+
+    tm = TeamMatchmaker(team_size=3)
+    tm.enqueue_party([Player("a1", 1500), Player("a2", 1500)], party_id="duo")
+    for pid, rating in [("s1", 1400), ("s2", 1600), ("s3", 1450), ("s4", 1550)]:
+        tm.enqueue(Player(pid, rating))
+
+    matches = tm.find_team_matches()
+    assert len(matches) == 1
+    team_a, team_b = matches[0]
+    assert len(team_a) == len(team_b) == 3
+
+    # El dúo juega junto
+    ids_a = {p.id for p in team_a}
+    assert {"a1", "a2"} <= ids_a or not ({"a1", "a2"} & ids_a)
+
+    # El dúo (3000) solo admite un compañero de 1400 a 1600: la menor
+    # diferencia posible entre sumas es 100 (4450 contra 4550)
+    assert abs(sum(p.rating for p in team_a) - sum(p.rating for p in team_b)) == 100
+    assert tm.parties == {}
+
+
+# -----------------------------------------------------------
+# Prueba 2: Actualización de ratings por equipo
+# -----------------------------------------------------------
+def test_team_rating_update():
+    """
+    Verifica que el equipo ganador suba y el perdedor baje la misma
+    cantidad en cada miembro, conservando las diferencias internas.
+    """
+
+    tm = TeamMatchmaker(team_size=2)
+    team_a = [Player("a", 1200), Player("b", 1300)]
+    team_b = [Player("c", 1250), Player("d", 1250)]
+
+    new_a, new_b = tm.update_team_ratings(team_a, team_b, a_won=True)
+
+    assert new_a[0] > 1200 and new_a[1] - new_a[0] == 100
+    assert new_b[0] < 1250 and new_b[0] == new_b[1]
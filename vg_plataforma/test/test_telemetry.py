@@ -16,7 +16,7 @@
 
 import time
 import pytest
-from vg_plataforma.telemetry import TelemetrySystem
+from vg_plataforma.telemetry import RateCounter, TelemetrySystem
 
 
 # -----------------------------------------------------------
@@ -92,6 +92,309 @@ def test_record_requests():
     for _ in range(3):
         t.record_request()
 
-    # Validación: deben haberse registrado tres solicitudes
-    assert len(t.data["requests_per_minute"]) == 3, \
+    # Validación: deben haberse registrado tres solicitudes en el último minuto
+    assert t.get_requests_per_minute() == 3, \
         "El número de solicitudes registradas no coincide."
+
+
+# -----------------------------------------------------------
+# Prueba 4: Agregados incrementales y muestras acotadas
+# -----------------------------------------------------------
+def test_streaming_stats_with_bounded_samples():
+    """
+    Verifica que los agregados (conteo, media, varianza, mínimo y
+    máximo) cubran todas las muestras aunque el buffer de muestras
+    crudas solo conserve las últimas N.
+    """
+
+    t = TelemetrySystem(max_samples=3)
+    for value in [1.0, 2.0, 3.0, 4.0, 5.0]:
+        t.record("match_durations", value)
+
+    # El buffer crudo conserva solo las tres últimas muestras
+    assert list(t.data["match_durations"]) == [3.0, 4.0, 5.0]
+
+    # Los agregados reflejan las cinco muestras
+    stats = t.get_stats("match_durations")
+    assert stats["count"] == 5
+    assert stats["mean"] == pytest.approx(3.0)
+    assert stats["variance"] == pytest.approx(2.0)
+    assert (stats["min"], stats["max"]) == (1.0, 5.0)
+    assert t.get_average("match_durations") == pytest.approx(3.0)
+
+    # Sin muestras crudas, las lecturas siguen disponibles
+    t = TelemetrySystem(max_samples=0)
+    t.record("queue_times", 2.5)
+    assert len(t.data["queue_times"]) == 0
+    assert t.get_average("queue_times") == pytest.approx(2.5)
+
+
+# -----------------------------------------------------------
+# Prueba 5: Percentiles con sketch combinable
+# -----------------------------------------------------------
+def test_percentiles_within_relative_error_and_mergeable():
+    """
+    Verifica que los percentiles de "queue_times" respeten el error
+    relativo del sketch y que combinar los sketches de dos sistemas
+    equivalga a registrar todas las muestras en uno solo.
+    """
+
+    values = [0.001 * (i + 1) for i in range(10000)]
+    t = TelemetrySystem(max_samples=0)
+    shard_a, shard_b = TelemetrySystem(), TelemetrySystem()
+    for i, v in enumerate(values):
+        t.record("queue_times", v)
+        (shard_a if i % 2 else shard_b).record("queue_times", v)
+
+    for q in (50, 95, 99):
+        exact = values[int(q / 100 * (len(values) - 1))]
+        assert t.get_percentile("queue_times", q) == pytest.approx(exact, rel=0.01)
+
+    shard_a.merge_sketch("queue_times", shard_b.sketches["queue_times"])
+    assert shard_a.get_percentile("queue_times", 99) == t.get_percentile("queue_times", 99)
+
+    with pytest.raises(ValueError):
+        t.get_percentile("requests_per_minute", 50)
+
+
+# -----------------------------------------------------------
+# Prueba 6: Ventanas deslizantes del contador de solicitudes
+# -----------------------------------------------------------
+def test_rate_counter_windows_and_expiry():
+    """
+    Verifica que el contador por segundos responda a distintas ventanas
+    y que los datos más viejos que el horizonte caduquen solos.
+    """
+
+    c = RateCounter(horizon=120)
+    for second in range(100):
+        c.add(count=2, now=1000 + second + 0.5)
+
+    now = 1099.9
+    assert c.count(1, now=now) == 2
+    assert c.count(60, now=now) == 120
+    assert c.rate(10, now=now) == pytest.approx(2.0)
+
+    # 200 s después, todas las cubetas pertenecen a segundos caducados
+    assert c.count(120, now=now + 200) == 0
+    assert c.total == 200
+
+
+# -----------------------------------------------------------
+# Prueba 7: Cronómetros por entidad y registro desde varios hilos
+# -----------------------------------------------------------
+def test_per_entity_timers_and_threaded_recording():
+    """
+    Verifica que dos jugadores en cola a la vez no se pisen el
+    cronómetro y que el registro concurrente desde 32 hilos no pierda
+    muestras al combinar los fragmentos por hilo.
+    """
+
+    import threading
+
+    t = TelemetrySystem()
+
+    # Dos jugadores en cola simultáneamente: cada uno con su cronómetro
+    t1 = t.start_timer("queue", entity="p1")
+    t.start_timer("queue", entity="p2")
+    time.sleep(0.02)
+    first = t.stop_timer(t1)
+    time.sleep(0.02)
+    second = t.stop_timer("queue", entity="p2")
+    assert second > first > 0
+    assert len(t.data["queue_times"]) == 2
+    assert t.start_times == {}
+
+    # 32 hilos registran 500 muestras cada uno
+    t = TelemetrySystem(max_samples=0)
+
+    def worker(n):
+        for i in range(500):
+            t.stop_timer(t.start_timer("match", entity=(n, i)))
+            t.record_request()
+
+    threads = [threading.Thread(target=worker, args=(n,)) for n in range(32)]
+    for th in threads:
+        th.start()
+    for th in threads:
+        th.join()
+
+    assert t.get_stats("match_durations")["count"] == 32 * 500
+    assert t.get_requests_per_minute() == 32 * 500
+
+
+# -----------------------------------------------------------
+# Prueba 8: Registro persistente en segmentos mapeados en memoria
+# -----------------------------------------------------------
+def test_telemetry_log_rotates_and_replays_columns(tmp_path):
+    """
+    Verifica que las muestras registradas se anexen al log, que los
+    segmentos roten al llenarse y que el lector devuelva columnas con
+    ids de métrica, marcas de tiempo y valores.
+    """
+    from vg_plataforma.telemetry_log import (TelemetryLog, list_segments,
+                                             read_metric_names, read_segment)
+
+    log = TelemetryLog(str(tmp_path), segment_records=4)
+    t = TelemetrySystem(log=log)
+    for i in range(5):
+        t.record("queue_times", float(i))
+    t.start_timer("match", entity="m1")
+    t.stop_timer("match", entity="m1")
+    log.close()
+
+    segments = list_segments(str(tmp_path))
+    assert len(segments) == 2
+    names = read_metric_names(str(tmp_path))
+    assert names == ["queue_times", "match_durations"]
+
+    first, second = (read_segment(path) for path in segments)
+    assert list(first["value"]) == [0.0, 1.0, 2.0, 3.0]
+    assert list(second["metric"]) == [0, 1]
+    assert second["value"][0] == 4.0 and second["value"][1] >= 0
+    assert list(first["timestamp"]) == sorted(first["timestamp"])
+
+    # Reabrir continúa en un segmento nuevo sin perder los anteriores
+    with TelemetryLog(str(tmp_path), segment_records=4) as again:
+        again.append("queue_times", 9.0)
+    segments = list_segments(str(tmp_path))
+    assert len(segments) == 3
+    assert list(read_segment(segments[-1])["value"]) == [9.0]
+
+
+# -----------------------------------------------------------
+# Prueba 9: Agregados por intervalo con niveles de retención
+# -----------------------------------------------------------
+def test_window_stats_use_coarsest_fitting_tier():
+    """
+    Verifica que las consultas por rango comparen periodos distintos
+    (últimos 5 minutos frente al último día), que cada rango se responda
+    con el nivel adecuado y que los datos viejos caduquen.
+    """
+    from vg_plataforma.telemetry import RollupSeries
+
+    now = [100_000.0]
+    t = TelemetrySystem(clock=lambda: now[0])
+
+    # Una muestra de 10 s por minuto durante 2 horas, luego 5 minutos de 2 s
+    for _ in range(120):
+        t.record("queue_times", 10.0)
+        now[0] += 60
+    for _ in range(30):
+        t.record("queue_times", 2.0)
+        now[0] += 10
+
+    last_5m = t.get_window_stats("queue_times", 290)
+    assert last_5m["count"] == 29 and last_5m["mean"] == pytest.approx(2.0)
+    last_day = t.get_window_stats("queue_times", 86400)
+    assert last_day["count"] == 150
+    assert last_day["mean"] == pytest.approx((120 * 10 + 30 * 2) / 150)
+
+    series = RollupSeries()
+    assert series.select_tier(30, now=0) is None        # crudas
+    assert series.select_tier(300, now=0) == 0          # cubetas de 10 s
+    assert series.select_tier(86400, now=0) == 1        # cubetas de 1 min
+
+    # Tras más de un día sin muestras, todo caducó
+    now[0] += 2 * 86400
+    assert t.get_window_stats("queue_times", 86400)["count"] == 0
+    with pytest.raises(ValueError):
+        t.get_window_stats("requests", 60)
+
+
+# -----------------------------------------------------------
+# Prueba 10: Fragmentos de hilos terminados
+# -----------------------------------------------------------
+def test_finished_threads_fold_into_retired_shard():
+    """
+    Verifica que, con hilos que se crean y terminan continuamente, los
+    fragmentos de los hilos terminados se combinen en uno solo (memoria y
+    lecturas acotadas) sin perder muestras, percentiles ni solicitudes.
+    """
+
+    import threading
+
+    t = TelemetrySystem()
+
+    def worker(n):
+        for i in range(20):
+            t.record("queue_times", float(n))
+            t.record_request()
+
+    for batch in range(5):
+        threads = [threading.Thread(target=worker, args=(n,)) for n in range(20)]
+        for th in threads:
+            th.start()
+        for th in threads:
+            th.join()
+        # Solo queda el fragmento de retirados (más el del hilo actual, si registró)
+        assert len(t._shards) == 1
+
+    assert t.get_stats("queue_times")["count"] == 5 * 20 * 20
+    assert t.get_stats("queue_times")["max"] == 19.0
+    assert t.get_requests_per_minute() == 5 * 20 * 20
+    assert t.get_window_stats("queue_times", 60)["count"] == 5 * 20 * 20
+    assert t.get_percentile("queue_times", 100) == pytest.approx(19.0, rel=0.02)
+    assert len(t.data["queue_times"]) == t.max_samples
+
+
+# -----------------------------------------------------------
+# Prueba 11: Registro persistente desde varios hilos y tras cerrar
+# -----------------------------------------------------------
+def test_telemetry_log_batches_per_thread_and_rejects_after_close(tmp_path):
+    """
+    Verifica que las muestras de varios hilos (incluidos los que ya
+    terminaron) lleguen completas al log al cerrarlo, aunque se anexen por
+    lotes, y que registrar tras el cierre falle con ValueError sin
+    alterar los agregados.
+    """
+    import threading
+
+    from vg_plataforma.telemetry_log import TelemetryLog, list_segments, read_segment
+
+    log = TelemetryLog(str(tmp_path), segment_records=1000, batch_records=64)
+    t = TelemetrySystem(max_samples=0, log=log)
+
+    def worker(n):
+        for i in range(300):
+            t.record("queue_times", float(n))
+
+    threads = [threading.Thread(target=worker, args=(n,)) for n in range(8)]
+    for th in threads:
+        th.start()
+    for th in threads:
+        th.join()
+    t.record("match_durations", 1.5)
+    log.close()
+
+    values = [v for path in list_segments(str(tmp_path)) for v in read_segment(path)["value"]]
+    assert len(values) == 8 * 300 + 1
+    assert set(values) == {float(n) for n in range(8)} | {1.5}
+    assert len(list_segments(str(tmp_path))) == 3
+
+    with pytest.raises(ValueError):
+        t.record("queue_times", 9.0)
+    with pytest.raises(ValueError):
+        log.append("queue_times", 9.0)
+    assert t.get_stats("queue_times")["count"] == 8 * 300
+
+
+# -----------------------------------------------------------
+# Prueba 12: Las muestras llegan al segmento sin `flush()`
+# -----------------------------------------------------------
+def test_telemetry_log_records_visible_without_flush(tmp_path):
+    """
+    Verifica que, por defecto, cada muestra quede en el segmento mapeado
+    en cuanto se registra (sobrevive a una caída sin `flush()` ni
+    `close()`), leyendo el segmento mientras el registro sigue abierto.
+    """
+    from vg_plataforma.telemetry_log import TelemetryLog, list_segments, read_segment
+
+    log = TelemetryLog(str(tmp_path))
+    t = TelemetrySystem(log=log)
+    for i in range(100):
+        t.record("queue_times", float(i))
+
+    (segment,) = list_segments(str(tmp_path))
+    assert list(read_segment(segment)["value"]) == [float(i) for i in range(100)]
+    log.close()
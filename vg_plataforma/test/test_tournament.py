@@ -59,3 +59,85 @@ def test_tournament_bracket_advance():
     # Validación: la segunda ronda debe incluir a los ganadores 'a' y 'c'
     assert any('a' in m and 'c' in m for m in t.bracket_rounds[1]), \
         "Los ganadores no fueron correctamente transferidos a la siguiente ronda."
+
+
+# -----------------------------------------------------------
+# Prueba 2: Cuadro con pases libres y siembra por rating
+# -----------------------------------------------------------
+def test_bracket_with_byes_and_rating_seeds():
+    """
+    Verifica que se acepte cualquier número de jugadores, que los pases
+    libres se asignen a los mejores sembrados y avancen solos, y que los
+    registros duplicados se ignoren.
+    """
+    from matchmaking import Player
+
+    t = Tournament('t2')
+    for i, rating in enumerate([1500, 1800, 1200, 2000, 1600, 1100]):
+        t.register(Player(f"p{i}", rating))
+    t.register("p0")
+    assert len(t.players) == 6
+
+    t.create_bracket()
+    first = t.bracket_rounds[0]
+    # 8 posiciones: los dos mejores (p3, p1) pasan libres y caen en mitades opuestas
+    assert first == [("p3", None), ("p0", "p2"), ("p1", None), ("p4", "p5")]
+    assert t.results == {(0, 0): "p3", (0, 2): "p1"}
+    assert len(t.bracket_rounds) == 3
+
+    t.set_match_result(0, 1, winner="p0")
+    t.set_match_result(0, 3, winner="p4")
+    t.advance_round(0)
+    assert t.bracket_rounds[1] == [("p3", "p0"), ("p1", "p4")]
+
+    # Sin siembra: orden de registro y pases libres para los primeros
+    u = Tournament('t3')
+    for p in "abc":
+        u.register(p)
+    u.create_bracket()
+    assert u.bracket_rounds[0] == [("a", None), ("b", "c")]
+    with pytest.raises(ValueError):
+        Tournament('t4').create_bracket()
+
+
+# -----------------------------------------------------------
+# Prueba 3: Propagación automática de resultados
+# -----------------------------------------------------------
+def test_results_propagate_without_advance_round():
+    """
+    Verifica que cada resultado coloque al ganador en la ronda siguiente
+    (aunque lleguen fuera de orden), que informe del partido que queda
+    listo y que el partido actual de cada jugador y el fin del torneo se
+    consulten sin recorrer el cuadro.
+    """
+
+    t = Tournament('t5')
+    for p in "abcdefgh":
+        t.register(p)
+    t.create_bracket()
+    assert t.ready_matches() == [(0, 0), (0, 1), (0, 2), (0, 3)]
+
+    # Resultados fuera de orden
+    assert t.set_match_result(0, 3, winner="h") is None
+    assert t.set_match_result(0, 2, winner="e") == (1, 1)
+    assert t.get_match(1, 1) == ("e", "h")
+    assert t.current_match("h") == (1, 1)
+    assert t.current_match("f") is None      # eliminado
+    assert t.current_match("a") == (0, 0)
+
+    with pytest.raises(ValueError):
+        t.set_match_result(0, 0, winner="c")    # no juega ese partido
+    with pytest.raises(ValueError):
+        t.set_match_result(1, 0, winner="a")    # aún sin rivales
+    with pytest.raises(ValueError):
+        t.set_match_result(0, 2, winner="f")    # ya tiene otro ganador
+
+    t.set_match_result(0, 0, winner="a")
+    assert t.set_match_result(0, 1, winner="d") == (1, 0)
+    t.set_match_result(1, 0, winner="d")
+    assert t.set_match_result(1, 1, winner="e") == (2, 0)
+    assert not t.is_finished()
+    t.set_match_result(2, 0, winner="e")
+    assert t.is_finished() and t.champion == "e"
+    assert t.current_match("e") is None
+    t.advance_round(1)  # compatibilidad: la ronda está completa
@@ -0,0 +1,167 @@
+# ===========================================================
+# Archivo: test_tournament_manager.py
+# Descripción:
+# Este archivo contiene las pruebas unitarias del módulo
+# "tournament_manager", que coordina muchos torneos a la vez
+# con hilos trabajadores y un número acotado de servidores.
+#
+# Se valida que los torneos lleguen a su final asignando los
+# partidos a servidores sin exceder el límite, y que los
+# resultados inválidos se informen por su Future.
+#
+# ===========================================================
+
+import queue
+
+import pytest
+from tournament import Tournament
+from tournament_manager import TournamentManager
+
+
+def _tournament(id_, players):
+    t = Tournament(id_)
+    for player_id in players:
+        t.register(player_id)
+    t.create_bracket()
+    return t
+
+
+# -----------------------------------------------------------
+# Prueba 1: Muchos torneos con servidores acotados
+# -----------------------------------------------------------
+def test_manager_runs_tournaments_on_bounded_slots():
+    """
+    Juega 20 torneos de 5 jugadores con 3 servidores: cada partido
+    asignado se "juega" enviando su resultado (gana el primer jugador)
+    y nunca hay más de 3 partidos en juego a la vez.
+    """
+    scheduled = queue.Queue()
+    finished = []
+    manager = TournamentManager(workers=3, slots=3, on_schedule=scheduled.put,
+                                on_finish=finished.append)
+
+    with manager:
+        for n in range(20):
+            manager.add_tournament(_tournament(f"t{n}", [f"t{n}-p{i}" for i in range(5)]))
+
+        # Cada torneo de 5 jugadores (cuadro de 8) tiene 4 partidos reales
+        for _ in range(20 * 4):
+            match = scheduled.get(timeout=5)
+            assert 0 <= match.slot < 3
+            assert len(manager.running) <= 3
+            future = manager.submit_result(match.tournament_id, match.round_index,
+                                           match.match_index, match.players[0])
+            future.result(timeout=5)
+        manager.join()
+
+    assert scheduled.empty()
+    assert sorted(t.id for t in finished) == sorted(f"t{n}" for n in range(20))
+    assert manager.running == {} and manager.waiting_count() == 0
+    assert manager.telemetry.get_stats("schedule_latency")["count"] == 20 * 2
+    assert manager.telemetry.get_stats("processing_latency")["count"] == 20 * 2
+
+
+# -----------------------------------------------------------
+# Prueba 2: Resultados inválidos
+# -----------------------------------------------------------
+def test_manager_reports_invalid_results():
+    """
+    Verifica que un torneo desconocido, un ganador ajeno o un torneo
+    duplicado produzcan ValueError.
+    """
+    manager = TournamentManager(workers=2, slots=2)
+    manager.add_tournament(_tournament("t", ["a", "b"]))
+    with pytest.raises(ValueError):
+        manager.add_tournament(_tournament("t", ["c", "d"]))
+
+    with manager:
+        with pytest.raises(ValueError):
+            manager.submit_result("x", 0, 0, "a").result(timeout=5)
+        with pytest.raises(ValueError):
+            manager.submit_result("t", 0, 0, "c").result(timeout=5)
+        assert manager.submit_result("t", 0, 0, "a").result(timeout=5) is None
+
+    assert manager.tournaments["t"].champion == "a"
+    assert manager.running == {}
+
+
+# -----------------------------------------------------------
+# Prueba 3: Latencia al asignar servidor y errores del trabajador
+# -----------------------------------------------------------
+def test_manager_latency_at_slot_grant_and_worker_errors():
+    """
+    Verifica que la latencia de un partido que tuvo que esperar servidor
+    se mida al asignárselo (y la del gestor al dejarlo en espera), que una excepción de `on_finish` se entregue
+    por el Future sin detener al trabajador y que tras `stop()` se
+    rechacen los resultados nuevos.
+    """
+    now = [0.0]
+    manager = TournamentManager(workers=1, slots=2, clock=lambda: now[0])
+    manager.add_tournament(_tournament("t", ["a", "b", "c", "d"]))
+    manager.add_tournament(_tournament("u", ["e", "f"]))
+    manager.add_tournament(_tournament("v", ["g", "h"]))
+
+    with manager:
+        # "t" ocupa los dos servidores; "u" y "v" esperan
+        now[0] = 10.0
+        assert manager.submit_result("t", 0, 0, "a").result(timeout=5) is None
+        # La final de "t" queda lista en t=20, pero el servidor va a "v"
+        now[0] = 20.0
+        assert manager.submit_result("t", 0, 1, "c").result(timeout=5) == (1, 0)
+        assert manager.waiting_count() == 1
+        assert manager.telemetry.get_stats("schedule_latency")["count"] == 0
+        # El gestor sí lo dejó en espera al llegar el resultado
+        stats = manager.telemetry.get_stats("processing_latency")
+        assert stats["count"] == 1 and stats["max"] == pytest.approx(0.0)
+        # Al terminar "u" (t=30) la final recibe servidor: 10 s de espera
+        now[0] = 30.0
+        manager.submit_result("u", 0, 0, "e").result(timeout=5)
+        stats = manager.telemetry.get_stats("schedule_latency")
+        assert stats["count"] == 1 and stats["max"] == pytest.approx(10.0)
+
+        def failing_finish(tournament):
+            raise RuntimeError("fallo del aviso")
+
+        manager.on_finish = failing_finish
+        with pytest.raises(RuntimeError):
+            manager.submit_result("v", 0, 0, "g").result(timeout=5)
+        manager.on_finish = None
+        assert manager.submit_result("t", 1, 0, "a").result(timeout=5) is None
+        manager.join()
+
+    with pytest.raises(ValueError):
+        manager.submit_result("t", 1, 0, "a").result(timeout=5)
+    with pytest.raises(ValueError):
+        manager.add_tournament(_tournament("w", ["i", "j"]))
+    assert manager.tournaments["t"].champion == "a"
+
+
+# -----------------------------------------------------------
+# Prueba 4: Resultado de un partido que espera servidor
+# -----------------------------------------------------------
+def test_manager_rejects_results_for_waiting_matches():
+    """
+    Con menos servidores que partidos en la ronda, verifica que el
+    resultado de un partido que aún espera servidor se rechace y que el
+    torneo siga hasta el final sin dejar servidores ocupados.
+    """
+    scheduled = queue.Queue()
+    manager = TournamentManager(workers=1, slots=1, on_schedule=scheduled.put)
+    manager.add_tournament(_tournament("t", ["a", "b", "c", "d"]))
+
+    with manager:
+        first = scheduled.get(timeout=5)
+        assert (first.round_index, first.match_index) == (0, 0)
+        assert manager.waiting_count() == 1
+        with pytest.raises(ValueError):
+            manager.submit_result("t", 0, 1, "c").result(timeout=5)
+
+        for _ in range(3):
+            manager.submit_result("t", first.round_index, first.match_index,
+                                  first.players[0]).result(timeout=5)
+            if manager.tournaments["t"].is_finished():
+                break
+            first = scheduled.get(timeout=5)
+
+    assert manager.tournaments["t"].champion == "a"
+    assert manager.running == {} and manager.waiting_count() == 0
@@ -5,12 +5,48 @@
 # basado en eliminación directa, utilizado para organizar
 # competencias entre jugadores registrados en la plataforma.
 #
+# El cuadro admite cualquier número de jugadores: se completa
+# hasta la siguiente potencia de 2 con pases libres (byes), que
+# se asignan a los mejores cabezas de serie. Si los jugadores se
+# registran como `matchmaking.Player`, se siembran por rating con
+# el orden clásico de cuadro (1 contra N, 2 contra N-1, ... y los
+# mejores sembrados en mitades opuestas).
+#
+# Internamente, cada ronda es una lista de posiciones con índices
+# de jugador (dos por partido), así que el cuadro se arma en una
+# sola pasada O(N) sobre listas, sin objetos por partido. La
+# siembra ordena los ratings (enteros acotados) por cubetas en
+# O(N), sin comparaciones; con NumPy disponible se usa su radix
+# sort.
+#
+# Los resultados se propagan solos: el ganador del partido i de la
+# ronda r ocupa la posición i de la ronda r+1 (partido i // 2), en
+# O(1) y sin importar el orden en que lleguen los resultados. Para
+# cada jugador se guarda su posición inicial y la ronda en la que
+# sigue vivo, así que su partido actual se obtiene en O(1).
+#
 # Incluye:
 #   - Clase Tournament (gestión completa del flujo del torneo)
 #
 # ===========================================================
 
-from typing import List, Dict, Tuple
+from functools import lru_cache
+from itertools import chain, repeat
+from operator import lshift, or_, rshift, sub
+from typing import Dict, List, Optional, Tuple, Union
+
+from matchmaking import Player
+from profiling import profiled
+
+try:  # NumPy es opcional: acelera la siembra de cuadros grandes
+    import numpy as np
+except ImportError:  # pragma: no cover - depende del entorno
+    np = None
+
+
+# Marca de pase libre en las posiciones de la primera ronda.
+BYE = -1
+
 
 class Tournament:
     """
@@ -25,9 +61,10 @@ class Tournament:
 
     Atributos:
         id (str): Identificador único del torneo.
-        players (List[str]): Lista de jugadores registrados.
+        players (List[str]): Lista de jugadores registrados, en orden de registro.
         bracket_rounds (List[List[Tuple[str, str]]]): Rondas del torneo, donde cada
-            ronda es una lista de enfrentamientos (pares de jugadores).
+            ronda es una lista de enfrentamientos (pares de jugadores). Un lugar
+            aún sin definir, o un pase libre, vale None.
         results (Dict[Tuple[int, int], str]): Diccionario que almacena los ganadores
             de cada partida en cada ronda. Clave: (round_index, match_index).
     """
@@ -36,64 +73,228 @@ class Tournament:
         """Inicializa un torneo con su identificador único y listas vacías."""
         self.id = id_
         self.players: List[str] = []
-        self.bracket_rounds: List[List[Tuple[str, str]]] = []
         self.results: Dict[Tuple[int, int], str] = {}
 
-    def register(self, player_id: str):
+        # Índice de cada jugador en `players` (registro en O(1)) y su rating
+        self._index: Dict[str, int] = {}
+        self._ratings: List[int] = []
+        self._rated = 0
+
+        # Posiciones de cada ronda: índices de jugador, BYE o None (por definir)
+        self._slots: List[List[Optional[int]]] = []
+
+        # Por jugador: posición en la primera ronda y ronda actual (-1 = eliminado)
+        self._start: List[int] = []
+        self._round: List[int] = []
+
+        # Ganador del torneo, cuando se decide la final
+        self.champion: Optional[str] = None
+
+    def register(self, player: Union[str, Player]):
         """
-        Registra un jugador en el torneo.
+        Registra un jugador en el torneo, en O(1).
 
         Args:
-            player_id (str): Identificador del jugador.
+            player (str | Player): Identificador del jugador, o un Player
+                cuyo rating se usa para sembrar el cuadro.
 
         Nota:
             No se permite registrar jugadores duplicados.
         """
-        if player_id not in self.players:
-            self.players.append(player_id)
+        if isinstance(player, Player):
+            player_id, rating = player.id, player.rating
+        else:
+            player_id, rating = player, None
+        if player_id in self._index:
+            return
+        self._index[player_id] = len(self.players)
+        self.players.append(player_id)
+        self._ratings.append(rating if rating is not None else 0)
+        if rating is not None:
+            self._rated += 1
 
-    def create_bracket(self):
+    def create_bracket(self, seed_by_rating: bool = True):
         """
         Crea el cuadro de emparejamientos (bracket) del torneo.
 
-        Requisitos:
-            - El número de jugadores debe ser una potencia de 2
-              (2, 4, 8, 16, ...).
+        El cuadro tiene la siguiente potencia de 2 de posiciones; las que
+        sobran son pases libres, y el rival de cada pase libre avanza
+        automáticamente.
+
+        Args:
+            seed_by_rating (bool): Si hay jugadores con rating, sembrarlos
+                por rating (los que no tienen cuentan como 0). Si no, los
+                jugadores se emparejan de forma consecutiva en orden de
+                registro y los pases libres van a los primeros.
 
         Raises:
-            ValueError: Si el número de jugadores no es una potencia de 2.
+            ValueError: Si hay menos de 2 jugadores.
         """
         n = len(self.players)
-        if n & (n - 1) != 0:
-            raise ValueError("Número de jugadores debe ser potencia de 2 para este MVP.")
-
-        # Primera ronda: emparejar jugadores de forma consecutiva
-        first = []
-        for i in range(0, n, 2):
-            first.append((self.players[i], self.players[i + 1]))
-        self.bracket_rounds = [first]
-
-        # Crear rondas vacías siguientes (semifinales, final, etc.)
-        rn = n // 2
-        while rn >= 1:
-            rn //= 2
-            if rn >= 1:
-                self.bracket_rounds.append([])
-
-    def set_match_result(self, round_index: int, match_index: int, winner: str):
+        if n < 2:
+            raise ValueError("Se necesitan al menos 2 jugadores para crear el bracket.")
+        size = 1 << (n - 1).bit_length()
+        byes = size - n
+
+        players = self.players
+        first: List[Optional[int]]
+        if seed_by_rating and self._rated:
+            first, start, seeds = _seed_layout(self._ratings, size)
+            # Los `byes` mejores sembrados se enfrentan a un pase libre
+            bye_players = seeds[:byes]
+            bye_matches = list(map(rshift, _seed_slots(size)[:byes], repeat(1)))
+        else:
+            first = [BYE] * size
+            first[0:2 * byes:2] = range(byes)
+            first[2 * byes:] = range(byes, n)
+            start = list(range(0, 2 * byes, 2))
+            start.extend(range(2 * byes, size))
+            bye_players = bye_matches = range(byes)
+
+        self._slots = [first]
+        self.results = {}
+        self.champion = None
+        width = size // 2
+        while width > 1:
+            self._slots.append([None] * width)
+            width //= 2
+        self._start = start
+        self._round = [0] * n
+
+        # Los pases libres se resuelven (y propagan) al crear el cuadro
+        if byes:
+            self.results.update(zip(zip(repeat(0), bye_matches),
+                                    map(players.__getitem__, bye_players)))
+            second = self._slots[1]
+            alive = self._round
+            for match, player in zip(bye_matches, bye_players):
+                second[match] = player
+                alive[player] = 1
+
+    @property
+    def bracket_rounds(self) -> List[List[Tuple[Optional[str], Optional[str]]]]:
+        """Rondas como listas de pares de IDs (se arma en O(N) al consultarla)."""
+        players = self.players
+        rounds = []
+        for slots in self._slots:
+            ids = [players[s] if s is not None and s != BYE else None for s in slots]
+            rounds.append(list(zip(ids[0::2], ids[1::2])))
+        return rounds
+
+    def get_match(self, round_index: int, match_index: int) -> Tuple[Optional[str], Optional[str]]:
         """
-        Registra el resultado de un enfrentamiento.
+        Jugadores de un partido, en O(1).
+
+        Returns:
+            Tuple[Optional[str], Optional[str]]: IDs de ambos lados (None si
+            el lugar aún no está definido o es un pase libre).
+        """
+        slots = self._slots[round_index]
+        a, b = slots[2 * match_index], slots[2 * match_index + 1]
+        players = self.players
+        return (players[a] if a is not None and a != BYE else None,
+                players[b] if b is not None and b != BYE else None)
+
+    def set_match_result(self, round_index: int, match_index: int,
+                         winner: str) -> Optional[Tuple[int, int]]:
+        """
+        Registra el resultado de un enfrentamiento y lo propaga, en O(1).
+
+        El ganador pasa a la posición `match_index` de la ronda siguiente;
+        el perdedor queda eliminado. Registrar de nuevo el mismo ganador no
+        tiene efecto.
 
         Args:
             round_index (int): Índice de la ronda.
             match_index (int): Índice del partido dentro de la ronda.
             winner (str): ID del jugador ganador.
+
+        Returns:
+            Optional[Tuple[int, int]]: (ronda, partido) que queda listo para
+            jugarse gracias a este resultado, o None si aún espera rival o si
+            era la final.
+
+        Raises:
+            ValueError: Si el partido no existe o no tiene sus dos jugadores,
+                si el ganador no juega ese partido o si ya tenía otro ganador.
+        """
+        if not (0 <= round_index < len(self._slots)
+                and 0 <= match_index < len(self._slots[round_index]) // 2):
+            raise ValueError(f"No existe el partido {match_index} de la ronda {round_index}.")
+        key = (round_index, match_index)
+        previous = self.results.get(key)
+        if previous is not None:
+            if previous != winner:
+                raise ValueError(f"El partido {match_index} de la ronda {round_index} "
+                                 f"ya tiene ganador: '{previous}'.")
+            return None
+
+        slots = self._slots[round_index]
+        a, b = slots[2 * match_index], slots[2 * match_index + 1]
+        if a is None or b is None:
+            raise ValueError(f"El partido {match_index} de la ronda {round_index} "
+                             f"aún no tiene sus dos jugadores.")
+        index = self._index.get(winner)
+        if index is None or index not in (a, b):
+            raise ValueError(f"'{winner}' no juega el partido {match_index} "
+                             f"de la ronda {round_index}.")
+
+        self.results[key] = winner
+        self._round[b if index == a else a] = -1
+        if round_index + 1 == len(self._slots):
+            self.champion = winner
+            return None
+
+        self._round[index] = round_index + 1
+        parent = self._slots[round_index + 1]
+        parent[match_index] = index
+        if parent[match_index ^ 1] is not None:
+            return round_index + 1, match_index // 2
+        return None
+
+    def current_match(self, player_id: str) -> Optional[Tuple[int, int]]:
+        """
+        Partido que el jugador está jugando o esperando, en O(1).
+
+        Returns:
+            Optional[Tuple[int, int]]: (ronda, partido), o None si el jugador
+            fue eliminado, ganó el torneo o no está en el cuadro.
         """
-        self.results[(round_index, match_index)] = winner
+        index = self._index.get(player_id)
+        if index is None or index >= len(self._round):
+            return None
+        round_index = self._round[index]
+        if round_index < 0 or self.champion == player_id:
+            return None
+        return round_index, self._start[index] >> (round_index + 1)
 
+    def is_finished(self) -> bool:
+        """Indica en O(1) si la final ya tiene ganador."""
+        return self.champion is not None
+
+    def ready_matches(self) -> List[Tuple[int, int]]:
+        """
+        Partidos con sus dos jugadores y sin resultado.
+
+        Recorre el cuadro en O(N): está pensado para conocer los partidos
+        iniciales; después, cada `set_match_result` informa del siguiente.
+        """
+        ready = []
+        for round_index, slots in enumerate(self._slots):
+            for match_index in range(len(slots) // 2):
+                a, b = slots[2 * match_index], slots[2 * match_index + 1]
+                if (a is not None and b is not None and a != BYE and b != BYE
+                        and (round_index, match_index) not in self.results):
+                    ready.append((round_index, match_index))
+        return ready
+
+    @profiled("tournament.advance_round")
     def advance_round(self, round_index: int):
         """
-        Avanza el torneo a la siguiente ronda con base en los ganadores registrados.
+        Comprueba que una ronda esté completa.
+
+        Se conserva por compatibilidad: `set_match_result` ya coloca a cada
+        ganador en la ronda siguiente, así que no hace falta llamarla.
 
         Args:
             round_index (int): Índice de la ronda actual.
@@ -101,23 +302,106 @@ class Tournament:
         Raises:
             ValueError: Si no se encuentran resultados para todos los enfrentamientos.
         """
-        current_round = self.bracket_rounds[round_index]
-        next_round = []
-
-        # Validar que existan resultados para todos los matches
-        for i, match in enumerate(current_round):
-            key = (round_index, i)
-            if key not in self.results:
+        for i in range(len(self._slots[round_index]) // 2):
+            if (round_index, i) not in self.results:
                 raise ValueError(f"Falta resultado para el partido {i} de la ronda {round_index}.")
-            winner = self.results[key]
-            next_round.append(winner)
-
-        # Generar enfrentamientos para la siguiente ronda
-        next_matches = []
-        for i in range(0, len(next_round), 2):
-            if i + 1 < len(next_round):
-                next_matches.append((next_round[i], next_round[i + 1]))
-
-        # Agregar la nueva ronda al bracket
-        if round_index + 1 < len(self.bracket_rounds):
-            self.bracket_rounds[round_index + 1] = next_matches
+
+
+@lru_cache(maxsize=64)
+def _seed_positions(size: int) -> Tuple[int, ...]:
+    """
+    Orden clásico de cabezas de serie en un cuadro de `size` posiciones.
+
+    Devuelve, para cada posición, el índice de siembra (0 = mejor) que la
+    ocupa: cada partido enfrenta a s con size-1-s y los mejores quedan en
+    mitades opuestas. Se construye por duplicación en O(size) y se guarda
+    por tamaño, ya que muchos torneos comparten tamaño de cuadro.
+    """
+    order = [0]
+    while len(order) < size:
+        mirror = 2 * len(order) - 1
+        doubled = [0] * (2 * len(order))
+        doubled[0::2] = order
+        doubled[1::2] = map(sub, repeat(mirror), order)
+        order = doubled
+    return tuple(order)
+
+
+@lru_cache(maxsize=64)
+def _seed_slots(size: int) -> Tuple[int, ...]:
+    """
+    Inversa de `_seed_positions`: posición que ocupa cada número de siembra.
+
+    Al duplicar el cuadro, la siembra s pasa de la posición p a la 2p y su
+    rival nuevo (2m-1-s) ocupa la 2p+1, así que también se arma por
+    duplicación sin recorrer posición por posición en Python.
+    """
+    slots = [0]
+    while len(slots) < size:
+        doubled = list(map(lshift, slots, repeat(1)))
+        slots = doubled + list(map(or_, reversed(doubled), repeat(1)))
+    return tuple(slots)
+
+
+def _seed_layout(ratings: List[int],
+                 size: int) -> Tuple[List[int], List[int], List[int]]:
+    """
+    Siembra por rating en O(N).
+
+    Returns:
+        Tuple[List[int], List[int], List[int]]: Primera ronda (índice de
+        jugador o BYE por posición), posición inicial de cada jugador y
+        jugadores en orden de siembra.
+    """
+    n = len(ratings)
+    if np is not None:
+        seeds = _rating_order_np(ratings)
+        positions, slot_of_seed = _seed_tables_np(size)
+        start = np.empty(n, dtype=np.int64)
+        start[seeds] = slot_of_seed[:n]
+        ranked = np.concatenate((seeds, np.full(size - n, BYE, dtype=seeds.dtype)))
+        return ranked[positions].tolist(), start.tolist(), seeds.tolist()
+
+    seeds = _rating_order(ratings)
+    start = [0] * n
+    for seed, slot in zip(seeds, _seed_slots(size)):
+        start[seed] = slot
+    ranked = seeds + [BYE] * (size - n)
+    return list(map(ranked.__getitem__, _seed_positions(size))), start, seeds
+
+
+@lru_cache(maxsize=8)
+def _seed_tables_np(size: int):
+    """`_seed_positions` y `_seed_slots` como arreglos de NumPy (solo lectura)."""
+    positions = np.asarray(_seed_positions(size), dtype=np.int64)
+    slot_of_seed = np.empty(size, dtype=np.int64)
+    slot_of_seed[positions] = np.arange(size, dtype=np.int64)
+    positions.flags.writeable = slot_of_seed.flags.writeable = False
+    return positions, slot_of_seed
+
+
+def _rating_order_np(ratings: List[int]):
+    """
+    `_rating_order` con NumPy: argsort estable de la distancia al máximo
+    rating. Si el rango cabe en 16 bits, NumPy usa radix sort (O(N)).
+    """
+    values = np.asarray(ratings, dtype=np.int64)
+    key = values.max() - values
+    if key.max() < 1 << 16:
+        key = key.astype(np.uint16)
+    return np.argsort(key, kind="stable")
+
+
+def _rating_order(ratings: List[int]) -> List[int]:
+    """
+    Índices de jugador de mayor a menor rating (estable: a igual rating,
+    primero el que se registró antes).
+
+    Ordenamiento por cubetas en O(N + R log R), con R el número de ratings
+    distintos (acotado por el rango de rating): cada índice se reparte en
+    la cubeta de su rating en una sola pasada.
+    """
+    buckets: Dict[int, List[int]] = {rating: [] for rating in set(ratings)}
+    for index, rating in enumerate(ratings):
+        buckets[rating].append(index)
+    return list(chain.from_iterable(buckets[r] for r in sorted(buckets, reverse=True)))
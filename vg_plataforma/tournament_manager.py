@@ -0,0 +1,365 @@
+# ===========================================================
+# Archivo: tournament_manager.py
+# Descripción:
+# Este módulo coordina muchos torneos (Tournament) a la vez:
+# recibe resultados desde cualquier hilo, hace avanzar los
+# cuadros en un grupo de hilos trabajadores y asigna los partidos
+# listos a un número acotado de servidores de juego locales.
+#
+# Diseño:
+#   - Cada torneo pertenece a un único trabajador (según el hash
+#     de su ID) y cada trabajador tiene su propia cola de entrada
+#     (queue.Queue, segura entre hilos). Así los resultados de un
+#     torneo se aplican en orden y sin candados por torneo.
+#   - Un resultado se aplica con `set_match_result`, que devuelve
+#     en O(1) el partido que queda listo: no se recorre ningún
+#     cuadro ni la lista de torneos.
+#   - Los servidores libres y los partidos en espera de servidor
+#     se guardan en una lista y una deque bajo un único candado,
+#     con operaciones O(1).
+#
+# Por eso el trabajo del gestor por resultado no depende de
+# cuántos torneos haya. En TelemetrySystem se registran dos
+# latencias (s) desde que llega un resultado:
+#   - "processing_latency": hasta que el partido que dejó listo
+#     recibe servidor o entra en la cola de espera. Es el costo
+#     del gestor (cola del trabajador incluida).
+#   - "schedule_latency": hasta que ese partido recibe servidor,
+#     también si antes tuvo que esperar a que se liberara uno.
+#
+# Un error inesperado al aplicar un mensaje (incluido uno lanzado
+# por `on_schedule` u `on_finish`) se entrega por el Future del
+# resultado o se registra con logging; el trabajador sigue vivo.
+#
+# Incluye:
+#   - Clase ScheduledMatch (partido asignado a un servidor)
+#   - Clase TournamentManager (torneos concurrentes con trabajadores)
+#
+# ===========================================================
+
+import logging
+import queue
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from dataclasses import dataclass
+from typing import Callable, Deque, Dict, List, Optional, Tuple
+
+from telemetry import TelemetrySystem
+from tournament import Tournament
+
+logger = logging.getLogger(__name__)
+
+# Métricas de latencia resultado → partido listo (asignado o en espera)
+# y resultado → partido asignado
+PROCESSING_LATENCY_METRIC = "processing_latency"
+SCHEDULE_LATENCY_METRIC = "schedule_latency"
+
+# Mensajes de las colas de los trabajadores
+_START = "start"
+_RESULT = "result"
+_STOP = "stop"
+
+
+@dataclass(frozen=True)
+class ScheduledMatch:
+    """
+    Partido listo asignado a un servidor de juego.
+
+    Atributos:
+        tournament_id (str): Torneo al que pertenece.
+        round_index (int): Ronda del partido.
+        match_index (int): Índice del partido dentro de la ronda.
+        players (Tuple[str, str]): Jugadores del partido.
+        slot (int): Servidor de juego asignado (0 .. slots-1).
+    """
+    tournament_id: str
+    round_index: int
+    match_index: int
+    players: Tuple[str, str]
+    slot: int
+
+
+class TournamentManager:
+    """
+    Gestor de muchos torneos de eliminación directa concurrentes.
+
+    Funcionalidades:
+    - `add_tournament` incorpora un torneo con su cuadro ya creado y
+      programa sus partidos iniciales.
+    - `submit_result` encola un resultado desde cualquier hilo y devuelve
+      un Future con el partido que ese resultado dejó listo (o None).
+    - Los partidos listos ocupan un servidor libre o esperan, en orden de
+      llegada, a que un resultado libere uno.
+
+    Atributos:
+        tournaments (Dict[str, Tournament]): Torneos gestionados por ID.
+        slots (int): Número de servidores de juego locales.
+        running (Dict[Tuple[str, int, int], int]): Servidor de cada partido en
+            juego, por (torneo, ronda, partido).
+        on_schedule (Callable[[ScheduledMatch], None], opcional): Se invoca,
+            desde el hilo trabajador, con cada partido asignado a un servidor.
+        on_finish (Callable[[Tournament], None], opcional): Se invoca cuando
+            un torneo tiene campeón.
+        telemetry (TelemetrySystem): Destino de "processing_latency" y
+            "schedule_latency".
+    """
+
+    def __init__(self, workers: int = 4, slots: int = 64,
+                 on_schedule: Optional[Callable[[ScheduledMatch], None]] = None,
+                 on_finish: Optional[Callable[[Tournament], None]] = None,
+                 telemetry: Optional[TelemetrySystem] = None,
+                 clock: Callable[[], float] = time.perf_counter):
+        """
+        Inicializa el gestor (los trabajadores no arrancan hasta `start()`).
+
+        Args:
+            workers (int): Hilos trabajadores (y colas de entrada).
+            slots (int): Servidores de juego disponibles.
+            on_schedule (Callable, opcional): Aviso de partido asignado.
+            on_finish (Callable, opcional): Aviso de torneo terminado.
+            telemetry (TelemetrySystem, opcional): Sistema de telemetría.
+            clock (Callable[[], float]): Fuente de tiempo en segundos.
+
+        Raises:
+            ValueError: Si `workers` o `slots` no son positivos.
+        """
+        if workers < 1 or slots < 1:
+            raise ValueError("Se necesita al menos un trabajador y un servidor.")
+        self.tournaments: Dict[str, Tournament] = {}
+        self.slots = slots
+        self.running: Dict[Tuple[str, int, int], int] = {}
+        self.on_schedule = on_schedule
+        self.on_finish = on_finish
+        self.telemetry = telemetry if telemetry is not None else TelemetrySystem()
+        self.clock = clock
+
+        # Una cola de entrada por trabajador; cada torneo usa siempre la misma
+        self._queues: List[queue.Queue] = [queue.Queue() for _ in range(workers)]
+        self._threads: List[threading.Thread] = []
+
+        # Servidores libres y partidos listos a la espera de servidor, con
+        # la llegada del resultado que los dejó listos (None si no hubo)
+        self._lock = threading.Lock()
+        self._free: List[int] = list(range(slots - 1, -1, -1))
+        self._waiting: Deque[Tuple[Tuple[str, int, int], Optional[float]]] = deque()
+
+        # Tras `stop()` se rechazan los mensajes nuevos hasta otro `start()`
+        self._intake_lock = threading.Lock()
+        self._stopped = False
+
+    # -------------------------------------------------------
+    # Entrada (segura entre hilos)
+    # -------------------------------------------------------
+    def _queue_for(self, tournament_id: str) -> queue.Queue:
+        return self._queues[hash(tournament_id) % len(self._queues)]
+
+    def add_tournament(self, tournament: Tournament):
+        """
+        Incorpora un torneo y programa sus partidos iniciales.
+
+        Args:
+            tournament (Tournament): Torneo con el cuadro ya creado.
+
+        Raises:
+            ValueError: Si ya hay un torneo con ese ID, no tiene cuadro o el
+                gestor está detenido.
+        """
+        if not tournament.bracket_rounds:
+            raise ValueError(f"El torneo '{tournament.id}' no tiene cuadro.")
+        with self._intake_lock:
+            if self._stopped:
+                raise ValueError("El gestor está detenido.")
+            with self._lock:
+                if tournament.id in self.tournaments:
+                    raise ValueError(f"Ya existe el torneo '{tournament.id}'.")
+                self.tournaments[tournament.id] = tournament
+            self._queue_for(tournament.id).put((_START, tournament.id, None, None))
+
+    def submit_result(self, tournament_id: str, round_index: int, match_index: int,
+                      winner: str) -> Future:
+        """
+        Encola el resultado de un partido; no bloquea.
+
+        Args:
+            tournament_id (str): ID del torneo.
+            round_index (int): Ronda del partido.
+            match_index (int): Índice del partido dentro de la ronda.
+            winner (str): ID del ganador.
+
+        Returns:
+            Future: Se resuelve con la clave (ronda, partido) que el resultado
+            dejó lista (asignada o en espera de servidor) o None. Falla con
+            ValueError si el torneo no existe, el partido no está en juego en
+            un servidor, el resultado no es válido o el gestor está detenido, y con la excepción de `on_schedule` u
+            `on_finish` si alguno falla.
+        """
+        future: Future = Future()
+        arrived = self.clock()
+        with self._intake_lock:
+            if self._stopped:
+                future.set_exception(ValueError("El gestor está detenido."))
+                return future
+            self._queue_for(tournament_id).put(
+                (_RESULT, tournament_id, (round_index, match_index, winner), (future, arrived)))
+        return future
+
+    def join(self):
+        """Espera a que los trabajadores procesen todo lo encolado."""
+        for intake in self._queues:
+            intake.join()
+
+    # -------------------------------------------------------
+    # Ciclo de vida
+    # -------------------------------------------------------
+    def start(self):
+        """Arranca los hilos trabajadores."""
+        if self._threads:
+            return
+        with self._intake_lock:
+            self._stopped = False
+        for number, intake in enumerate(self._queues):
+            thread = threading.Thread(target=self._worker, args=(intake,), daemon=True,
+                                      name=f"tournament-worker-{number}")
+            thread.start()
+            self._threads.append(thread)
+
+    def stop(self):
+        """
+        Procesa lo pendiente y detiene los hilos trabajadores; los
+        resultados enviados después fallan con ValueError.
+        """
+        if not self._threads:
+            return
+        with self._intake_lock:
+            self._stopped = True
+            for intake in self._queues:
+                intake.put((_STOP, None, None, None))
+        for thread in self._threads:
+            thread.join()
+        self._threads = []
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    # -------------------------------------------------------
+    # Trabajadores
+    # -------------------------------------------------------
+    def _worker(self, intake: queue.Queue):
+        """
+        Bucle de un trabajador: aplica los mensajes de su cola en orden.
+
+        Un error inesperado se entrega por el Future del resultado (o se
+        registra, si el mensaje no tiene uno) y el bucle continúa.
+        """
+        while True:
+            action, tournament_id, payload, reply = intake.get()
+            try:
+                if action == _STOP:
+                    return
+                if action == _START:
+                    tournament = self.tournaments[tournament_id]
+                    for round_index, match_index in tournament.ready_matches():
+                        self._schedule(tournament_id, round_index, match_index)
+                else:
+                    self._apply_result(tournament_id, payload, reply)
+            except Exception as exc:
+                future = reply[0] if reply is not None else None
+                if future is not None and not future.done():
+                    future.set_exception(exc)
+                else:
+                    logger.exception("Error en el trabajador del torneo '%s'.", tournament_id)
+            finally:
+                intake.task_done()
+
+    def _apply_result(self, tournament_id: str, payload: Tuple[int, int, str],
+                      reply: Tuple[Future, float]):
+        """Aplica un resultado, libera su servidor y programa lo que quede listo."""
+        future, arrived = reply
+        if not future.set_running_or_notify_cancel():
+            return
+        round_index, match_index, winner = payload
+        tournament = self.tournaments.get(tournament_id)
+        try:
+            if tournament is None:
+                raise ValueError(f"No existe el torneo '{tournament_id}'.")
+            # Un partido en espera de servidor aún no se jugó: si se aceptara
+            # su resultado, seguiría en la cola y luego ocuparía un servidor
+            # que nadie liberaría.
+            with self._lock:
+                playing = (tournament_id, round_index, match_index) in self.running
+            if not playing:
+                raise ValueError(f"El partido ({round_index}, {match_index}) del torneo "
+                                 f"'{tournament_id}' no está en juego.")
+            ready = tournament.set_match_result(round_index, match_index, winner)
+        except ValueError as exc:
+            future.set_exception(exc)
+            return
+
+        self._release(tournament_id, round_index, match_index)
+        if ready is not None:
+            self._schedule(tournament_id, *ready, arrived=arrived)
+        elif tournament.is_finished() and self.on_finish is not None:
+            self.on_finish(tournament)
+        future.set_result(ready)
+
+    # -------------------------------------------------------
+    # Servidores de juego
+    # -------------------------------------------------------
+    def _schedule(self, tournament_id: str, round_index: int, match_index: int,
+                  arrived: Optional[float] = None):
+        """
+        Asigna un servidor libre al partido o lo deja en espera.
+
+        Args:
+            arrived (float, opcional): Llegada del resultado que dejó listo
+                el partido; "processing_latency" se mide ahora y
+                "schedule_latency" al asignarle servidor.
+        """
+        key = (tournament_id, round_index, match_index)
+        with self._lock:
+            slot = self._free.pop() if self._free else None
+            if slot is None:
+                self._waiting.append((key, arrived))
+            else:
+                self.running[key] = slot
+        if arrived is not None:
+            self.telemetry.record(PROCESSING_LATENCY_METRIC, self.clock() - arrived)
+        if slot is not None:
+            self._notify(key, slot, arrived)
+
+    def _release(self, tournament_id: str, round_index: int, match_index: int):
+        """Libera el servidor de un partido terminado y se lo da al siguiente en espera."""
+        with self._lock:
+            slot = self.running.pop((tournament_id, round_index, match_index), None)
+            if slot is None:
+                return
+            if not self._waiting:
+                self._free.append(slot)
+                return
+            key, arrived = self._waiting.popleft()
+            self.running[key] = slot
+        self._notify(key, slot, arrived)
+
+    def _notify(self, key: Tuple[str, int, int], slot: int, arrived: Optional[float]):
+        """
+        Registra la latencia (si el partido lo dejó listo un resultado) y
+        avisa a `on_schedule`, fuera del candado, de un partido asignado.
+        """
+        if arrived is not None:
+            self.telemetry.record(SCHEDULE_LATENCY_METRIC, self.clock() - arrived)
+        if self.on_schedule is None:
+            return
+        tournament_id, round_index, match_index = key
+        players = self.tournaments[tournament_id].get_match(round_index, match_index)
+        self.on_schedule(ScheduledMatch(tournament_id, round_index, match_index, players, slot))
+
+    def waiting_count(self) -> int:
+        """Partidos listos que esperan un servidor libre."""
+        with self._lock:
+            return len(self._waiting)